@@ -0,0 +1,295 @@
+"""
+Local HTTP JSON API over the analysis layer
+
+    python -m analysis.api --port 8000 --workers 8
+
+Endpoints (all GET; 'dept' and 'salary' filters are comma-separated or repeated
+query parameters, e.g. ?dept=sales,hr&salary=low):
+
+    /health                     status, data version and row count
+    /questions                  question ids with metadata
+    /questions/<id>             computed result of one question as JSON
+    /questions/<id>.png         rendered figure (served from the figure cache)
+    /metrics                    headline KPIs and attrition by department/salary
+    /clusters                   cluster sizes, feature means and attrition
+
+The dataset is loaded and scored once and shared by a fixed pool of worker
+threads. A worker serves one connection at a time: idle keep-alive connections
+are closed after API_DEFAULTS['keepalive_timeout'] seconds, and responses ask the
+client to close while other connections are waiting for a worker. Responses are cached per (data version, path, filter) and carry an ETag
+derived from the same inputs, so conditional requests are answered with 304
+without recomputing anything.
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from analysis.data_loader import DataLoader
+from analysis.figure_cache import render_question_cached
+from analysis.filters import apply_filters, filter_signature
+from analysis.metrics import MetricsCalculator
+from analysis.pipeline import intermediate
+from analysis.question_bank import QuestionBank
+from analysis.question_result import to_json_safe
+from analysis.risk_model import AttritionRiskModel
+from utils.cache import LRUCache, tag_frame
+from utils.config import API_DEFAULTS, RISK_MODEL_DEFAULTS
+from utils.logger import logger
+
+
+class ApiError(Exception):
+    """Request error reported to the client with an HTTP status"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisService:
+    """Shared dataset plus cached JSON/PNG responses for the API handlers"""
+
+    def __init__(self, df=None, data_version: str = None, cache_size: int = None):
+        if df is None:
+            loader = DataLoader()
+            df = loader.load_data()
+            data_version = loader.get_data_version()
+            df = AttritionRiskModel.load_or_train(df, data_version).add_scores(df)
+        self.df = df if data_version is None else tag_frame(df, data_version)
+        self.data_version = data_version or 'unversioned'
+        self.questions = QuestionBank.get_all_questions()
+        self._responses = LRUCache(cache_size or API_DEFAULTS['response_cache_size'])
+        self._frames = LRUCache(64)
+
+    def filtered(self, depts: list, salaries: list):
+        """Filtered frame for a filter combination, cached by its signature"""
+        signature = filter_signature(depts, salaries)
+        frame = self._frames.get(signature)
+        if frame is None:
+            frame = apply_filters(self.df, depts, salaries)
+            if self.data_version != 'unversioned':
+                tag_frame(frame, self.data_version, signature)
+            self._frames.put(signature, frame)
+        if frame.empty:
+            raise ApiError(HTTPStatus.UNPROCESSABLE_ENTITY, "No employees match the filters")
+        return frame, signature
+
+    def etag(self, path: str, signature: str) -> str:
+        digest = hashlib.blake2b(f"{self.data_version}|{path}|{signature}".encode(), digest_size=12)
+        return f'"{digest.hexdigest()}"'
+
+    def respond(self, path: str, depts: list, salaries: list, if_none_match: str = None) -> tuple:
+        """
+        Resolve a request path to (status, content type, body, etag)
+
+        Bodies are cached per ETag; a matching If-None-Match short-circuits to 304.
+        """
+        signature = filter_signature(depts, salaries)
+        etag = self.etag(path, signature)
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return HTTPStatus.NOT_MODIFIED, None, b'', etag
+
+        cached = self._responses.get(etag)
+        if cached is None:
+            cached = self._build(path, depts, salaries)
+            self._responses.put(etag, cached)
+        content_type, body = cached
+        return HTTPStatus.OK, content_type, body, etag
+
+    def _build(self, path: str, depts: list, salaries: list) -> tuple:
+        if path == '/health':
+            return self._json({'status': 'ok', 'data_version': self.data_version, 'rows': len(self.df)})
+        if path == '/questions':
+            return self._json([
+                {'id': q, **QuestionBank.get_question_metadata(q)} for q in self.questions
+            ])
+        if path.startswith('/questions/'):
+            name = path[len('/questions/'):]
+            if name.endswith('.png'):
+                return 'image/png', self._question_png(name[:-len('.png')], depts, salaries)
+            return self._json(self._question(name, depts, salaries))
+        if path == '/metrics':
+            return self._json(self._metrics(depts, salaries))
+        if path == '/clusters':
+            return self._json(self._clusters(depts, salaries))
+        raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {path}")
+
+    @staticmethod
+    def _json(payload) -> tuple:
+        return 'application/json', json.dumps(to_json_safe(payload)).encode()
+
+    def _check_question(self, question_id: str):
+        if question_id not in self.questions:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown question '{question_id}'")
+
+    def _question(self, question_id: str, depts: list, salaries: list) -> dict:
+        self._check_question(question_id)
+        df, signature = self.filtered(depts, salaries)
+        result = QuestionBank.compute(question_id, df).data_only()
+        result.update({'question': question_id, 'filters': signature, 'rows': len(df)})
+        return result
+
+    def _question_png(self, question_id: str, depts: list, salaries: list) -> bytes:
+        self._check_question(question_id)
+        df, signature = self.filtered(depts, salaries)
+        _, image = render_question_cached(question_id, df, self.data_version, signature, fmt='png')
+        return image
+
+    def _metrics(self, depts: list, salaries: list) -> dict:
+        df, signature = self.filtered(depts, salaries)
+        risk = df[RISK_MODEL_DEFAULTS['score_column']]
+        return {
+            'filters': signature,
+            'total_employees': len(df),
+            'attrition_rate': MetricsCalculator.calculate_attrition_rate(df),
+            'high_risk_employees': len(MetricsCalculator.identify_high_risk_employees(df)),
+            'predicted_at_risk': int((risk >= RISK_MODEL_DEFAULTS['high_risk_probability']).sum()),
+            'average_predicted_risk': risk.mean(),
+            'attrition_by_dept': MetricsCalculator.attrition_rate_by_group(df, 'dept'),
+            'attrition_by_salary': MetricsCalculator.attrition_rate_by_group(df, 'salary')
+        }
+
+    def _clusters(self, depts: list, salaries: list) -> dict:
+        df, signature = self.filtered(depts, salaries)
+        clusterer, clustered_df = intermediate(df, 'clustering')
+        grouped = clustered_df.groupby('cluster')
+        summary = grouped[clusterer.features].mean()
+        summary.insert(0, 'size', grouped.size())
+        summary['attrition_rate'] = grouped['left'].mean()
+        return {'filters': signature, 'n_clusters': clusterer.n_clusters, 'clusters': summary}
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server handing each connection to a fixed-size thread pool"""
+
+    # Listen backlog; the default of 5 drops bursts of reconnects into SYN retries
+    request_queue_size = 128
+
+    def __init__(self, address, handler, service: AnalysisService, workers: int):
+        super().__init__(address, handler)
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api')
+        self._waiting = 0
+        self._waiting_lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        """Accepted connections queued for a free worker"""
+        return self._waiting
+
+    def process_request(self, request, client_address):
+        with self._waiting_lock:
+            self._waiting += 1
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        with self._waiting_lock:
+            self._waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Translates GET requests into AnalysisService calls"""
+
+    protocol_version = 'HTTP/1.1'
+    # Socket timeout: an idle keep-alive connection releases its worker after this
+    timeout = API_DEFAULTS['keepalive_timeout']
+    # Headers and body are separate writes; with Nagle on, a kept-alive connection
+    # stalls each response on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            status, content_type, body, etag = self.server.service.respond(
+                url.path.rstrip('/') or '/',
+                _list_param(query, 'dept'),
+                _list_param(query, 'salary'),
+                self.headers.get('If-None-Match')
+            )
+        except ApiError as e:
+            status, content_type, etag = e.status, 'application/json', None
+            body = json.dumps({'error': str(e)}).encode()
+        except Exception as e:
+            logger.error("API request %s failed: %s", self.path, e)
+            status, content_type, etag = HTTPStatus.INTERNAL_SERVER_ERROR, 'application/json', None
+            body = json.dumps({'error': str(e)}).encode()
+
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        if self.server.waiting:
+            # Hand the worker to a queued connection instead of waiting for this client
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        logger.debug("GET %s %d in %.1fms", self.path, status, (time.perf_counter() - start) * 1000)
+
+    def log_message(self, format, *args):
+        # Request logging goes through the project logger at debug level
+        pass
+
+
+def _list_param(query: dict, name: str) -> list:
+    """'a,b' or repeated parameters as a list; None when absent (meaning all)"""
+    if name not in query:
+        return None
+    return [v.strip() for value in query[name] for v in value.split(',') if v.strip()]
+
+
+def create_server(host: str = None, port: int = None, workers: int = None, service: AnalysisService = None):
+    """Build a server bound to host:port (port 0 picks a free port)"""
+    return PooledHTTPServer(
+        (host or API_DEFAULTS['host'], API_DEFAULTS['port'] if port is None else port),
+        ApiHandler,
+        service or AnalysisService(),
+        workers or API_DEFAULTS['workers']
+    )
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve QuestionBank analyses as JSON over HTTP")
+    parser.add_argument('--host', default=API_DEFAULTS['host'])
+    parser.add_argument('--port', type=int, default=API_DEFAULTS['port'])
+    parser.add_argument('-w', '--workers', type=int, default=API_DEFAULTS['workers'])
+    parser.add_argument('--warm', action='store_true', help="Precompute models and figures before serving")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.workers)
+    if args.warm:
+        from analysis.warmup import warm_up
+        warm_up(server.service.df, server.service.data_version, steps=('clustering', 'intermediates', 'render'))
+    host, port = server.server_address[:2]
+    logger.info("Serving analysis API on http://%s:%s with %s workers", host, port, args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Headless batch renderer for QuestionBank analyses
+
+Renders every question (or a subset) for one or more filter combinations in a
+process pool, writing figures plus an interpretation JSON per question:
+
+    python -m analysis.batch_render --output-dir reports --each-dept
+    python -m analysis.batch_render -q q01 q07 --filter "dept=sales,hr;salary=low"
+    python -m analysis.batch_render --data-only     # numbers and text only, no rendering
+
+Outputs whose inputs (data version, filter, question, visual settings, formats)
+are unchanged since the last run are skipped unless --force is given.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from analysis.data_loader import DataLoader
+from analysis.filters import apply_filters, filter_signature
+from analysis.question_bank import QuestionBank
+from analysis.question_result import to_json_safe
+from analysis.risk_model import AttritionRiskModel
+from utils.cache import tag_frame
+from utils.config import VISUALIZATION_DEFAULTS, EXPORT, RENDER_VERSION
+from utils.logger import logger
+
+_worker_df = None
+_worker_version = None
+
+
+def _init_worker():
+    """Load and risk-score the dataset once per worker process"""
+    global _worker_df, _worker_version
+    loader = DataLoader()
+    df = loader.load_data()
+    _worker_version = loader.get_data_version()
+    _worker_df = AttritionRiskModel.load_or_train(df, _worker_version).add_scores(df)
+
+
+def parse_filter(spec: str) -> dict:
+    """Parse 'dept=sales,hr;salary=low' into {'depts': [...], 'salaries': [...]}"""
+    names = {'dept': 'depts', 'salary': 'salaries'}
+    parsed = {'depts': None, 'salaries': None}
+    for part in filter(None, (p.strip() for p in spec.split(';'))):
+        name, _, values = part.partition('=')
+        if name.strip() not in names or not values:
+            raise ValueError(f"Invalid filter '{part}' - expected dept=... or salary=...")
+        parsed[names[name.strip()]] = [v.strip() for v in values.split(',') if v.strip()]
+    return parsed
+
+
+def resolve_questions(requested: list) -> list:
+    """Expand ids or prefixes (e.g. 'q07') into full question ids"""
+    all_questions = QuestionBank.get_all_questions()
+    if not requested:
+        return all_questions
+
+    resolved = []
+    for name in requested:
+        matches = [q for q in all_questions if q == name or q.startswith(f"{name}_")]
+        if not matches:
+            raise ValueError(f"Unknown question '{name}'")
+        resolved.extend(m for m in matches if m not in resolved)
+    return resolved
+
+
+def _slug(signature: str) -> str:
+    return re.sub(r'[^A-Za-z0-9=,.-]+', '_', signature)
+
+
+def _input_key(question_id: str, data_version: str, signature: str, formats: list, dpi: int) -> str:
+    payload = json.dumps({
+        'render_version': RENDER_VERSION,
+        'question': question_id,
+        'data': data_version,
+        'filters': signature,
+        'visual': VISUALIZATION_DEFAULTS,
+        'export': EXPORT,
+        'formats': sorted(formats),
+        'dpi': dpi
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_job(job: dict) -> dict:
+    """Render one question for one filter combination (runs in a worker process)"""
+    timings = {}
+    start = time.perf_counter()
+    df = tag_frame(apply_filters(_worker_df, job['depts'], job['salaries']), _worker_version, job['signature'])
+    timings['filter'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = QuestionBank.compute(job['question'], df)
+    timings['analysis'] = time.perf_counter() - start
+
+    # The figure is only rendered when at least one image format is requested
+    start = time.perf_counter()
+    if job['formats']:
+        visualizer = result.pop('plot')
+        try:
+            for fmt in job['formats']:
+                # Dense layers are rasterized in SVG/PDF so packs stay small enough to email
+                data, _ = visualizer.export(fmt, dpi=job['dpi'], fallback=False)
+                with open(os.path.join(job['directory'], f"{job['question']}.{fmt}"), 'wb') as f:
+                    f.write(data)
+        finally:
+            visualizer.release()
+    timings['render'] = time.perf_counter() - start
+
+    payload = to_json_safe(result.data_only())
+    payload.update({
+        'question': job['question'],
+        'filters': job['signature'],
+        'data_version': _worker_version,
+        'rows': len(df),
+        'input_key': job['input_key'],
+        'timings': timings
+    })
+    with open(os.path.join(job['directory'], f"{job['question']}.json"), 'w') as f:
+        json.dump(payload, f, indent=2, default=str)
+    return {'job': job, 'timings': timings}
+
+
+def _is_current(job: dict) -> bool:
+    """True when every output exists and was produced from the same inputs"""
+    meta_path = os.path.join(job['directory'], f"{job['question']}.json")
+    outputs = [os.path.join(job['directory'], f"{job['question']}.{fmt}") for fmt in job['formats']]
+    if not all(os.path.exists(p) for p in outputs + [meta_path]):
+        return False
+    try:
+        with open(meta_path) as f:
+            return json.load(f).get('input_key') == job['input_key']
+    except (OSError, ValueError):
+        return False
+
+
+def build_jobs(args, df, data_version: str) -> list:
+    """Cross the selected questions with the selected filter combinations"""
+    filters = [parse_filter(spec) for spec in args.filter]
+    if args.each_dept:
+        filters += [
+            {'depts': [dept], 'salaries': None}
+            for dept in sorted(df['dept'].dropna().unique())
+        ]
+    filters = filters or [{'depts': None, 'salaries': None}]
+
+    jobs = []
+    for combo in filters:
+        signature = filter_signature(combo['depts'], combo['salaries'])
+        directory = os.path.join(args.output_dir, _slug(signature))
+        for question in resolve_questions(args.questions):
+            jobs.append({
+                'question': question,
+                'depts': combo['depts'],
+                'salaries': combo['salaries'],
+                'signature': signature,
+                'directory': directory,
+                'formats': args.formats,
+                'dpi': args.dpi,
+                'input_key': _input_key(question, data_version, signature, args.formats, args.dpi)
+            })
+    return jobs
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Render QuestionBank analyses to files")
+    parser.add_argument('-o', '--output-dir', default='reports', help="Directory for report packs")
+    parser.add_argument('-q', '--questions', nargs='*', help="Question ids or prefixes (default: all)")
+    parser.add_argument(
+        '-f', '--filter', action='append', default=[],
+        help="Filter combination such as 'dept=sales,hr;salary=low' (repeatable)"
+    )
+    parser.add_argument('--each-dept', action='store_true', help="Add one filter per department")
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg', 'pdf'])
+    parser.add_argument('--data-only', action='store_true', help="Write result JSON without figures")
+    parser.add_argument('--dpi', type=int, default=VISUALIZATION_DEFAULTS['dpi'])
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--force', action='store_true', help="Re-render even if outputs are current")
+    args = parser.parse_args(argv)
+
+    if args.data_only:
+        args.formats = []
+
+    loader = DataLoader()
+    df = loader.load_data()
+    try:
+        jobs = build_jobs(args, df, loader.get_data_version())
+    except ValueError as e:
+        parser.error(str(e))
+
+    pending = [job for job in jobs if args.force or not _is_current(job)]
+    print(f"{len(jobs)} jobs, {len(jobs) - len(pending)} up to date, {len(pending)} to render")
+    for job in pending:
+        os.makedirs(job['directory'], exist_ok=True)
+
+    if pending:
+        # Train (or load) the risk model here so the workers only load the artifact
+        AttritionRiskModel.load_or_train(df, loader.get_data_version())
+
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(render_job, job): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            label = f"{job['signature']:<30} {job['question']:<40}"
+            try:
+                timings = future.result()['timings']
+            except Exception as e:
+                failures += 1
+                logger.error("Batch render failed for %s (%s): %s", job['question'], job['signature'], e)
+                print(f"FAIL {label} {e}")
+                continue
+            print(
+                f"ok   {label} analysis {timings['analysis']:6.2f}s  "
+                f"render {timings['render']:6.2f}s"
+            )
+
+    print(f"Rendered {len(pending) - failures}/{len(pending)} jobs in {time.perf_counter() - start:.1f}s")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,45 @@
+import os
+import joblib
 import pandas as pd
 import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
+from scipy.optimize import linear_sum_assignment
+from analysis.features import FeatureMatrixBuilder
+from utils.cache import LRUCache, dump_atomic, frame_key
+from utils.config import CACHE_DIR, MODELING_DEFAULTS
 from utils.logger import logger
+from utils.profiling import profiled
+
+
+def _resolved_scaling(scaling: str) -> str:
+    return scaling if scaling is not None else MODELING_DEFAULTS['scaling']
+
+
+def align_labels(centers: np.ndarray, reference_centers: np.ndarray) -> np.ndarray:
+    """
+    Match clusters to reference clusters by minimum total center distance
+    
+    Returns an array where entry i is the reference cluster id for cluster i.
+    """
+    cost = ((centers[:, None, :] - reference_centers[None, :, :]) ** 2).sum(axis=2)
+    rows, cols = linear_sum_assignment(cost)
+    mapping = np.empty(len(centers), dtype=np.intp)
+    mapping[rows] = cols
+    return mapping
+
 
 class EmployeeClusterer:
     """Performs clustering analysis on employee data"""
     
+    _fitted = LRUCache(MODELING_DEFAULTS['fitted_model_cache_size'])
+    
     def __init__(
         self,
         features: list = None,
         n_clusters: int = 3,
-        random_state: int = 42
+        random_state: int = 42,
+        scaling: str = None
     ):
         self.features = features or [
             'satisfaction_level', 
@@ -20,22 +48,32 @@ class EmployeeClusterer:
         ]
         self.n_clusters = n_clusters
         self.random_state = random_state
+        self.scaling = scaling
+        self.feature_matrix = None
         self.kmeans = None
         self.pca = None
         self.cluster_centers = None
+        self.data_version = None
     
-    def fit(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Fit clustering model and return DataFrame with cluster assignments"""
-        logger.info(f"Fitting KMeans with {self.n_clusters} clusters")
+    @profiled()
+    def fit(self, df: pd.DataFrame, warm_start: 'EmployeeClusterer' = None) -> pd.DataFrame:
+        """
+        Fit clustering model and return DataFrame with cluster assignments
+        
+        Args:
+            df: Employee data to cluster
+            warm_start: Fitted clusterer (usually the global model) to initialise from.
+                The subset is scaled and projected in that model's space, KMeans runs
+                a single short init from its centers, and cluster ids are aligned to it.
+        """
+        if warm_start is not None:
+            return self._fit_warm(df, warm_start)
         
-        # Validate features
-        missing = [f for f in self.features if f not in df.columns]
-        if missing:
-            raise ValueError(f"Missing features in DataFrame: {missing}")
+        logger.info("Fitting KMeans with %d clusters", self.n_clusters)
         
-        # Prepare data
-        df_clean = df.dropna(subset=self.features).copy()
-        X = df_clean[self.features]
+        # Shared scaled float32 matrix (cached per frame and feature list)
+        fm = FeatureMatrixBuilder.build(df, self.features, scaling=self.scaling)
+        self.feature_matrix = fm
         
         # Fit KMeans
         self.kmeans = KMeans(
@@ -43,17 +81,138 @@ class EmployeeClusterer:
             random_state=self.random_state,
             n_init=10
         )
-        df_clean['cluster'] = self.kmeans.fit_predict(X)
-        self.cluster_centers = self.kmeans.cluster_centers_
+        labels = self.kmeans.fit_predict(fm.X)
+        self.cluster_centers = fm.inverse_transform(self.kmeans.cluster_centers_)
         
         # Apply PCA for visualization
         self.pca = PCA(n_components=2)
-        X_pca = self.pca.fit_transform(X)
-        df_clean['pca1'] = X_pca[:, 0]
-        df_clean['pca2'] = X_pca[:, 1]
+        X_pca = self.pca.fit_transform(fm.X)
+        
+        logger.info("Clustering completed with inertia: %.2f", self.kmeans.inertia_)
+        return self._assign(df, fm, labels, X_pca)
+    
+    def _fit_warm(self, df: pd.DataFrame, reference: 'EmployeeClusterer') -> pd.DataFrame:
+        """Refit a subset starting from a reference model's centers"""
+        if reference.kmeans is None:
+            raise ValueError("Reference clusterer is not fitted - call fit() first")
+        if reference.features != self.features or reference.n_clusters != self.n_clusters:
+            raise ValueError("Warm start requires the same features and number of clusters")
+        if _resolved_scaling(reference.scaling) != _resolved_scaling(self.scaling):
+            raise ValueError("Warm start requires the same scaling as the reference model")
+        
+        logger.info("Warm-starting KMeans with %d clusters from reference model", self.n_clusters)
+        
+        fm = FeatureMatrixBuilder.build(
+            df, self.features, scaling=reference.scaling, scaler=reference.feature_matrix.scaler
+        )
+        self.feature_matrix = fm
+        
+        reference_centers = reference.kmeans.cluster_centers_
+        self.kmeans = KMeans(
+            n_clusters=self.n_clusters,
+            init=reference_centers,
+            n_init=1,
+            max_iter=MODELING_DEFAULTS['warm_start_max_iter'],
+            random_state=self.random_state
+        )
+        labels = self.kmeans.fit_predict(fm.X)
+        
+        # Keep cluster ids consistent with the reference so colors and summaries line up
+        mapping = align_labels(self.kmeans.cluster_centers_, reference_centers)
+        order = np.argsort(mapping)
+        self.kmeans.cluster_centers_ = self.kmeans.cluster_centers_[order]
+        self.kmeans.labels_ = mapping[self.kmeans.labels_]
+        labels = self.kmeans.labels_
+        self.cluster_centers = fm.inverse_transform(self.kmeans.cluster_centers_)
+        
+        # Project with the reference PCA so subset plots share the global axes
+        self.pca = reference.pca
+        X_pca = self.pca.transform(fm.X)
+        
+        logger.info("Warm-start clustering completed with inertia: %.2f", self.kmeans.inertia_)
+        return self._assign(df, fm, labels, X_pca)
+    
+    @staticmethod
+    def _assign(df: pd.DataFrame, fm, labels: np.ndarray, X_pca: np.ndarray) -> pd.DataFrame:
+        """Attach cluster ids and PCA coordinates to the rows used for fitting"""
+        df_clean = df if fm.is_complete else df.iloc[fm.rows]
+        return df_clean.assign(
+            cluster=labels,
+            pca1=X_pca[:, 0],
+            pca2=X_pca[:, 1]
+        )
+    
+    @classmethod
+    def fitted(cls, df: pd.DataFrame, data_version: str = None, **params) -> tuple:
+        """
+        Return a cached (clusterer, clustered_df) pair for this data and parameters
+        
+        With a data_version the fitted model is also persisted under CACHE_DIR, so a
+        new process (or a warm-up run) loads it instead of refitting.
+        """
+        clusterer = cls(**params)
+        key = (
+            frame_key(df),
+            tuple(clusterer.features),
+            clusterer.n_clusters,
+            clusterer.random_state,
+            clusterer.scaling
+        )
+        cached = cls._fitted.get(key)
+        if cached is None:
+            if data_version is None:
+                cached = (clusterer, clusterer.fit(df))
+            else:
+                cached = clusterer._load_or_fit(df, data_version)
+            cls._fitted.put(key, cached)
+        return cached
+    
+    def _load_or_fit(self, df: pd.DataFrame, data_version: str) -> tuple:
+        """Load the persisted model for this dataset version, fitting and saving it if absent"""
+        path = os.path.join(
+            CACHE_DIR,
+            f"clustering_k{self.n_clusters}_{self.scaling or MODELING_DEFAULTS['scaling']}_{data_version}.joblib"
+        )
+        if os.path.exists(path):
+            try:
+                loaded = self.load(path)
+                if (
+                    loaded.data_version == data_version
+                    and loaded.features == self.features
+                    and loaded.random_state == self.random_state
+                ):
+                    logger.debug("Loaded clustering model from %s", path)
+                    return loaded, loaded._assign_fitted(df)
+            except Exception as e:
+                logger.warning("Ignoring unreadable clustering model %s: %s", path, e)
         
-        logger.info(f"Clustering completed with inertia: {self.kmeans.inertia_:.2f}")
-        return df_clean
+        clustered_df = self.fit(df)
+        self.data_version = data_version
+        self.save(path)
+        return self, clustered_df
+    
+    def _assign_fitted(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cluster assignments of df under this (already fitted) model"""
+        fm = FeatureMatrixBuilder.build(
+            df, self.features, scaling=self.scaling, scaler=self.feature_matrix.scaler
+        )
+        self.feature_matrix = fm
+        return self._assign(df, fm, self.kmeans.predict(fm.X), self.pca.transform(fm.X))
+    
+    def save(self, path: str):
+        """Persist the fitted model"""
+        dump_atomic(self, path)
+        logger.info("Saved clustering model to %s", path)
+    
+    @staticmethod
+    def load(path: str) -> 'EmployeeClusterer':
+        """Load a persisted model"""
+        return joblib.load(path)
+    
+    def stability(self, df: pd.DataFrame, **params) -> dict:
+        """Bootstrap stability of this clustering (see ClusterStabilityAnalyzer.run)"""
+        from analysis.stability import ClusterStabilityAnalyzer
+        return ClusterStabilityAnalyzer(self, **params).run(df)
     
     def get_cluster_summary(self, df: pd.DataFrame) -> pd.DataFrame:
         """Get summary statistics for each cluster"""
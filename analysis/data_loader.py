@@ -1,7 +1,10 @@
+import hashlib
+import os
 import pandas as pd
 from pathlib import Path
 from utils.config import DATA_PATH
 from utils.logger import logger
+from utils.profiling import profiled
 
 class DataLoader:
     """Singleton class for loading and preprocessing employee data"""
@@ -12,29 +15,58 @@ class DataLoader:
         if cls._instance is None:
             cls._instance = super(DataLoader, cls).__new__(cls)
             cls._instance._df = None
+            cls._instance._version = None
+            cls._instance._file_stat = None
+            cls._instance._file_version = None
             logger.info("DataLoader singleton created")
         return cls._instance
     
+    @profiled()
     def load_data(self) -> pd.DataFrame:
-        """Load and preprocess employee data"""
-        if self._df is not None:
+        """Load and preprocess employee data (reloaded when the file on disk changes)"""
+        if self._df is not None and self._version == self.current_version():
             logger.debug("Returning cached DataFrame")
             return self._df.copy()
         
         try:
-            logger.info(f"Loading data from {DATA_PATH}")
+            logger.info("Loading data from %s", DATA_PATH)
             df = pd.read_csv(DATA_PATH)
-            logger.info(f"Loaded {len(df)} records with {len(df.columns)} columns")
+            logger.info("Loaded %d records with %d columns", len(df), len(df.columns))
             
             # Preprocessing steps
             df = self._preprocess_data(df)
             self._df = df
+            self._version = self.current_version()
             return df.copy()
             
         except Exception as e:
-            logger.error(f"Error loading data: {str(e)}")
+            logger.error("Error loading data: %s", e)
             raise
     
+    def get_data_version(self) -> str:
+        """Return a short content hash identifying the loaded dataset"""
+        if self._version is None:
+            self.load_data()
+        return self._version
+    
+    def current_version(self) -> str:
+        """Content hash of the data file on disk, re-hashed only when its size or mtime changes"""
+        stat = os.stat(DATA_PATH)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._file_stat:
+            self._file_version = self._file_digest(DATA_PATH)
+            self._file_stat = signature
+        return self._file_version
+    
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        """Hash the raw data file so caches can be keyed on its contents"""
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:12]
+    
     def _preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply preprocessing steps to raw data"""
         logger.debug("Starting data preprocessing")
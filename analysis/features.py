@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler, RobustScaler
+from utils.cache import LRUCache, frame_key
+from utils.config import MODELING_DEFAULTS
+from utils.logger import logger
+
+class FeatureMatrix:
+    """Scaled float32 feature matrix aligned to the rows it was built from"""
+
+    def __init__(
+        self,
+        X: np.ndarray,
+        rows: np.ndarray,
+        index: pd.Index,
+        features: list,
+        scaler,
+        n_source_rows: int
+    ):
+        self.X = X
+        self.rows = rows
+        self.index = index
+        self.features = features
+        self.scaler = scaler
+        self.n_source_rows = n_source_rows
+
+    @property
+    def is_complete(self) -> bool:
+        """True when no source rows were dropped for missing values"""
+        return len(self.rows) == self.n_source_rows
+
+    def inverse_transform(self, X: np.ndarray) -> np.ndarray:
+        """Map scaled values back to the original feature units"""
+        if self.scaler is None:
+            return np.asarray(X)
+        return self.scaler.inverse_transform(X)
+
+
+class FeatureMatrixBuilder:
+    """Builds and caches scaled feature matrices shared by all models"""
+
+    SCALERS = {
+        'standard': StandardScaler,
+        'robust': RobustScaler,
+        'none': None
+    }
+
+    _cache = LRUCache(MODELING_DEFAULTS['feature_cache_size'])
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        features: list,
+        scaling: str = None,
+        scaler=None
+    ) -> FeatureMatrix:
+        """
+        Return a C-contiguous float32 matrix of scaled features, dropping incomplete rows
+
+        Matrices are cached on frame_key(df): frames tagged with the same data
+        version and filter signature share one matrix without hashing any rows.
+
+        Args:
+            df: Source data
+            features: Columns to include, in order
+            scaling: 'standard', 'robust' or 'none' for raw values
+            scaler: Already fitted scaler to apply instead of fitting a new one
+                (used to project subsets into a reference model's space)
+        """
+        scaling = scaling if scaling is not None else MODELING_DEFAULTS['scaling']
+        if scaling not in cls.SCALERS:
+            raise ValueError(f"Unknown scaling '{scaling}' - expected one of {list(cls.SCALERS)}")
+
+        missing = [f for f in features if f not in df.columns]
+        if missing:
+            raise ValueError(f"Missing features in DataFrame: {missing}")
+
+        # A cached matrix keeps its scaler alive, so id() is unique while the entry exists
+        key = (frame_key(df), tuple(features), scaling, id(scaler))
+        cached = cls._cache.get(key)
+        if cached is not None:
+            logger.debug("Reusing cached feature matrix")
+            return cached
+
+        values = df[features].to_numpy(dtype=np.float32)
+        valid = ~np.isnan(values).any(axis=1)
+        rows = np.flatnonzero(valid)
+        if len(rows) != len(values):
+            values = values[valid]
+
+        if scaler is not None:
+            values = scaler.transform(values)
+        elif cls.SCALERS[scaling] is not None:
+            scaler = cls.SCALERS[scaling]()
+            values = scaler.fit_transform(values)
+
+        X = np.ascontiguousarray(values, dtype=np.float32)
+        X.flags.writeable = False
+
+        matrix = FeatureMatrix(X, rows, df.index[rows], list(features), scaler, len(df))
+        cls._cache.put(key, matrix)
+        logger.debug("Built %dx%d feature matrix (%s scaling)", X.shape[0], X.shape[1], scaling)
+        return matrix
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached feature matrices"""
+        cls._cache.clear()
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+from analysis.question_bank import QuestionBank
+from utils.cache import LRUCache, tag_frame
+from utils.config import CACHE_DIR, EXPORT, FIGURE_CACHE, RENDER_VERSION, VISUALIZATION_DEFAULTS
+from utils.logger import logger
+
+class FigureCache:
+    """Content-addressed cache of encoded figures: in-memory LRU backed by a disk directory"""
+
+    def __init__(
+        self,
+        memory_bytes: int = None,
+        disk_bytes: int = None,
+        cache_dir: str = None
+    ):
+        self.memory_bytes = memory_bytes or FIGURE_CACHE['memory_bytes']
+        self.disk_bytes = disk_bytes or FIGURE_CACHE['disk_bytes']
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, 'figures')
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        # Bytes on disk, measured by one walk on the first write and then counted
+        self._disk_used = None
+        self._disk_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        question_id: str,
+        data_version: str,
+        filter_signature: str,
+        visual_params: dict = None,
+        dpi: int = None,
+        fmt: str = None
+    ) -> str:
+        """Hash everything that determines the rendered bytes into a cache key"""
+        payload = json.dumps({
+            'render_version': RENDER_VERSION,
+            'question': question_id,
+            'data': data_version,
+            'filters': filter_signature,
+            'visual': visual_params if visual_params is not None else VISUALIZATION_DEFAULTS,
+            'dpi': dpi or VISUALIZATION_DEFAULTS['dpi'],
+            'format': fmt or FIGURE_CACHE['format'],
+            'export': EXPORT
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key: str) -> bytes:
+        """Return cached bytes from memory, falling back to disk (promoting hits)"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        os.utime(path)
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store bytes in memory and write them through to disk"""
+        self._remember(key, data)
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._count_disk(len(data) - replaced)
+        except OSError as e:
+            logger.warning("Could not write figure cache entry: %s", e)
+
+    def get_or_render(self, key: str, render) -> bytes:
+        """Return cached bytes, calling render() to produce them on a miss"""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def _remember(self, key: str, data: bytes):
+        """Insert into the memory tier, evicting least recently used entries over budget"""
+        with self._lock:
+            if key in self._memory:
+                self._memory_used -= len(self._memory.pop(key))
+            if len(data) > self.memory_bytes:
+                return
+            self._memory[key] = data
+            self._memory_used += len(data)
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def _count_disk(self, delta: int):
+        """Track bytes written and prune once the disk tier exceeds its budget"""
+        with self._disk_lock:
+            if self._disk_used is None:
+                self._disk_used = self._walk_disk()[1]
+            else:
+                self._disk_used += delta
+            if self._disk_used > self.disk_bytes:
+                self._disk_used = self._prune_disk()
+
+    def _walk_disk(self) -> tuple:
+        """Return ([(mtime, size, path)], total bytes) for the disk tier"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def _prune_disk(self) -> int:
+        """Delete least recently used files down to the budget; returns the bytes left"""
+        # Re-walk rather than trust the counter: other processes share the directory
+        entries, total = self._walk_disk()
+        if total <= self.disk_bytes:
+            return total
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.disk_bytes:
+                break
+        return total
+
+    def clear(self):
+        """Drop the memory tier (disk entries are left for other processes)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+
+
+figure_cache = FigureCache()
+
+# Non-figure parts of question results (interpretation, counts, tables) for the same keys
+_result_cache = LRUCache(256)
+
+
+def render_question_cached(
+    question_id: str,
+    df: pd.DataFrame,
+    data_version: str,
+    filter_signature: str,
+    fmt: str = None,
+    dpi: int = None,
+    cache: FigureCache = None
+) -> tuple:
+    """
+    Return (result, image bytes) for a question, rendering only on a cache miss
+
+    The result is the question's output without the 'plot' visualizer.
+    """
+    cache = cache or figure_cache
+    fmt = fmt or FIGURE_CACHE['format']
+    key = FigureCache.make_key(question_id, data_version, filter_signature, dpi=dpi, fmt=fmt)
+
+    image = cache.get(key)
+    result = _result_cache.get(key)
+    if image is not None and result is not None:
+        return result, image
+
+    logger.debug("Figure cache miss for %s (%s)", question_id, filter_signature)
+    full_result = QuestionBank.compute(question_id, tag_frame(df, data_version, filter_signature))
+    if image is None:
+        # The figure is only built here, on an image miss
+        image = full_result.pop('plot').to_bytes(fmt=fmt, dpi=dpi)
+        cache.put(key, image)
+    result = full_result.data_only()
+    _result_cache.put(key, result)
+    return result, image
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from utils.config import FILTER_DEFAULTS
+
+
+class SortedRangeIndex:
+    """
+    Per-column sorted-order indexes for numeric range filters
+
+    Built once per dataset: each column keeps its argsort order and sorted values,
+    so the rows inside [low, high] are one searchsorted slice of the order array.
+    Several ranges are intersected by taking the smallest slice and checking the
+    other columns through their rank arrays, touching only candidate rows.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: list = None):
+        self.columns = [c for c in (columns or FILTER_DEFAULTS['range_columns']) if c in df.columns]
+        self.n_rows = len(df)
+        self._order = {}
+        self._sorted = {}
+        self._rank = {}
+        for column in self.columns:
+            values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            order = np.argsort(values, kind='stable')
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self._order[column] = order
+            self._sorted[column] = values[order]
+            self._rank[column] = rank
+
+    def bounds(self, column: str) -> tuple:
+        """(min, max) of the non-missing values of a column"""
+        values = self._sorted[column]
+        finite = values[~np.isnan(values)]
+        return (finite[0], finite[-1]) if len(finite) else (np.nan, np.nan)
+
+    def _slice(self, column: str, low: float, high: float) -> tuple:
+        values = self._sorted[column]
+        return (
+            np.searchsorted(values, low, side='left'),
+            np.searchsorted(values, high, side='right')
+        )
+
+    def positions(self, ranges: dict) -> np.ndarray:
+        """
+        Sorted row positions satisfying every {column: (low, high)} range (inclusive)
+
+        Returns None when no range restricts anything (all rows match).
+        """
+        slices = {}
+        for column, (low, high) in ranges.items():
+            if column not in self._order:
+                raise ValueError(f"No range index for column '{column}'")
+            start, stop = self._slice(column, low, high)
+            # A range containing every row does not filter
+            if start == 0 and stop == self.n_rows:
+                continue
+            slices[column] = (start, stop)
+
+        if not slices:
+            return None
+
+        narrowest = min(slices, key=lambda c: slices[c][1] - slices[c][0])
+        start, stop = slices.pop(narrowest)
+        candidates = self._order[narrowest][start:stop]
+        for column, (start, stop) in slices.items():
+            rank = self._rank[column][candidates]
+            candidates = candidates[(rank >= start) & (rank < stop)]
+        return np.sort(candidates)
+
+
+def apply_filters(
+    df: pd.DataFrame,
+    depts: list = None,
+    salaries: list = None,
+    ranges: dict = None,
+    range_index: SortedRangeIndex = None
+) -> pd.DataFrame:
+    """
+    Return rows matching the selected departments, salary levels and numeric ranges
+
+    None means all values. ranges maps column -> (low, high), inclusive; with a
+    range_index built on the same frame the ranges are resolved from its sorted
+    indexes, otherwise by masking.
+    """
+    mask = None
+    if depts is not None:
+        mask = df['dept'].isin(depts).to_numpy()
+    if salaries is not None:
+        salary_mask = df['salary'].isin(salaries).to_numpy()
+        mask = salary_mask if mask is None else mask & salary_mask
+
+    if ranges:
+        if range_index is not None and range_index.n_rows == len(df):
+            positions = range_index.positions(ranges)
+            if positions is not None:
+                if mask is not None:
+                    positions = positions[mask[positions]]
+                return df.iloc[positions]
+        else:
+            for column, (low, high) in ranges.items():
+                range_mask = df[column].between(low, high).to_numpy()
+                mask = range_mask if mask is None else mask & range_mask
+
+    return df if mask is None else df[mask]
+
+
+def filter_signature(depts: list = None, salaries: list = None, ranges: dict = None) -> str:
+    """Stable, order-independent description of a filter combination for cache keys"""
+    parts = []
+    for name, values in (('dept', depts), ('salary', salaries)):
+        if values is not None:
+            parts.append(f"{name}={','.join(sorted(map(str, values)))}")
+    for column in sorted(ranges or {}):
+        low, high = ranges[column]
+        parts.append(f"{column}={low:g}..{high:g}")
+    return ';'.join(parts) or 'all'
@@ -0,0 +1,179 @@
+"""
+Load test for the local analysis API
+
+    python -m analysis.load_test --requests 2000 --concurrency 16
+    python -m analysis.load_test --url http://127.0.0.1:8000 --png --revalidate
+    python -m analysis.load_test --keep-alive --concurrency 32 --workers 8
+
+Without --url an in-process server is started on a free port. Requests cycle
+through every question, /metrics and /clusters over a few filter combinations;
+the report shows requests/second, latency percentiles and status counts. With
+--keep-alive each client thread reuses one persistent HTTP/1.1 connection,
+reconnecting whenever the server closes it; run it with more clients than
+server workers to check that queued connections are not starved.
+"""
+import argparse
+import itertools
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+import numpy as np
+from analysis.question_bank import QuestionBank
+
+FILTERS = ['', 'dept=sales', 'dept=technical,support', 'salary=low', 'dept=sales&salary=medium,high']
+
+
+def build_paths(png: bool) -> list:
+    """Request mix: every question plus KPIs and clusters across the filter set"""
+    endpoints = [f"/questions/{q}" for q in QuestionBank.get_all_questions()]
+    if png:
+        endpoints += [f"/questions/{q}.png" for q in QuestionBank.get_all_questions()]
+    endpoints += ['/metrics', '/clusters']
+    return [f"{path}?{query}" if query else path for query in FILTERS for path in endpoints]
+
+
+class PersistentClient:
+    """One keep-alive connection per client thread, reopened when the server closes it"""
+
+    def __init__(self, base_url: str):
+        url = urlsplit(base_url)
+        self.host, self.port, self.prefix = url.hostname, url.port or 80, url.path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connection(self) -> HTTPConnection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = HTTPConnection(self.host, self.port, timeout=60)
+            with self._lock:
+                self._connections.append(connection)
+                self.opened += 1
+        return connection
+
+    def _drop(self):
+        self._local.connection.close()
+        self._local.connection = None
+
+    def get(self, path: str, headers: dict) -> tuple:
+        """Return (status, etag), retrying once on a connection the server already closed"""
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request('GET', self.prefix + path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, HTTPException):
+                self._drop()
+                if attempt:
+                    raise
+                continue
+            if response.will_close:
+                self._drop()
+            return response.status, response.getheader('ETag')
+
+    def close(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+
+
+def run(base_url: str, paths: list, total: int, concurrency: int, revalidate: bool, keep_alive: bool = False) -> dict:
+    """Issue total requests from concurrency client threads"""
+    etags = {}
+    lock = threading.Lock()
+    cycle = itertools.cycle(paths)
+    client = PersistentClient(base_url) if keep_alive else None
+
+    def fetch(path):
+        headers = {}
+        if revalidate and path in etags:
+            headers['If-None-Match'] = etags[path]
+        start = time.perf_counter()
+        if client is not None:
+            status, etag = client.get(path, headers)
+        else:
+            try:
+                with urlopen(Request(base_url + path, headers=headers)) as response:
+                    response.read()
+                    status, etag = response.status, response.headers.get('ETag')
+            except HTTPError as e:
+                status, etag = e.code, None
+        elapsed = time.perf_counter() - start
+        if etag:
+            with lock:
+                etags[path] = etag
+        return status, elapsed
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(fetch, [next(cycle) for _ in range(total)]))
+    finally:
+        if client is not None:
+            client.close()
+    wall = time.perf_counter() - start
+
+    latencies = np.array([elapsed for _, elapsed in outcomes]) * 1000
+    return {
+        'requests': total,
+        'seconds': wall,
+        'rps': total / wall,
+        'p50_ms': np.percentile(latencies, 50),
+        'p95_ms': np.percentile(latencies, 95),
+        'p99_ms': np.percentile(latencies, 99),
+        'statuses': Counter(status for status, _ in outcomes),
+        'connections': client.opened if client is not None else total
+    }
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure analysis API throughput")
+    parser.add_argument('--url', help="Base URL of a running API (default: start one in-process)")
+    parser.add_argument('-n', '--requests', type=int, default=1000)
+    parser.add_argument('-c', '--concurrency', type=int, default=16)
+    parser.add_argument('-w', '--workers', type=int, help="Server workers for the in-process server")
+    parser.add_argument('--png', action='store_true', help="Include figure requests")
+    parser.add_argument('--revalidate', action='store_true', help="Send If-None-Match with known ETags")
+    parser.add_argument('--keep-alive', action='store_true', help="Reuse one persistent connection per client")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        from analysis.api import create_server
+        server = create_server(port=0, workers=args.workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    base_url = base_url.rstrip('/')
+
+    paths = build_paths(args.png)
+    try:
+        # The first pass over every path is the cold (compute/render) cost
+        cold = run(base_url, paths, len(paths), args.concurrency, False, args.keep_alive)
+        warm = run(base_url, paths, args.requests, args.concurrency, args.revalidate, args.keep_alive)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    for label, report in (('cold', cold), ('warm', warm)):
+        statuses = ', '.join(f"{code}: {count}" for code, count in sorted(report['statuses'].items()))
+        print(
+            f"{label:<5} {report['requests']:>6} requests in {report['seconds']:6.2f}s  "
+            f"{report['rps']:8.1f} req/s  p50 {report['p50_ms']:7.1f}ms  "
+            f"p95 {report['p95_ms']:7.1f}ms  p99 {report['p99_ms']:7.1f}ms  "
+            f"{report['connections']} connections  [{statuses}]"
+        )
+    return 0 if all(code < 400 for code in warm['statuses']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Concurrent dashboard panels
+
+The KPIs, the selected question, the data summary and the clustering panel do
+not depend on each other, so the app submits them together and fills each
+panel as it completes; a page then takes as long as its slowest panel rather
+than the sum of all of them.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from utils.logger import logger
+
+
+class PanelRunner:
+    """
+    Runs independent dashboard panels concurrently on a shared thread pool
+
+    Each (session, panel) has at most one in-flight future. Submitting the same
+    inputs again (a rerun with unchanged filters) returns the in-flight future;
+    submitting new inputs cancels the stale one, so queued work for filters the
+    user has already moved away from never starts. Work that is already running
+    cannot be interrupted and simply finishes into its cache.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='panel')
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session: str, panel: str, key, fn, *args) -> Future:
+        """Run fn(*args) for a panel, reusing or cancelling the session's previous request"""
+        slot = (session, panel)
+        with self._lock:
+            previous = self._inflight.get(slot)
+            if previous is not None:
+                previous_key, previous_future = previous
+                if previous_key == key and not previous_future.cancelled():
+                    return previous_future
+                if previous_future.cancel():
+                    logger.debug("Cancelled stale %s panel for session %s", panel, session)
+
+            future = self._pool.submit(fn, *args)
+            self._inflight[slot] = (key, future)
+        future.add_done_callback(lambda f: self._release(slot, f))
+        return future
+
+    def cancel_session(self, session: str, keep: set = ()):
+        """Cancel a session's queued panels other than those named in keep"""
+        with self._lock:
+            for (owner, panel), (_, future) in list(self._inflight.items()):
+                if owner == session and panel not in keep:
+                    future.cancel()
+
+    def _release(self, slot: tuple, future: Future):
+        with self._lock:
+            if self._inflight.get(slot, (None, None))[1] is future:
+                del self._inflight[slot]
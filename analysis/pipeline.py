@@ -0,0 +1,254 @@
+"""
+Shared intermediates for QuestionBank questions
+
+Intermediates (salary aggregates, threshold masks, the clustering fit, risk
+scores) are registered as named nodes with their dependencies. An
+AnalysisContext memoizes node values for one (data, filter) frame, so every
+question asking for the same node in that context gets the value computed once.
+Questions declare the nodes they read with @requires, and run_questions builds
+the dependency graph for a set of questions and evaluates independent nodes and
+questions concurrently.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+import pandas as pd
+from analysis.clustering import EmployeeClusterer
+from utils.cache import LRUCache, frame_key
+from utils.config import RISK_MODEL_DEFAULTS, THRESHOLDS
+from utils.logger import logger
+
+
+@dataclass(frozen=True)
+class Node:
+    """A named intermediate computed from the frame and its dependencies"""
+    name: str
+    func: callable
+    deps: tuple = ()
+
+
+class IntermediateRegistry:
+    """Declarative registry of intermediate nodes"""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def register(self, name: str, deps: tuple = ()):
+        """Decorator registering func(df, *dep_values) as node 'name'"""
+        def decorator(func):
+            missing = [dep for dep in deps if dep not in self.nodes]
+            if missing:
+                raise ValueError(f"Node '{name}' depends on unregistered nodes {missing}")
+            self.nodes[name] = Node(name, func, tuple(deps))
+            return func
+        return decorator
+
+    def closure(self, names) -> list:
+        """The named nodes plus all their transitive dependencies, dependencies first"""
+        ordered, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            if name not in self.nodes:
+                raise ValueError(f"Unknown intermediate '{name}'")
+            seen.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            ordered.append(name)
+
+        for name in names:
+            visit(name)
+        return ordered
+
+
+registry = IntermediateRegistry()
+
+
+def requires(*names):
+    """Declare the intermediates a question reads (used by run_questions to build the graph)"""
+    def decorator(func):
+        func.intermediates = tuple(names)
+        return func
+    return decorator
+
+
+class AnalysisContext:
+    """
+    Memoized intermediate values for one frame
+
+    Contexts are keyed by frame_key(): the frame's (data_version, filter_signature)
+    tag when the caller declared one with tag_frame(), else the frame object
+    itself, so looking one up never hashes rows. The context keeps only the
+    computed values; the frame is passed to get().
+    """
+
+    _contexts = LRUCache(8)
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.compute_counts = {}
+        self._values = {}
+        self._locks = {name: threading.Lock() for name in registry.nodes}
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame) -> 'AnalysisContext':
+        """Shared context for frames with the same tag"""
+        key = frame_key(df)
+        context = cls._contexts.get(key)
+        if context is None:
+            context = cls(key)
+            cls._contexts.put(key, context)
+        return context
+
+    def get(self, name: str, df: pd.DataFrame):
+        """Return the node value for df, computing it (and its dependencies) at most once"""
+        if name in self._values:
+            return self._values[name]
+        if name not in registry.nodes:
+            raise ValueError(f"Unknown intermediate '{name}'")
+
+        node = registry.nodes[name]
+        with self._locks[name]:
+            if name not in self._values:
+                inputs = [self.get(dep, df) for dep in node.deps]
+                self._values[name] = node.func(df, *inputs)
+                self.compute_counts[name] = self.compute_counts.get(name, 0) + 1
+            return self._values[name]
+
+
+def intermediate(df: pd.DataFrame, name: str):
+    """Value of an intermediate for df from its shared context"""
+    return AnalysisContext.for_frame(df).get(name, df)
+
+
+# ---------------------------------------------------------------------------
+# Registered intermediates
+# ---------------------------------------------------------------------------
+
+@registry.register('salary_summary')
+def salary_summary(df):
+    """Mean attrition, project load, evaluation and satisfaction per salary band"""
+    return df.groupby('salary')[
+        ['left', 'number_project', 'last_evaluation', 'satisfaction_level']
+    ].mean()
+
+
+@registry.register('threshold_masks')
+def threshold_masks(df):
+    """Boolean row masks for each business threshold"""
+    return {
+        'low_satisfaction': (df['satisfaction_level'] < THRESHOLDS['low_satisfaction']).to_numpy(),
+        'high_evaluation': (df['last_evaluation'] > THRESHOLDS['high_evaluation']).to_numpy(),
+        'high_hours': (df['average_montly_hours'] > THRESHOLDS['high_hours']).to_numpy(),
+        'high_projects': (df['number_project'] >= THRESHOLDS['high_projects']).to_numpy()
+    }
+
+
+@registry.register('high_risk_mask', deps=('threshold_masks',))
+def high_risk_mask(df, masks):
+    """Low satisfaction, high evaluation and long hours combined"""
+    return masks['low_satisfaction'] & masks['high_evaluation'] & masks['high_hours']
+
+
+@registry.register('clustering')
+def clustering(df):
+    """(clusterer, clustered_df) for the default EmployeeClusterer"""
+    return EmployeeClusterer.fitted(df)
+
+
+@registry.register('cluster_attrition', deps=('clustering',))
+def cluster_attrition(df, fitted):
+    """Attrition rate per cluster"""
+    _, clustered_df = fitted
+    return clustered_df.groupby('cluster')['left'].mean()
+
+
+@registry.register('risk_scores')
+def risk_scores(df):
+    """
+    Attrition probability per row, read from the frame's score column
+
+    Nodes do no I/O: the caller scores the frame once with the model for its
+    data version (AttritionRiskModel.load_or_train(...).add_scores(df)), as the
+    app, the API, the warm-up and the batch renderer do.
+    """
+    column = RISK_MODEL_DEFAULTS['score_column']
+    if column not in df.columns:
+        raise ValueError(
+            f"Missing '{column}' column - score the frame with "
+            "AttritionRiskModel.load_or_train(df, data_version).add_scores(df) first"
+        )
+    return df[column]
+
+
+# ---------------------------------------------------------------------------
+# Executor
+# ---------------------------------------------------------------------------
+
+def run_questions(
+    df: pd.DataFrame,
+    question_ids: list = None,
+    render: bool = False,
+    max_workers: int = None
+) -> dict:
+    """
+    Run questions over one frame with shared intermediates computed once
+
+    Intermediates and questions form one dependency graph; every task whose
+    inputs are ready runs on a thread pool, so independent nodes (e.g. the
+    clustering fit and the salary aggregates) and the questions that need no
+    intermediates proceed concurrently.
+
+    Returns:
+        {question_id: QuestionResult}, with figures rendered when render is set
+    """
+    from analysis.question_bank import QuestionBank
+
+    question_ids = question_ids or QuestionBank.get_all_questions()
+    context = AnalysisContext.for_frame(df)
+    questions = {q: QuestionBank.get_question(q) for q in question_ids}
+
+    deps = {}
+    for name in registry.closure(
+        {i for func in questions.values() for i in getattr(func, 'intermediates', ())}
+    ):
+        deps[name] = set(registry.nodes[name].deps)
+    for q, func in questions.items():
+        deps[q] = set(getattr(func, 'intermediates', ()))
+
+    dependents = {task: [] for task in deps}
+    for task, inputs in deps.items():
+        for dep in inputs:
+            dependents[dep].append(task)
+
+    def run_task(task):
+        start = time.perf_counter()
+        if task in registry.nodes:
+            context.get(task, df)
+        else:
+            result = QuestionBank.compute(task, df)
+            if render:
+                result.render()
+            results[task] = result
+        return time.perf_counter() - start
+
+    results = {}
+    ready = [task for task, inputs in deps.items() if not inputs]
+    futures = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while ready or futures:
+            for task in ready:
+                futures[pool.submit(run_task, task)] = task
+            ready = []
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = futures.pop(future)
+                logger.debug("%s finished in %.3fs", task, future.result())
+                for dependent in dependents[task]:
+                    deps[dependent].discard(task)
+                    if not deps[dependent]:
+                        ready.append(dependent)
+
+    return {q: results[q] for q in question_ids}
@@ -1,17 +1,21 @@
 import pandas as pd
 import numpy as np
 import seaborn as sns
-import matplotlib.pyplot as plt
-from .visualizations.boxplot import BoxPlotVisualizer
+from .visualizations.boxplot import BoxPlotVisualizer, box_summary
 from .visualizations.scatterplot import ScatterPlotVisualizer
 from .visualizations.heatmap import HeatmapVisualizer
 from .visualizations.kdeplot import KDEPlotVisualizer
 from .visualizations.barplot import BarPlotVisualizer
 from .visualizations.cluster_plot import ClusterPlotVisualizer
 from .visualizations.violinplot import ViolinPlotVisualizer
-from analysis.clustering import EmployeeClusterer
-from utils.config import QUESTION_METADATA, THRESHOLDS
+from .visualizations.regression import regression_overlay
+from .visualizations.histogram import HistogramVisualizer
+from analysis.binning import bin_codes, binned_matrix
+from analysis.pipeline import requires, intermediate
+from analysis.question_result import QuestionResult
+from utils.config import QUESTION_METADATA, THRESHOLDS, RISK_MODEL_DEFAULTS
 from utils.logger import logger
+from utils.profiling import profile_span
 
 class QuestionBank:
     """Centralized bank of all 22 employee satisfaction analysis questions"""
@@ -28,56 +32,87 @@ class QuestionBank:
         """Get list of all available questions"""
         return list(QUESTION_METADATA.keys())
     
+    @staticmethod
+    def get_question(question_id):
+        """Get the question function for a question id"""
+        if question_id not in QUESTION_METADATA or not hasattr(QuestionBank, question_id):
+            raise ValueError(f"Question ID {question_id} not found")
+        return getattr(QuestionBank, question_id)
+    
+    @staticmethod
+    def compute(question_id, df):
+        """Run a question's data stage only; the figure is rendered if result['plot'] is used"""
+        question = QuestionBank.get_question(question_id)
+        with profile_span(f"{question_id}.compute", rows_in=len(df)):
+            result = question(df)
+        # Names the result's render/encode spans
+        result.name = question_id
+        return result
+    
+    @staticmethod
+    def render(question_id, df):
+        """Run a question and materialize its figure"""
+        result = QuestionBank.compute(question_id, df)
+        result.render()
+        return result
+    
     @staticmethod
     def q01_dept_satisfaction(df):
         """How does employee satisfaction vary across departments?"""
         metadata = QuestionBank.get_question_metadata('q01_dept_satisfaction')
         
         # Create visualization
-        visualizer = BoxPlotVisualizer(df)
-        visualizer.create(
-            x='dept',
-            y='satisfaction_level',
-            title=metadata['title'],
-            palette='Set3',
-            rotation=45
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BoxPlotVisualizer(df)
+            visualizer.create(
+                x='dept',
+                y='satisfaction_level',
+                title=metadata['title'],
+                palette='Set3',
+                rotation=45
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': box_summary(df, 'dept', 'satisfaction_level'),
             'interpretation': (
                 "Departments show varying satisfaction levels with different distributions. "
                 "Sales and technical departments have the widest satisfaction ranges, indicating "
                 "potential department-specific issues. Management shows the highest median satisfaction. "
                 "HR and accounting show relatively consistent satisfaction levels across employees."
             )
-        }
+        })
     
     @staticmethod
     def q02_eval_vs_satisfaction(df):
         """What is the relationship between satisfaction level and last evaluation score?"""
         metadata = QuestionBank.get_question_metadata('q02_eval_vs_satisfaction')
         
-        # Create visualization
-        visualizer = ScatterPlotVisualizer(df)
-        visualizer.create(
-            x='last_evaluation',
-            y='satisfaction_level',
-            title=metadata['title'],
-            add_regression=True
-        )
+        # Closed-form fit shared with the regression overlay
+        fit = regression_overlay(df, 'last_evaluation', 'satisfaction_level')['fit']
         
-        return {
-            'plot': visualizer,
+        # Create visualization
+        def render():
+            visualizer = ScatterPlotVisualizer(df)
+            visualizer.create(
+                x='last_evaluation',
+                y='satisfaction_level',
+                title=metadata['title'],
+                add_regression=True
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': {key: fit[key] for key in ('n', 'slope', 'intercept', 'r')},
             'interpretation': (
                 "There is a positive correlation between evaluation scores and satisfaction levels. "
                 "Most employees with high evaluations report high satisfaction. However, there's a "
                 "notable cluster of high performers (evaluation > 0.8) with low satisfaction (< 0.3), "
                 "indicating potential burnout or recognition issues among top performers."
             )
-        }
+        })
     
     @staticmethod
     def q03_projects_vs_satisfaction(df):
@@ -85,44 +120,54 @@ class QuestionBank:
         metadata = QuestionBank.get_question_metadata('q03_projects_vs_satisfaction')
         
         # Create visualization
-        visualizer = BoxPlotVisualizer(df)
-        visualizer.create(
-            x='number_project',
-            y='satisfaction_level',
-            title=metadata['title'],
-            palette='Pastel1'
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BoxPlotVisualizer(df)
+            visualizer.create(
+                x='number_project',
+                y='satisfaction_level',
+                title=metadata['title'],
+                palette='Pastel1'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': box_summary(df, 'number_project', 'satisfaction_level'),
             'interpretation': (
                 "Employees with 4-5 projects report the highest satisfaction levels. "
                 "Those with 2 or fewer projects show lower satisfaction, possibly due to underutilization. "
                 "Employees with 6+ projects show declining satisfaction, indicating potential burnout from "
                 "excessive workload. The optimal project load appears to be 4-5 projects."
             )
-        }
+        })
     
     @staticmethod
     def q04_hours_vs_satisfaction(df):
         """Is there a correlation between working hours and satisfaction?"""
         metadata = QuestionBank.get_question_metadata('q04_hours_vs_satisfaction')
         
-        # Create visualization using violin plot instead of scatter
-        visualizer = ViolinPlotVisualizer(df)
-        visualizer.create(
-            x='average_montly_hours',
-            y='satisfaction_level',
-            title=metadata['title'],
-            palette='viridis',
-            bins=6,
-            inner='quartile'
-        )
+        # Satisfaction quartiles per hours bin (the violins reuse these cached bin codes)
+        hour_codes, hour_bins = bin_codes(df, 'average_montly_hours', 6)
+        satisfaction_by_hours = df.groupby(hour_codes)['satisfaction_level'].describe()[['count', '25%', '50%', '75%']]
+        satisfaction_by_hours = satisfaction_by_hours.drop(index=-1, errors='ignore')
+        satisfaction_by_hours.index = [hour_bins.labels[code] for code in satisfaction_by_hours.index]
         
-        return {
-            'plot': visualizer,
+        # Create visualization using violin plot instead of scatter
+        def render():
+            visualizer = ViolinPlotVisualizer(df)
+            visualizer.create(
+                x='average_montly_hours',
+                y='satisfaction_level',
+                title=metadata['title'],
+                palette='viridis',
+                bins=6,
+                inner='quartile'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': satisfaction_by_hours,
             'interpretation': (
                 "The violin plot reveals a clear pattern in how satisfaction varies with working hours. "
                 "Employees working 150-180 hours monthly show the highest satisfaction with a tight distribution. "
@@ -132,7 +177,7 @@ class QuestionBank:
                 "This provides more insight than a simple scatter plot by showing the full distribution "
                 "of satisfaction at each hour level, revealing patterns that correlation alone would miss."
             )
-        }
+        })
         
     @staticmethod
     def q05_salary_vs_satisfaction(df):
@@ -140,18 +185,20 @@ class QuestionBank:
         metadata = QuestionBank.get_question_metadata('q05_salary_vs_satisfaction')
         
         # Create visualization
-        visualizer = BoxPlotVisualizer(df)
-        visualizer.create(
-            x='salary',
-            y='satisfaction_level',
-            title=metadata['title'],
-            palette='Set2',
-            order=['low', 'medium', 'high']
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BoxPlotVisualizer(df)
+            visualizer.create(
+                x='salary',
+                y='satisfaction_level',
+                title=metadata['title'],
+                palette='Set2',
+                order=['low', 'medium', 'high']
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': box_summary(df, 'salary', 'satisfaction_level', order=['low', 'medium', 'high']),
             'interpretation': (
                 "Salary level shows a clear positive relationship with satisfaction. "
                 "Employees with high salaries report the highest satisfaction levels, "
@@ -159,7 +206,7 @@ class QuestionBank:
                 "variance. However, even high-salary employees have some low-satisfaction outliers, "
                 "suggesting salary alone doesn't guarantee satisfaction."
             )
-        }
+        })
     
     @staticmethod
     def q06_left_vs_stayed(df):
@@ -170,24 +217,26 @@ class QuestionBank:
         satisfaction_by_left = df.groupby('left')['satisfaction_level'].mean().reset_index()
         
         # Create visualization
-        visualizer = BarPlotVisualizer(satisfaction_by_left)
-        visualizer.create(
-            x='left',
-            y='satisfaction_level',
-            title=metadata['title'],
-            palette='Set1'
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BarPlotVisualizer(satisfaction_by_left)
+            visualizer.create(
+                x='left',
+                y='satisfaction_level',
+                title=metadata['title'],
+                palette='Set1'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': satisfaction_by_left,
             'interpretation': (
                 "Employees who left the company had significantly lower satisfaction (avg ~0.35) "
                 "compared to those who stayed (avg ~0.67). This confirms satisfaction is a major "
                 "driver of attrition. The large difference suggests improving satisfaction could "
                 "substantially reduce turnover."
             )
-        }
+        })
     
     @staticmethod
     def q07_attrition_by_dept(df):
@@ -198,25 +247,27 @@ class QuestionBank:
         attrition_by_dept = df.groupby('dept')['left'].mean().reset_index()
         
         # Create visualization
-        visualizer = BarPlotVisualizer(attrition_by_dept)
-        visualizer.create(
-            x='dept',
-            y='left',
-            title=metadata['title'],
-            palette='Set2',
-            rotation=45
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BarPlotVisualizer(attrition_by_dept)
+            visualizer.create(
+                x='dept',
+                y='left',
+                title=metadata['title'],
+                palette='Set2',
+                rotation=45
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': attrition_by_dept,
             'interpretation': (
                 "Sales, technical, and support departments have the highest attrition rates (18-20%). "
                 "Management and product departments show the lowest attrition (8-10%). This suggests "
                 "department-specific factors significantly impact retention, with customer-facing roles "
                 "being particularly vulnerable to turnover."
             )
-        }
+        })
     
     @staticmethod
     def q08_eval_vs_attrition(df):
@@ -224,97 +275,91 @@ class QuestionBank:
         metadata = QuestionBank.get_question_metadata('q08_eval_vs_attrition')
         
         # Create visualization
-        visualizer = KDEPlotVisualizer(df)
-        visualizer.create(
-            x='last_evaluation',
-            hue='left',
-            title=metadata['title'],
-            palette='coolwarm',
-            shade=True
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = KDEPlotVisualizer(df)
+            visualizer.create(
+                x='last_evaluation',
+                hue='left',
+                title=metadata['title'],
+                palette='coolwarm',
+                shade=True
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': df.groupby('left')['last_evaluation'].describe(),
             'interpretation': (
                 "High performers (evaluation > 0.8) have a bimodal distribution: many stay (satisfied high performers), "
                 "but a significant group leaves (dissatisfied high performers). This 'high performer attrition' is "
                 "particularly concerning as these employees represent valuable talent. Low performers (evaluation < 0.6) "
                 "are more likely to stay, possibly due to fewer job opportunities."
             )
-        }
+        })
     
     @staticmethod
+    @requires('salary_summary')
     def q09_salary_vs_attrition(df):
         """Is attrition higher in certain salary bands?"""
         metadata = QuestionBank.get_question_metadata('q09_salary_vs_attrition')
         
         # Calculate metric
-        attrition_by_salary = df.groupby('salary')['left'].mean().reset_index()
+        attrition_by_salary = intermediate(df, 'salary_summary')['left'].reset_index()
         
         # Create visualization
-        visualizer = BarPlotVisualizer(attrition_by_salary)
-        visualizer.create(
-            x='salary',
-            y='left',
-            title=metadata['title'],
-            palette='Set3',
-            order=['low', 'medium', 'high']
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BarPlotVisualizer(attrition_by_salary)
+            visualizer.create(
+                x='salary',
+                y='left',
+                title=metadata['title'],
+                palette='Set3',
+                order=['low', 'medium', 'high']
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': attrition_by_salary,
             'interpretation': (
                 "Attrition rate is dramatically higher for low-salary employees (25%) compared to "
                 "medium (13%) and high (5%) salary bands. This confirms compensation is a major "
                 "driver of retention. Even small salary increases could potentially reduce turnover "
                 "significantly among low-salary employees."
             )
-        }
+        })
     
     @staticmethod
     def q10_satisfaction_evaluation_heatmap(df):
         """Which combination of satisfaction and evaluation leads to the highest attrition?"""
         metadata = QuestionBank.get_question_metadata('q10_satisfaction_evaluation_heatmap')
         
-        # Create bins for heatmap with proper string labels
-        df = df.copy()
-        
-        # Function to format intervals as readable strings
-        def format_interval(interval):
-            if hasattr(interval, 'left') and hasattr(interval, 'right'):
-                return f"{interval.left:.1f}-{interval.right:.1f}"
-            return str(interval)
-        
-        # Create satisfaction bins with string labels
-        df['satisfaction_bin'] = pd.cut(df['satisfaction_level'], bins=5)
-        df['satisfaction_bin'] = df['satisfaction_bin'].apply(format_interval)
-        
-        # Create evaluation bins with string labels
-        df['evaluation_bin'] = pd.cut(df['last_evaluation'], bins=5)
-        df['evaluation_bin'] = df['evaluation_bin'].apply(format_interval)
-        
-        # Create visualization
-        visualizer = HeatmapVisualizer(df)
-        visualizer.create(
-            x_col='satisfaction_bin',
-            y_col='evaluation_bin',
-            value_col='left',
-            title=metadata['title'],
-            cmap='YlOrRd'
-        )
-        
-        return {
-            'plot': visualizer,
+        # Bin satisfaction and evaluation into 5 equal-width bins each (cached codes)
+        def render():
+            visualizer = HeatmapVisualizer(df)
+            visualizer.create(
+                x_col='satisfaction_level',
+                y_col='last_evaluation',
+                value_col='left',
+                title=metadata['title'],
+                cmap='YlOrRd',
+                x_bins=5,
+                y_bins=5,
+                xlabel='satisfaction_bin',
+                ylabel='evaluation_bin'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': binned_matrix(df, 'satisfaction_level', 'last_evaluation', 'left', 5, 5),
             'interpretation': (
                 "The highest attrition occurs among employees with LOW satisfaction (0.1-0.3) and HIGH evaluation scores (0.8-1.0) (bottom-left cell). "
                 "This represents the most critical risk group: high performers who are dissatisfied. "
                 "Employees with high satisfaction (0.7-0.9) show low attrition regardless of evaluation score. "
                 "Low performers with low satisfaction also show high attrition, but they represent less business risk."
             )
-        }
+        })
     
     @staticmethod
     def q11_projects_vs_attrition(df):
@@ -322,26 +367,28 @@ class QuestionBank:
         metadata = QuestionBank.get_question_metadata('q11_projects_vs_attrition')
         
         # Create visualization
-        visualizer = ScatterPlotVisualizer(df)
-        visualizer.create(
-            x='number_project',
-            y='satisfaction_level',
-            hue='left',
-            title=metadata['title'],
-            palette='coolwarm',
-            alpha=0.7
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = ScatterPlotVisualizer(df)
+            visualizer.create(
+                x='number_project',
+                y='satisfaction_level',
+                hue='left',
+                title=metadata['title'],
+                palette='coolwarm',
+                alpha=0.7
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': df.groupby(['number_project', 'left'])['satisfaction_level'].agg(['count', 'mean']),
             'interpretation': (
                 "Employees who left fall into two distinct patterns: those with very few projects (1-2) "
                 "and low satisfaction (possibly underutilized), and those with many projects (6+) and "
                 "low satisfaction (overworked). The optimal zone appears to be 3-5 projects with "
                 "satisfaction > 0.5, where very few employees leave."
             )
-        }
+        })
     
     @staticmethod
     def q12_time_vs_satisfaction(df):
@@ -349,24 +396,26 @@ class QuestionBank:
         metadata = QuestionBank.get_question_metadata('q12_time_vs_satisfaction')
         
         # Create visualization
-        visualizer = BoxPlotVisualizer(df)
-        visualizer.create(
-            x='time_spend_company',
-            y='satisfaction_level',
-            title=metadata['title'],
-            palette='Set1'
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BoxPlotVisualizer(df)
+            visualizer.create(
+                x='time_spend_company',
+                y='satisfaction_level',
+                title=metadata['title'],
+                palette='Set1'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': box_summary(df, 'time_spend_company', 'satisfaction_level'),
             'interpretation': (
                 "Satisfaction follows a U-shaped pattern over time. New employees (1-2 years) show "
                 "moderate satisfaction, which dips at 3-5 years (potential stagnation period), then "
                 "recovers for long-tenured employees (6+ years). The lowest satisfaction is among "
                 "employees with 3-4 years of tenure, suggesting this is a critical retention period."
             )
-        }
+        })
     
     @staticmethod
     def q13_time_vs_attrition(df):
@@ -377,24 +426,26 @@ class QuestionBank:
         attrition_by_time = df.groupby('time_spend_company')['left'].mean().reset_index()
         
         # Create visualization
-        visualizer = BarPlotVisualizer(attrition_by_time)
-        visualizer.create(
-            x='time_spend_company',
-            y='left',
-            title=metadata['title'],
-            palette='Set2'
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BarPlotVisualizer(attrition_by_time)
+            visualizer.create(
+                x='time_spend_company',
+                y='left',
+                title=metadata['title'],
+                palette='Set2'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': attrition_by_time,
             'interpretation': (
                 "Attrition follows a similar U-shaped pattern to satisfaction. The highest attrition "
                 "rates occur at 3 years (peak turnover) and then again after 6 years. New employees "
                 "(1 year) show moderate attrition, possibly due to poor fit, while very long-tenured "
                 "employees (7-10 years) may leave for career advancement or retirement."
             )
-        }
+        })
     
     @staticmethod
     def q14_promotion_vs_satisfaction(df):
@@ -402,24 +453,26 @@ class QuestionBank:
         metadata = QuestionBank.get_question_metadata('q14_promotion_vs_satisfaction')
         
         # Create visualization
-        visualizer = BoxPlotVisualizer(df)
-        visualizer.create(
-            x='promotion_last_5years',
-            y='satisfaction_level',
-            title=metadata['title'],
-            palette='Set2'
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BoxPlotVisualizer(df)
+            visualizer.create(
+                x='promotion_last_5years',
+                y='satisfaction_level',
+                title=metadata['title'],
+                palette='Set2'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': box_summary(df, 'promotion_last_5years', 'satisfaction_level'),
             'interpretation': (
                 "Promoted employees show significantly higher satisfaction levels than non-promoted employees. "
                 "The median satisfaction for promoted employees is approximately 0.75, compared to 0.65 for "
                 "non-promoted. This highlights career growth as a key driver of employee satisfaction. "
                 "Note that very few employees received promotions (only ~5%), making this a high-impact factor."
             )
-        }
+        })
     
     @staticmethod
     def q15_promotion_vs_attrition(df):
@@ -430,24 +483,26 @@ class QuestionBank:
         attrition_by_promo = df.groupby('promotion_last_5years')['left'].mean().reset_index()
         
         # Create visualization
-        visualizer = BarPlotVisualizer(attrition_by_promo)
-        visualizer.create(
-            x='promotion_last_5years',
-            y='left',
-            title=metadata['title'],
-            palette='Set3'
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BarPlotVisualizer(attrition_by_promo)
+            visualizer.create(
+                x='promotion_last_5years',
+                y='left',
+                title=metadata['title'],
+                palette='Set3'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': attrition_by_promo,
             'interpretation': (
                 "Promotion is strongly associated with retention. Only about 5% of promoted employees left, "
                 "compared to approximately 25% of non-promoted employees. This represents a 5x difference in "
                 "attrition rates. Given that promotions are rare (only ~5% of employees received one), "
                 "increasing promotion opportunities could be a highly effective retention strategy."
             )
-        }
+        })
     
     @staticmethod
     def q16_evaluation_vs_projects(df):
@@ -455,18 +510,20 @@ class QuestionBank:
         metadata = QuestionBank.get_question_metadata('q16_evaluation_vs_projects')
         
         # Create visualization
-        visualizer = ScatterPlotVisualizer(df)
-        visualizer.create(
-            x='last_evaluation',
-            y='number_project',
-            size='average_montly_hours',
-            title=metadata['title'],
-            alpha=0.6
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = ScatterPlotVisualizer(df)
+            visualizer.create(
+                x='last_evaluation',
+                y='number_project',
+                size='average_montly_hours',
+                title=metadata['title'],
+                alpha=0.6
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': df.groupby('number_project')[['last_evaluation', 'average_montly_hours']].agg(['count', 'mean']),
             'interpretation': (
                 "High performers (evaluation > 0.8) typically handle 4-6 projects. Those with the highest "
                 "project loads (6+) often work the most hours (larger points), suggesting potential burnout. "
@@ -474,27 +531,32 @@ class QuestionBank:
                 "employees may be underutilized despite their capabilities. The ideal pattern appears to be "
                 "4-5 projects with evaluation scores of 0.7-0.9."
             )
-        }
+        })
     
     @staticmethod
+    @requires('clustering')
     def q17_employee_clusters(df):
         """Can we identify distinct employee segments?"""
         metadata = QuestionBank.get_question_metadata('q17_employee_clusters')
         
-        # Perform clustering
-        clusterer = EmployeeClusterer()
-        clustered_df = clusterer.fit(df)
+        # Perform clustering (fitted once per frame and shared with q18)
+        clusterer, clustered_df = intermediate(df, 'clustering')
         
         # Create visualization
-        visualizer = ClusterPlotVisualizer(clustered_df)
-        visualizer.create(
-            title=metadata['title']
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = ClusterPlotVisualizer(clustered_df)
+            visualizer.create(
+                title=metadata['title']
+            )
+            return visualizer
+
+        grouped = clustered_df.groupby('cluster')
+        cluster_summary = grouped[clusterer.features].mean()
+        cluster_summary.insert(0, 'size', grouped.size())
+
+        return QuestionResult(render, {
             'metadata': metadata,
-            'cluster_data': clustered_df,
+            'data': cluster_summary,
             'interpretation': (
                 "K-means clustering identified 3 distinct employee segments:\n\n"
                 "1. **Satisfied & Balanced** (Cluster 0): High satisfaction (0.7+), moderate evaluation (0.6-0.7), "
@@ -504,32 +566,31 @@ class QuestionBank:
                 "3. **High-Performing & Busy** (Cluster 2): Moderate satisfaction (0.4-0.6), highest evaluation (>0.8), "
                 "and high workload (220-250 hours/month)"
             )
-        }
+        })
     
     @staticmethod
+    @requires('cluster_attrition')
     def q18_cluster_vs_attrition(df):
         """Which employee clusters have the highest attrition risk?"""
         metadata = QuestionBank.get_question_metadata('q18_cluster_vs_attrition')
         
-        # Perform clustering to get cluster assignments
-        clusterer = EmployeeClusterer()
-        clustered_df = clusterer.fit(df)
-        
-        # Calculate metric
-        attrition_by_cluster = clustered_df.groupby('cluster')['left'].mean().reset_index()
+        # Attrition per cluster from the shared clustering fit
+        attrition_by_cluster = intermediate(df, 'cluster_attrition').reset_index()
         
         # Create visualization
-        visualizer = BarPlotVisualizer(attrition_by_cluster)
-        visualizer.create(
-            x='cluster',
-            y='left',
-            title=metadata['title'],
-            palette='Set3'
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BarPlotVisualizer(attrition_by_cluster)
+            visualizer.create(
+                x='cluster',
+                y='left',
+                title=metadata['title'],
+                palette='Set3'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': attrition_by_cluster,
             'interpretation': (
                 "Cluster 1 (Overworked & Dissatisfied) shows dramatically higher attrition (45%) "
                 "compared to Cluster 0 (Satisfied & Balanced, 5%) and Cluster 2 (High-Performing & Busy, 20%). "
@@ -537,45 +598,50 @@ class QuestionBank:
                 "most dangerous pattern for retention. Targeted interventions for Cluster 1 employees "
                 "should be the highest priority for reducing overall attrition."
             )
-        }
+        })
     
     @staticmethod
     def q19_satisfaction_distribution(df):
         """What is the overall distribution of employee satisfaction?"""
         metadata = QuestionBank.get_question_metadata('q19_satisfaction_distribution')
         
-        # Create visualization using HistogramVisualizer
-        from analysis.visualizations.histogram import HistogramVisualizer
-        
-        visualizer = HistogramVisualizer(df)
-        visualizer.create(
-            column='satisfaction_level',
-            title=metadata['title'],
-            bins=20,
-            kde=True,
-            color='skyblue'
-        )
+        # Histogram counts (the figure reuses the same bins)
+        counts, edges = np.histogram(df['satisfaction_level'].dropna(), bins=20)
+        distribution = pd.DataFrame({'bin_left': edges[:-1], 'bin_right': edges[1:], 'count': counts})
         
-        return {
-            'plot': visualizer,
+        # Create visualization using HistogramVisualizer
+        def render():
+            visualizer = HistogramVisualizer(df)
+            visualizer.create(
+                column='satisfaction_level',
+                title=metadata['title'],
+                bins=20,
+                kde=True,
+                color='skyblue'
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': distribution,
             'interpretation': (
                 "Satisfaction follows a bimodal distribution with peaks at low (~0.1) and moderate-high (~0.7) levels. "
                 "Approximately 20% of employees report very low satisfaction (<0.2), representing a high-risk group. "
                 "The majority (60%) report satisfaction between 0.4-0.8, while only 20% report very high satisfaction (>0.9). "
                 "This distribution suggests two distinct employee experiences within the organization."
             )
-        }
+        })
     
     @staticmethod
+    @requires('salary_summary')
     def q20_salary_vs_metrics(df):
         """How do project load, performance, and satisfaction vary by salary level?"""
         metadata = QuestionBank.get_question_metadata('q20_salary_vs_metrics')
         
         # Calculate metrics
-        metrics_by_salary = df.groupby('salary')[
+        metrics_by_salary = intermediate(df, 'salary_summary')[
             ['number_project', 'last_evaluation', 'satisfaction_level']
-        ].mean().reset_index()
+        ].reset_index()
         
         # Melt for visualization
         metrics_melted = metrics_by_salary.melt(
@@ -585,19 +651,21 @@ class QuestionBank:
         )
         
         # Create visualization
-        visualizer = BarPlotVisualizer(metrics_melted)
-        visualizer.create(
-            x='salary',
-            y='Value',
-            hue='Metric',
-            title=metadata['title'],
-            palette='Set2',
-            order=['low', 'medium', 'high']
-        )
-        
-        return {
-            'plot': visualizer,
+        def render():
+            visualizer = BarPlotVisualizer(metrics_melted)
+            visualizer.create(
+                x='salary',
+                y='Value',
+                hue='Metric',
+                title=metadata['title'],
+                palette='Set2',
+                order=['low', 'medium', 'high']
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': metrics_by_salary,
             'interpretation': (
                 "Higher salary levels correlate with higher project loads, better evaluation scores, "
                 "and greater satisfaction. High-salary employees handle the most projects (avg 4.5) "
@@ -606,29 +674,40 @@ class QuestionBank:
                 "This suggests higher performers are appropriately compensated, but there's room to "
                 "improve satisfaction for lower-salary employees."
             )
-        }
+        })
     
     @staticmethod
+    @requires('threshold_masks')
     def q21_extreme_projects(df):
         """Are employees with extreme project loads at higher risk?"""
         metadata = QuestionBank.get_question_metadata('q21_extreme_projects')
         
-        # Create visualization with thresholds
-        visualizer = ScatterPlotVisualizer(df)
-        visualizer.create(
-            x='number_project',
-            y='satisfaction_level',
-            title=metadata['title'],
-            alpha=0.7,
-            thresholds={
-                'horizontal': THRESHOLDS['low_satisfaction'],
-                'vertical': THRESHOLDS['high_projects']
-            }
-        )
+        # Attrition in each threshold quadrant
+        masks = intermediate(df, 'threshold_masks')
+        quadrants = df.groupby([
+            masks['high_projects'],
+            masks['low_satisfaction']
+        ])['left'].agg(['count', 'mean'])
+        quadrants.index.names = ['high_projects', 'low_satisfaction']
         
-        return {
-            'plot': visualizer,
+        # Create visualization with thresholds
+        def render():
+            visualizer = ScatterPlotVisualizer(df)
+            visualizer.create(
+                x='number_project',
+                y='satisfaction_level',
+                title=metadata['title'],
+                alpha=0.7,
+                thresholds={
+                    'horizontal': THRESHOLDS['low_satisfaction'],
+                    'vertical': THRESHOLDS['high_projects']
+                }
+            )
+            return visualizer
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': quadrants,
             'interpretation': (
                 "Employees with extreme project loads face significant satisfaction challenges. "
                 "Those with 1-2 projects show lower satisfaction, possibly due to underutilization. "
@@ -636,52 +715,67 @@ class QuestionBank:
                 "high risk of leaving. The data suggests an optimal range of 3-5 projects for maintaining "
                 "employee satisfaction and reducing attrition risk."
             )
-        }
+        })
     
     @staticmethod
+    @requires('high_risk_mask', 'risk_scores')
     def q22_high_risk_employees(df):
         """Who are the high-risk employees (low satisfaction, high performance, long hours)?"""
         metadata = QuestionBank.get_question_metadata('q22_high_risk_employees')
         
         # Identify high-risk employees
-        high_risk = df[
-            (df['satisfaction_level'] < THRESHOLDS['low_satisfaction']) & 
-            (df['last_evaluation'] > THRESHOLDS['high_evaluation']) & 
-            (df['average_montly_hours'] > THRESHOLDS['high_hours'])
-        ]
+        high_risk = df[intermediate(df, 'high_risk_mask')]
+        
+        # Model-based risk from the probability column the caller attached
+        risk = intermediate(df, 'risk_scores')
+        predicted_high_risk = int((risk >= RISK_MODEL_DEFAULTS['high_risk_probability']).sum())
+        high_risk = high_risk.assign(
+            **{risk.name: risk.loc[high_risk.index]}
+        ).sort_values(risk.name, ascending=False)
         
         # Create visualization
-        visualizer = ScatterPlotVisualizer(df)
-        visualizer.create(
-            x='last_evaluation',
-            y='satisfaction_level',
-            size='average_montly_hours',
-            title=metadata['title'],
-            alpha=0.5
-        )
+        def render():
+            visualizer = ScatterPlotVisualizer(df)
+            visualizer.create(
+                x='last_evaluation',
+                y='satisfaction_level',
+                size='average_montly_hours',
+                title=metadata['title'],
+                alpha=0.5
+            )
         
-        # Highlight high-risk employees
-        if not high_risk.empty:
-            plt.scatter(
-                high_risk['last_evaluation'],
-                high_risk['satisfaction_level'],
-                s=high_risk['average_montly_hours']/5,
+            # Highlight high-risk employees
+            visualizer.highlight(
+                high_risk,
+                x='last_evaluation',
+                y='satisfaction_level',
+                size='average_montly_hours',
                 color='red',
-                label='High Risk',
-                edgecolor='black',
-                linewidth=1
+                label='High Risk'
             )
-            plt.legend()
-        
-        return {
-            'plot': visualizer,
+            return visualizer
+
+        # Compact outputs: per-department counts and the highest-risk rows only
+        by_dept = pd.DataFrame({
+            'high_risk': high_risk.groupby('dept').size(),
+            'employees': df.groupby('dept').size()
+        }).fillna(0).astype(int)
+        by_dept['high_risk_share'] = by_dept['high_risk'] / by_dept['employees']
+        by_dept['mean_predicted_risk'] = high_risk.groupby('dept')[risk.name].mean()
+
+        return QuestionResult(render, {
             'metadata': metadata,
+            'data': by_dept.sort_values('high_risk', ascending=False),
             'high_risk_count': len(high_risk),
+            'high_risk_employees': high_risk.head(RISK_MODEL_DEFAULTS['top_employees']),
+            'predicted_high_risk_count': predicted_high_risk,
             'interpretation': (
                 f"We've identified {len(high_risk)} high-risk employees who combine high performance "
                 "(evaluation > 0.8), excessive workload (>250 hours/month), and low satisfaction (<0.4). "
                 "These valuable employees are at imminent risk of leaving. They represent the highest "
                 "priority for retention efforts as their departure would cause significant business impact. "
-                "Targeted interventions should focus on workload redistribution, recognition, and career pathing."
+                "Targeted interventions should focus on workload redistribution, recognition, and career pathing. "
+                f"The trained attrition model flags {predicted_high_risk} employees overall with a predicted "
+                f"leave probability of at least {RISK_MODEL_DEFAULTS['high_risk_probability']:.0%}."
             )
-        }
\ No newline at end of file
+        })
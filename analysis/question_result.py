@@ -0,0 +1,79 @@
+import threading
+import numpy as np
+import pandas as pd
+from utils.profiling import profile_span
+
+
+class QuestionResult(dict):
+    """
+    Output of a QuestionBank question with a lazily rendered figure
+
+    The computed parts (metadata, interpretation, 'data' aggregates, counts) are
+    ordinary dict entries. The 'plot' visualizer is only built by the question's
+    render function the first time result['plot'], result.get('plot'),
+    result.pop('plot') or render() is used, so callers that only need the numbers
+    never pay for matplotlib. 'plot' is not part of keys()/items() until rendered.
+    """
+
+    def __init__(self, render, fields: dict = None, name: str = None):
+        super().__init__(fields or {})
+        self._render = render
+        self._lock = threading.Lock()
+        self.name = name
+
+    def render(self):
+        """Build the visualizer once and return it"""
+        with self._lock:
+            if not dict.__contains__(self, 'plot'):
+                with profile_span(f"{self.name or 'question'}.render"):
+                    plot = self._render()
+                # Lets the visualizer label its encode step with the question id
+                plot.name = self.name
+                dict.__setitem__(self, 'plot', plot)
+            return dict.__getitem__(self, 'plot')
+
+    @property
+    def rendered(self) -> bool:
+        return dict.__contains__(self, 'plot')
+
+    def __missing__(self, key):
+        if key == 'plot':
+            return self.render()
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key == 'plot':
+            return self.render()
+        return super().get(key, default)
+
+    def pop(self, key, *default):
+        if key == 'plot':
+            self.render()
+        return super().pop(key, *default)
+
+    def data_only(self) -> dict:
+        """Plain dict of the computed fields, without the figure"""
+        return {key: value for key, value in self.items() if key != 'plot'}
+
+
+def to_json_safe(value):
+    """Convert computed result fields (frames, arrays, numpy scalars) to JSON types"""
+    if isinstance(value, pd.DataFrame):
+        return to_json_safe(
+            value.reset_index(drop=isinstance(value.index, pd.RangeIndex)).to_dict(orient='records')
+        )
+    if isinstance(value, pd.Series):
+        return to_json_safe(value.to_dict())
+    if isinstance(value, np.ndarray):
+        return to_json_safe(value.tolist())
+    if isinstance(value, dict):
+        return {str(key): to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
@@ -0,0 +1,216 @@
+"""
+Background HTML report export
+
+ReportExporter runs export jobs on a worker pool so callers (the dashboard) only
+submit a job and poll its progress. A job renders the selected questions for one
+filter combination concurrently through render_question_cached, so figures that
+were already shown in the app or rendered by other exports are reused, and
+assembles the KPIs, figures, interpretations and data tables into a single
+self-contained HTML file. A question that fails to render becomes an error
+section in the report instead of failing the whole export.
+"""
+import base64
+import html
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import pandas as pd
+from analysis.figure_cache import render_question_cached
+from analysis.question_bank import QuestionBank
+from utils.cache import LRUCache
+from utils.config import REPORT_DEFAULTS
+from utils.logger import logger
+
+
+@dataclass
+class ReportJob:
+    """State of one export; progress fields are updated by the worker"""
+    id: str
+    question_ids: list
+    filters: str
+    status: str = 'queued'
+    completed: int = 0
+    started: float = None
+    finished: float = None
+    error: str = None
+    failed: list = field(default_factory=list)
+    content: bytes = field(default=None, repr=False)
+
+    @property
+    def total(self) -> int:
+        return len(self.question_ids)
+
+    @property
+    def progress(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    @property
+    def filename(self) -> str:
+        stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(self.started or time.time()))
+        return f"employee_analysis_{stamp}.html"
+
+
+class ReportExporter:
+    """Submits report jobs to a shared pool and keeps the most recent ones for download"""
+
+    def __init__(self, workers: int = None, render_workers: int = None, max_jobs: int = None):
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers or REPORT_DEFAULTS['workers'], thread_name_prefix='report'
+        )
+        self._render_pool = ThreadPoolExecutor(
+            max_workers=render_workers or REPORT_DEFAULTS['render_workers'], thread_name_prefix='report-render'
+        )
+        self._jobs = LRUCache(max_jobs or REPORT_DEFAULTS['max_jobs'])
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        df: pd.DataFrame,
+        question_ids: list,
+        data_version: str,
+        filter_signature: str,
+        kpis: dict = None,
+        title: str = "Employee Satisfaction Analysis Report"
+    ) -> str:
+        """Queue an export and return its job id; df must not be modified afterwards"""
+        with self._lock:
+            job_id = f"report-{next(self._ids)}"
+        job = ReportJob(job_id, list(question_ids), filter_signature)
+        self._jobs.put(job_id, job)
+        self._pool.submit(self._run, job, df, data_version, kpis or {}, title)
+        return job_id
+
+    def get(self, job_id: str) -> ReportJob:
+        return self._jobs.get(job_id)
+
+    def _run(self, job: ReportJob, df, data_version: str, kpis: dict, title: str):
+        job.status, job.started = 'running', time.time()
+        futures = {}
+        try:
+            # Questions render concurrently; the figure cache skips anything already rendered
+            futures = {
+                self._render_pool.submit(
+                    render_question_cached, question_id, df, data_version, job.filters, 'png'
+                ): question_id
+                for question_id in job.question_ids
+            }
+            sections = {}
+            for future in as_completed(futures):
+                question_id = futures[future]
+                try:
+                    sections[question_id] = future.result()
+                except Exception as e:
+                    logger.error("Report export %s: %s failed: %s", job.id, question_id, e)
+                    sections[question_id] = (_error_result(question_id, e), None)
+                    job.failed.append(question_id)
+                job.completed += 1
+
+            job.content = build_html(
+                title, job.filters, kpis, [(q, *sections[q]) for q in job.question_ids]
+            ).encode('utf-8')
+            job.status = 'done'
+        except Exception as e:
+            logger.error("Report export %s failed: %s", job.id, e)
+            job.status, job.error = 'failed', str(e)
+            # Renders that have not started yet are no longer needed
+            for future in futures:
+                future.cancel()
+        finally:
+            job.finished = time.time()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._render_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _error_result(question_id: str, error: Exception) -> dict:
+    """Stand-in result for a question that could not be rendered"""
+    try:
+        metadata = QuestionBank.get_question_metadata(question_id)
+    except ValueError:
+        metadata = {'title': question_id, 'description': ''}
+    return {'metadata': metadata, 'error': f"{type(error).__name__}: {error}"}
+
+
+_STYLE = """
+body { font-family: -apple-system, 'Segoe UI', Helvetica, Arial, sans-serif; margin: 2em auto; max-width: 1000px; color: #222; }
+h1 { border-bottom: 2px solid #444; padding-bottom: .3em; }
+section { margin-top: 2.5em; page-break-inside: avoid; }
+table { border-collapse: collapse; font-size: 0.85em; margin: 1em 0; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: right; }
+th { background: #f3f3f3; }
+img { max-width: 100%; }
+.meta { color: #666; }
+.error { color: #a00; border-left: 3px solid #a00; padding-left: .8em; }
+"""
+
+
+def _format_kpi(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.1%}" if 0 <= value <= 1 else f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return html.escape(str(value))
+
+
+def _data_table(data) -> str:
+    """Small HTML table for a question's computed data (large frames are truncated)"""
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    if isinstance(data, dict):
+        data = pd.DataFrame([data])
+    if not isinstance(data, pd.DataFrame) or data.empty:
+        return ''
+    rows = REPORT_DEFAULTS['table_rows']
+    note = f"<p class='meta'>First {rows} of {len(data)} rows</p>" if len(data) > rows else ''
+    return data.head(rows).to_html(float_format=lambda v: f"{v:,.3f}", border=0) + note
+
+
+def build_html(title: str, filters: str, kpis: dict, sections: list) -> str:
+    """
+    Assemble a self-contained HTML report from (question_id, result, png) sections
+
+    A result with an 'error' entry (and no image) is rendered as an error section.
+    """
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head><body>",
+        f"<h1>{html.escape(title)}</h1>",
+        f"<p class='meta'>Generated {time.strftime('%Y-%m-%d %H:%M:%S')} &middot; "
+        f"Filters: {html.escape(filters)}</p>"
+    ]
+    if kpis:
+        parts.append("<h2>Key Metrics</h2><table>")
+        parts.extend(
+            f"<tr><th>{html.escape(name)}</th><td>{_format_kpi(value)}</td></tr>"
+            for name, value in kpis.items()
+        )
+        parts.append("</table>")
+
+    for question_id, result, image in sections:
+        metadata = result['metadata']
+        if 'error' in result:
+            parts.append(
+                f"<section id='{question_id}'><h2>{html.escape(metadata['title'])}</h2>"
+                f"<p class='meta'>{html.escape(metadata['description'])}</p>"
+                f"<p class='error'>This analysis could not be generated: "
+                f"{html.escape(result['error'])}</p></section>"
+            )
+            continue
+        interpretation = html.escape(result['interpretation']).replace('\n', '<br>')
+        parts.append(
+            f"<section id='{question_id}'><h2>{html.escape(metadata['title'])}</h2>"
+            f"<p class='meta'>{html.escape(metadata['description'])}</p>"
+            f"<img alt='{html.escape(metadata['title'])}' "
+            f"src='data:image/png;base64,{base64.b64encode(image).decode('ascii')}'>"
+            f"<p>{interpretation}</p>{_data_table(result.get('data'))}</section>"
+        )
+    parts.append("</body></html>")
+    return ''.join(parts)
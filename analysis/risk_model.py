@@ -0,0 +1,133 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+from utils.cache import dump_atomic
+from utils.config import CACHE_DIR, RISK_MODEL_DEFAULTS
+from utils.logger import logger
+
+class AttritionRiskModel:
+    """Trained attrition classifier with vectorized batch scoring"""
+
+    ESTIMATORS = ('hist_gradient_boosting', 'logistic_regression')
+
+    def __init__(self, estimator: str = None, random_state: int = None):
+        self.estimator = estimator or RISK_MODEL_DEFAULTS['estimator']
+        if self.estimator not in self.ESTIMATORS:
+            raise ValueError(f"Unknown estimator '{self.estimator}' - expected one of {list(self.ESTIMATORS)}")
+        self.random_state = (
+            random_state if random_state is not None else RISK_MODEL_DEFAULTS['random_state']
+        )
+        self.numeric_features = list(RISK_MODEL_DEFAULTS['numeric_features'])
+        self.categorical_features = ['dept', 'salary']
+        self.pipeline = None
+        self.data_version = None
+
+    @property
+    def features(self) -> list:
+        return self.numeric_features + self.categorical_features
+
+    def _build_pipeline(self) -> Pipeline:
+        """One-hot dept, ordinal salary, numeric passthrough (scaled for the linear model)"""
+        numeric = StandardScaler() if self.estimator == 'logistic_regression' else 'passthrough'
+        preprocess = ColumnTransformer([
+            ('dept', OneHotEncoder(handle_unknown='ignore'), ['dept']),
+            (
+                'salary',
+                OrdinalEncoder(
+                    categories=[RISK_MODEL_DEFAULTS['salary_order']],
+                    handle_unknown='use_encoded_value',
+                    unknown_value=-1
+                ),
+                ['salary']
+            ),
+            ('numeric', numeric, self.numeric_features)
+        ])
+
+        if self.estimator == 'logistic_regression':
+            model = LogisticRegression(max_iter=1000)
+        else:
+            model = HistGradientBoostingClassifier(random_state=self.random_state)
+
+        return Pipeline([('preprocess', preprocess), ('model', model)])
+
+    def _prepare(self, df: pd.DataFrame) -> tuple:
+        """Return (feature frame, mask of complete rows) with numeric columns as float32"""
+        missing = [f for f in self.features if f not in df.columns]
+        if missing:
+            raise ValueError(f"Missing features in DataFrame: {missing}")
+
+        X = pd.DataFrame({
+            col: df[col].to_numpy(dtype=np.float32) for col in self.numeric_features
+        }, index=df.index)
+        for col in self.categorical_features:
+            X[col] = df[col].astype(object)
+
+        complete = X.notna().all(axis=1).to_numpy()
+        return X, complete
+
+    def fit(self, df: pd.DataFrame, data_version: str = None) -> 'AttritionRiskModel':
+        """Train on every complete row with a known 'left' outcome"""
+        X, complete = self._prepare(df)
+        complete = complete & df['left'].notna().to_numpy()
+        y = df['left'].to_numpy()[complete].astype(int)
+
+        logger.info("Training %s attrition model on %s employees", self.estimator, complete.sum())
+        self.pipeline = self._build_pipeline()
+        self.pipeline.fit(X[complete], y)
+        self.data_version = data_version
+        return self
+
+    def predict_proba(self, df: pd.DataFrame, chunk_size: int = None) -> pd.Series:
+        """Score rows in vectorized chunks; incomplete rows get NaN"""
+        if self.pipeline is None:
+            raise ValueError("Model is not trained - call fit() first")
+
+        chunk_size = chunk_size or RISK_MODEL_DEFAULTS['chunk_size']
+        X, complete = self._prepare(df)
+        rows = np.flatnonzero(complete)
+
+        scores = np.full(len(df), np.nan, dtype=np.float32)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            scores[chunk] = self.pipeline.predict_proba(X.iloc[chunk])[:, 1]
+
+        return pd.Series(scores, index=df.index, name=RISK_MODEL_DEFAULTS['score_column'])
+
+    def add_scores(self, df: pd.DataFrame, chunk_size: int = None) -> pd.DataFrame:
+        """Return df with the attrition probability column attached"""
+        scores = self.predict_proba(df, chunk_size=chunk_size)
+        return df.assign(**{scores.name: scores})
+
+    def save(self, path: str):
+        """Persist the trained model artifact"""
+        dump_atomic(self, path)
+        logger.info("Saved attrition model to %s", path)
+
+    @staticmethod
+    def load(path: str) -> 'AttritionRiskModel':
+        """Load a persisted model artifact"""
+        return joblib.load(path)
+
+    @classmethod
+    def load_or_train(cls, df: pd.DataFrame, data_version: str, **params) -> 'AttritionRiskModel':
+        """Load the artifact for this dataset version, training and saving it if absent"""
+        model = cls(**params)
+        path = os.path.join(CACHE_DIR, f"risk_model_{model.estimator}_{data_version}.joblib")
+        if os.path.exists(path):
+            try:
+                loaded = cls.load(path)
+                if loaded.data_version == data_version:
+                    logger.debug("Loaded attrition model from %s", path)
+                    return loaded
+            except Exception as e:
+                logger.warning("Ignoring unreadable attrition model %s: %s", path, e)
+
+        model.fit(df, data_version=data_version)
+        model.save(path)
+        return model
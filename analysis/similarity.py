@@ -0,0 +1,166 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree, BallTree
+from analysis.features import FeatureMatrixBuilder
+from utils.cache import dump_atomic, frame_fingerprint
+from utils.config import CACHE_DIR, MODELING_DEFAULTS, SIMILARITY_DEFAULTS
+from utils.logger import logger
+
+class SimilarEmployeeIndex:
+    """Tree-backed nearest-neighbour index over the employee feature space"""
+
+    TREES = {
+        'kd_tree': KDTree,
+        'ball_tree': BallTree
+    }
+
+    def __init__(
+        self,
+        features: list = None,
+        algorithm: str = None,
+        leaf_size: int = None,
+        id_column: str = None,
+        metric: str = None
+    ):
+        self.features = features or SIMILARITY_DEFAULTS['features']
+        self.algorithm = algorithm or SIMILARITY_DEFAULTS['algorithm']
+        self.leaf_size = leaf_size or SIMILARITY_DEFAULTS['leaf_size']
+        self.id_column = id_column or SIMILARITY_DEFAULTS['id_column']
+        self.metric = metric or SIMILARITY_DEFAULTS['metric']
+        self.scaling = MODELING_DEFAULTS['scaling']
+        if self.algorithm not in self.TREES:
+            raise ValueError(f"Unknown algorithm '{self.algorithm}' - expected one of {list(self.TREES)}")
+        self.tree = None
+        self.scaler = None
+        self.X = None
+        self.ids = None
+        self.left = None
+        self.data_version = None
+
+    def build(self, df: pd.DataFrame, data_version: str = None) -> 'SimilarEmployeeIndex':
+        """Build the tree on the scaled features of every complete row"""
+        if self.id_column not in df.columns:
+            raise ValueError(f"Missing id column in DataFrame: {self.id_column}")
+
+        fm = FeatureMatrixBuilder.build(df, self.features, scaling=self.scaling)
+        rows = df.iloc[fm.rows]
+        ids = pd.Index(rows[self.id_column].to_numpy())
+        if ids.hasnans or not ids.is_unique:
+            raise ValueError(f"Column '{self.id_column}' must contain unique, non-missing ids")
+
+        logger.info("Building %s similarity index over %s employees", self.algorithm, len(fm.X))
+        self.tree = self.TREES[self.algorithm](fm.X, leaf_size=self.leaf_size, metric=self.metric)
+        self.scaler = fm.scaler
+        self.X = fm.X
+        self.ids = ids
+        self.left = rows['left'].to_numpy() if 'left' in rows.columns else None
+        self.data_version = data_version or self.fingerprint(df)
+        return self
+
+    @property
+    def params(self) -> dict:
+        """Every setting besides the data that determines the built index"""
+        return {
+            'features': list(self.features),
+            'algorithm': self.algorithm,
+            'metric': self.metric,
+            'leaf_size': self.leaf_size,
+            'id_column': self.id_column,
+            'scaling': self.scaling
+        }
+
+    def fingerprint(self, df: pd.DataFrame) -> str:
+        """Content hash of the columns this index depends on"""
+        columns = [self.id_column] + self.features
+        if 'left' in df.columns:
+            columns.append('left')
+        return frame_fingerprint(df, columns)
+
+    def query(self, employee_ids, k: int = None, batch_size: int = None) -> pd.DataFrame:
+        """
+        Return the k most similar employees for each requested id
+
+        Args:
+            employee_ids: One id or a list of ids from the id column
+            k: Number of neighbours per employee (the employee itself is excluded)
+            batch_size: Number of query points sent to the tree at once
+
+        Returns:
+            Long-format DataFrame with one row per (employee, neighbour) pair
+        """
+        if self.tree is None:
+            raise ValueError("Index is not built - call build() first")
+
+        k = k or SIMILARITY_DEFAULTS['k']
+        batch_size = batch_size or SIMILARITY_DEFAULTS['batch_size']
+        employee_ids = np.atleast_1d(np.asarray(employee_ids))
+
+        positions = self.ids.get_indexer(employee_ids)
+        unknown = employee_ids[positions < 0]
+        if len(unknown):
+            raise KeyError(f"Unknown employee ids: {unknown.tolist()[:10]}")
+
+        k_query = min(k + 1, len(self.ids))
+        neighbours = np.empty((len(positions), k_query - 1), dtype=np.intp)
+        distances = np.empty((len(positions), k_query - 1), dtype=np.float64)
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            dist, idx = self.tree.query(self.X[batch], k=k_query)
+            # Drop each employee's own entry (or the farthest hit if ties pushed it out)
+            is_self = idx == batch[:, None]
+            has_self = is_self.any(axis=1)
+            is_self[~has_self, -1] = True
+            keep = ~is_self
+            neighbours[start:start + len(batch)] = idx[keep].reshape(len(batch), -1)
+            distances[start:start + len(batch)] = dist[keep].reshape(len(batch), -1)
+
+        n_neighbours = neighbours.shape[1]
+        result = pd.DataFrame({
+            self.id_column: np.repeat(employee_ids, n_neighbours),
+            'rank': np.tile(np.arange(1, n_neighbours + 1), len(employee_ids)),
+            'similar_id': self.ids.to_numpy()[neighbours.ravel()],
+            'distance': distances.ravel()
+        })
+        if self.left is not None:
+            result['left'] = self.left[neighbours.ravel()]
+        return result
+
+    def save(self, path: str):
+        """Persist the index to disk"""
+        dump_atomic(self, path)
+        logger.info("Saved similarity index to %s", path)
+
+    @staticmethod
+    def load(path: str) -> 'SimilarEmployeeIndex':
+        """Load a persisted index"""
+        return joblib.load(path)
+
+    @classmethod
+    def load_or_build(cls, df: pd.DataFrame, data_version: str = None, **params) -> 'SimilarEmployeeIndex':
+        """
+        Load the persisted index for this dataset version, building and saving it if absent
+
+        A persisted index built with different settings (features, tree, metric,
+        leaf size, id column or scaling) is rebuilt rather than reused.
+        """
+        index = cls(**params)
+        data_version = data_version or index.fingerprint(df)
+        path = os.path.join(
+            CACHE_DIR,
+            f"similarity_{index.algorithm}_{data_version}.joblib"
+        )
+        if os.path.exists(path):
+            try:
+                loaded = cls.load(path)
+                # Indexes pickled before a setting existed lack it and are rebuilt
+                if getattr(loaded, 'params', None) == index.params and loaded.data_version == data_version:
+                    logger.debug("Loaded similarity index from %s", path)
+                    return loaded
+            except Exception as e:
+                logger.warning("Ignoring unreadable similarity index %s: %s", path, e)
+
+        index.build(df, data_version=data_version)
+        index.save(path)
+        return index
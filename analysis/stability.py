@@ -0,0 +1,142 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.cluster import KMeans
+from threadpoolctl import threadpool_limits
+from analysis.clustering import EmployeeClusterer, align_labels
+from analysis.features import FeatureMatrixBuilder
+from utils.config import STABILITY_DEFAULTS
+from utils.logger import logger
+
+# Per-worker state, set once by the pool initializer so X is shipped once per process
+_worker_X = None
+_worker_params = None
+
+
+def _init_worker(X: np.ndarray, params: dict):
+    global _worker_X, _worker_params
+    _worker_X = X
+    _worker_params = params
+    # One BLAS/OpenMP thread per process avoids oversubscribing the cores
+    threadpool_limits(1)
+
+
+def _resample_weights(seed: int, n: int) -> np.ndarray:
+    """Bootstrap resample expressed as per-row multiplicities (no row copies)"""
+    rng = np.random.default_rng(seed)
+    return np.bincount(rng.integers(0, n, size=n), minlength=n).astype(np.float32)
+
+
+def _fit_resample(seed: int) -> np.ndarray:
+    """Fit KMeans on one bootstrap resample and return its centers"""
+    weights = _resample_weights(seed, len(_worker_X))
+    kmeans = KMeans(
+        n_clusters=_worker_params['n_clusters'],
+        n_init=_worker_params['n_init'],
+        random_state=seed
+    )
+    kmeans.fit(_worker_X, sample_weight=weights)
+    return kmeans.cluster_centers_
+
+
+def _nearest_center(X: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Vectorized nearest-center assignment"""
+    distances = (
+        (X * X).sum(axis=1)[:, None]
+        - 2 * X @ centers.T
+        + (centers * centers).sum(axis=1)[None, :]
+    )
+    return distances.argmin(axis=1)
+
+
+class ClusterStabilityAnalyzer:
+    """Bootstrap stability of EmployeeClusterer segments"""
+
+    def __init__(
+        self,
+        clusterer: EmployeeClusterer = None,
+        n_bootstrap: int = None,
+        n_jobs: int = None,
+        n_init: int = None,
+        random_state: int = None
+    ):
+        self.clusterer = clusterer or EmployeeClusterer()
+        self.n_bootstrap = n_bootstrap or STABILITY_DEFAULTS['n_bootstrap']
+        self.n_jobs = n_jobs or STABILITY_DEFAULTS['n_jobs'] or os.cpu_count()
+        self.n_init = n_init or STABILITY_DEFAULTS['n_init']
+        self.random_state = (
+            random_state if random_state is not None else STABILITY_DEFAULTS['random_state']
+        )
+
+    def run(self, df: pd.DataFrame) -> dict:
+        """
+        Fit bootstrap resamples in a process pool and compare them to the reference fit
+
+        Returns:
+            dict with 'cluster_stability' (mean/std Jaccard per reference cluster) and
+            'assignment_confidence' (share of resamples agreeing with each employee's
+            reference cluster, indexed like the complete rows of df)
+
+        An unfitted clusterer is fitted on df first. A fitted one (e.g. the global
+        model with df a filtered subset) keeps its centers; df's rows are scaled and
+        assigned under it, so the resamples and confidences always describe df.
+        """
+        clusterer = self.clusterer
+        if clusterer.kmeans is None or clusterer.feature_matrix is None:
+            clusterer.fit(df)
+
+        fm = FeatureMatrixBuilder.build(
+            df, clusterer.features, scaling=clusterer.scaling, scaler=clusterer.feature_matrix.scaler
+        )
+        X = fm.X
+        n = len(X)
+        k = clusterer.n_clusters
+        reference_centers = clusterer.kmeans.cluster_centers_
+        reference_labels = clusterer.kmeans.predict(X)
+
+        seeds = np.random.default_rng(self.random_state).integers(
+            0, 2**31 - 1, size=self.n_bootstrap
+        )
+        params = {'n_clusters': k, 'n_init': self.n_init}
+
+        logger.info("Running %s bootstrap clusterings on %s processes", self.n_bootstrap, self.n_jobs)
+        jaccard = np.zeros((self.n_bootstrap, k))
+        agreement = np.zeros(n, dtype=np.int32)
+        reference_members = [reference_labels == c for c in range(k)]
+
+        with ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            initializer=_init_worker,
+            initargs=(X, params)
+        ) as pool:
+            for i, (seed, centers) in enumerate(zip(seeds, pool.map(_fit_resample, seeds))):
+                # Relabel the resample's clusters to match the reference ids
+                mapping = align_labels(centers, reference_centers)
+                labels = mapping[_nearest_center(X, centers)]
+                agreement += labels == reference_labels
+
+                # Jaccard over the employees actually drawn into this resample
+                sampled = _resample_weights(seed, n) > 0
+                for c in range(k):
+                    a = reference_members[c] & sampled
+                    b = (labels == c) & sampled
+                    union = np.count_nonzero(a | b)
+                    jaccard[i, c] = np.count_nonzero(a & b) / union if union else 0.0
+
+        cluster_stability = pd.DataFrame({
+            'Cluster': np.arange(k),
+            'Mean Jaccard': jaccard.mean(axis=0),
+            'Std Jaccard': jaccard.std(axis=0),
+            'Stable': jaccard.mean(axis=0) >= STABILITY_DEFAULTS['stable_jaccard']
+        })
+        assignment_confidence = pd.Series(
+            agreement / self.n_bootstrap,
+            index=fm.index,
+            name='assignment_confidence'
+        )
+        logger.info("Cluster stability (mean Jaccard): %s", np.round(jaccard.mean(axis=0), 3).tolist())
+        return {
+            'cluster_stability': cluster_stability,
+            'assignment_confidence': assignment_confidence
+        }
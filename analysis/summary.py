@@ -0,0 +1,146 @@
+"""
+Summary statistics from mergeable partial aggregates
+
+SummaryService scans the dataset once and keeps, for every (dept, salary) cell
+and numeric column, the count, mean, sum of squared deviations (M2), min, max
+and a histogram sketch. A summary for any dept/salary filter merges the selected
+cells (Chan's parallel variance formula for std, summed sketches for quantiles)
+without touching the rows again.
+
+Sketches are exact value counts for columns with few distinct values, so their
+quantiles match describe(); other columns use fixed-width histograms and
+interpolate within a bin.
+"""
+import numpy as np
+import pandas as pd
+from utils.config import SUMMARY_DEFAULTS
+
+PERCENTILES = (0.25, 0.5, 0.75)
+
+
+class _ColumnAggregates:
+    """Per-cell moments and sketch for one numeric column"""
+
+    def __init__(self, values: np.ndarray, cells: np.ndarray, n_cells: int, max_exact: int, sketch_bins: int):
+        valid = ~np.isnan(values)
+        values, cells = values[valid], cells[valid]
+
+        self.count = np.bincount(cells, minlength=n_cells)
+        sums = np.bincount(cells, weights=values, minlength=n_cells)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean = np.where(self.count > 0, sums / self.count, 0.0)
+        self.m2 = np.bincount(cells, weights=(values - self.mean[cells]) ** 2, minlength=n_cells)
+
+        self.min = np.full(n_cells, np.inf)
+        self.max = np.full(n_cells, -np.inf)
+        np.minimum.at(self.min, cells, values)
+        np.maximum.at(self.max, cells, values)
+
+        distinct = np.unique(values)
+        self.exact = len(distinct) <= max_exact
+        if self.exact:
+            self.points = distinct
+            codes = np.searchsorted(distinct, values)
+        else:
+            self.points = np.linspace(distinct[0], distinct[-1], sketch_bins + 1)
+            codes = np.clip(np.searchsorted(self.points, values, side='right') - 1, 0, sketch_bins - 1)
+        n_bins = len(self.points) if self.exact else sketch_bins
+        self.sketch = np.bincount(cells * n_bins + codes, minlength=n_cells * n_bins).reshape(n_cells, n_bins)
+
+    def merge(self, selected: np.ndarray) -> dict:
+        """Combine the selected cells into describe()-style statistics"""
+        count = self.count[selected]
+        n = count.sum()
+        if n == 0:
+            return {'count': 0.0, 'mean': np.nan, 'std': np.nan, 'min': np.nan,
+                    **{f"{q:.0%}": np.nan for q in PERCENTILES}, 'max': np.nan}
+
+        mean = (count * self.mean[selected]).sum() / n
+        m2 = (self.m2[selected] + count * (self.mean[selected] - mean) ** 2).sum()
+        stats = {
+            'count': float(n),
+            'mean': mean,
+            'std': np.sqrt(m2 / (n - 1)) if n > 1 else np.nan,
+            'min': self.min[selected].min()
+        }
+        histogram = self.sketch[selected].sum(axis=0)
+        for q in PERCENTILES:
+            stats[f"{q:.0%}"] = self._quantile(histogram, n, q)
+        stats['max'] = self.max[selected].max()
+        return stats
+
+    def _quantile(self, histogram: np.ndarray, n: int, q: float) -> float:
+        """Linear-interpolated quantile (pandas' default) from a merged sketch"""
+        position = (n - 1) * q
+        lower = int(np.floor(position))
+        low_value = self._order_statistic(histogram, lower)
+        if position == lower:
+            return low_value
+        high_value = self._order_statistic(histogram, lower + 1)
+        return low_value + (high_value - low_value) * (position - lower)
+
+    def _order_statistic(self, histogram: np.ndarray, k: int) -> float:
+        """Value of the k-th smallest element (0-based)"""
+        cumulative = np.cumsum(histogram)
+        b = int(np.searchsorted(cumulative, k, side='right'))
+        if self.exact:
+            return self.points[b]
+        # Spread the bin's elements evenly across its width
+        before = cumulative[b] - histogram[b]
+        left, right = self.points[b], self.points[b + 1]
+        return left + (k - before + 0.5) / histogram[b] * (right - left)
+
+
+class SummaryService:
+    """describe()-equivalent summaries for any dept/salary filter without rescanning rows"""
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        columns: list = None,
+        max_exact: int = None,
+        sketch_bins: int = None
+    ):
+        self.columns = columns or df.select_dtypes(include='number').columns.tolist()
+        max_exact = max_exact or SUMMARY_DEFAULTS['max_exact_values']
+        sketch_bins = sketch_bins or SUMMARY_DEFAULTS['sketch_bins']
+
+        # One cell per (dept, salary) pair; missing values get their own level
+        dept_codes, self.depts = self._encode(df['dept'])
+        salary_codes, self.salaries = self._encode(df['salary'])
+        self._n_salary = len(self.salaries) + 1
+        cells = dept_codes * self._n_salary + salary_codes
+        n_cells = (len(self.depts) + 1) * self._n_salary
+
+        self._aggregates = {
+            column: _ColumnAggregates(
+                df[column].to_numpy(dtype=np.float64, na_value=np.nan),
+                cells, n_cells, max_exact, sketch_bins
+            )
+            for column in self.columns
+        }
+
+    @staticmethod
+    def _encode(series: pd.Series) -> tuple:
+        codes, levels = pd.factorize(series, sort=True)
+        codes = np.where(codes < 0, len(levels), codes)
+        return codes, [str(level) for level in levels]
+
+    def _selected_cells(self, depts: list, salaries: list) -> np.ndarray:
+        dept_rows = (
+            np.arange(len(self.depts) + 1) if depts is None
+            else [self.depts.index(str(d)) for d in depts if str(d) in self.depts]
+        )
+        salary_cols = (
+            np.arange(self._n_salary) if salaries is None
+            else [self.salaries.index(str(s)) for s in salaries if str(s) in self.salaries]
+        )
+        return (np.asarray(dept_rows)[:, None] * self._n_salary + np.asarray(salary_cols)[None, :]).ravel()
+
+    def summarize(self, depts: list = None, salaries: list = None) -> pd.DataFrame:
+        """Summary with one row per numeric column, laid out like df.describe().T"""
+        selected = self._selected_cells(depts, salaries).astype(np.int64)
+        return pd.DataFrame.from_dict(
+            {column: agg.merge(selected) for column, agg in self._aggregates.items()},
+            orient='index'
+        )
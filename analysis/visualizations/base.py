@@ -1,51 +1,179 @@
-import matplotlib.pyplot as plt
+import io
+import os
 from abc import ABC, abstractmethod
-from utils.config import VISUALIZATION_DEFAULTS
+from matplotlib.collections import Collection
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.lines import Line2D
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from utils.config import VISUALIZATION_DEFAULTS, EXPORT
+from utils.logger import logger
+from utils.profiling import profile_span
 from pandas import DataFrame
+
+VECTOR_FORMATS = ('svg', 'pdf', 'eps', 'ps')
+
+
+def _element_count(artist) -> int:
+    """Number of drawn primitives (points, paths, pixels) behind one artist"""
+    if isinstance(artist, Collection):
+        return max(len(artist.get_offsets()), len(artist.get_paths()))
+    if isinstance(artist, AxesImage):
+        return artist.get_array().size
+    if isinstance(artist, Line2D):
+        return len(artist.get_xdata())
+    return 1
+
 class BaseVisualizer(ABC):
-    """Abstract base class for all visualizations"""
-    
+    """
+    Abstract base class for all visualizations
+
+    Figures are plain matplotlib Figure objects on their own Agg canvas - nothing is
+    registered with pyplot, so visualizers can render concurrently from worker threads
+    and are freed as soon as they are encoded or released.
+    """
+
     def __init__(self, df: DataFrame):
         self.df = df
         self.fig = None
         self.ax = None
-    
+        self.name = None
+
     @abstractmethod
     def create(self, **kwargs):
         """Create the visualization"""
         pass
-    
+
+    def _new_figure(self):
+        """Create a standalone figure with an Agg canvas and a single axes"""
+        self.release()
+        self.fig = Figure(figsize=VISUALIZATION_DEFAULTS['figure_size'])
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        return self.ax
+
     def _setup_plot(self, title: str, xlabel: str = None, ylabel: str = None):
         """Setup common plot elements and ensure proper figure handling"""
-        self.fig, self.ax = plt.subplots(
-            figsize=VISUALIZATION_DEFAULTS['figure_size']
-        )
+        self._new_figure()
         self.ax.set_title(title, fontsize=14)
         if xlabel:
             self.ax.set_xlabel(xlabel, fontsize=12)
         if ylabel:
             self.ax.set_ylabel(ylabel, fontsize=12)
         return self.ax
-    
-    def save(self, filepath: str, dpi: int = None):
-        """Save the visualization to file"""
+
+    def dense_artists(self, threshold: int = None) -> list:
+        """Data artists too large to be written efficiently as vector paths"""
+        threshold = threshold or EXPORT['rasterize_threshold']
+        return [
+            artist
+            for ax in self.fig.axes
+            for artist in ax.get_children()
+            if isinstance(artist, (Collection, AxesImage, Line2D)) and _element_count(artist) > threshold
+        ]
+
+    def pick_format(self) -> str:
+        """Choose SVG for sparse figures and mixed raster/vector PDF for dense ones"""
         if self.fig is None:
-            raise ValueError("No figure to save - call create() first")
-        
+            raise ValueError("No figure to export - call create() first")
+        return EXPORT['auto_dense_format'] if self.dense_artists() else EXPORT['auto_vector_format']
+
+    def _encode(self, fmt: str, dpi: int) -> bytes:
+        buffer = io.BytesIO()
+        with profile_span(f"{self.name or type(self).__name__}.encode"):
+            self.fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+        return buffer.getvalue()
+
+    def export(self, fmt: str = 'auto', dpi: int = None, max_bytes: int = None, fallback: bool = True) -> tuple:
+        """
+        Encode the figure with dense layers rasterized and the output size bounded
+
+        In vector formats, artists above EXPORT['rasterize_threshold'] elements are
+        drawn as an embedded image at dpi while axes, text and reference lines stay
+        vectors. When the result exceeds max_bytes the dpi is halved down to
+        EXPORT['min_dpi']; if it is still too large and fallback is set, PNG is used.
+        The figure is kept, so several formats can be exported from one render.
+
+        Returns:
+            (bytes, format actually written)
+        """
+        if self.fig is None:
+            raise ValueError("No figure to export - call create() first")
+
+        fmt = self.pick_format() if fmt == 'auto' else fmt.lower()
         dpi = dpi or VISUALIZATION_DEFAULTS['dpi']
-        self.fig.savefig(filepath, dpi=dpi, bbox_inches='tight')
-        plt.close(self.fig)
-    
+        max_bytes = max_bytes or EXPORT['max_bytes']
+        if fmt in VECTOR_FORMATS:
+            for artist in self.dense_artists():
+                artist.set_rasterized(True)
+
+        data = self._encode(fmt, dpi)
+        while len(data) > max_bytes and dpi > EXPORT['min_dpi']:
+            dpi = max(dpi // 2, EXPORT['min_dpi'])
+            data = self._encode(fmt, dpi)
+
+        if len(data) > max_bytes and fallback and fmt != 'png':
+            logger.warning("%s export is %s bytes, falling back to PNG at %s dpi", fmt.upper(), len(data), dpi)
+            fmt = 'png'
+            data = self._encode(fmt, dpi)
+        return data, fmt
+
+    def save(self, filepath: str, dpi: int = None, max_bytes: int = None) -> str:
+        """
+        Save the visualization to file and release the figure
+
+        The format follows the file extension ('.auto' or no extension picks one);
+        returns the path written, whose extension changes if the export fell back to PNG.
+        """
+        if self.fig is None:
+            raise ValueError("No figure to save - call create() first")
+
+        root, ext = os.path.splitext(filepath)
+        try:
+            data, fmt = self.export(ext.lstrip('.') or 'auto', dpi=dpi, max_bytes=max_bytes)
+        finally:
+            self.release()
+
+        filepath = filepath if ext.lstrip('.').lower() == fmt else f"{root}.{fmt}"
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        return filepath
+
+    def to_bytes(self, fmt: str = 'png', dpi: int = None, max_bytes: int = None) -> bytes:
+        """Encode the visualization as PNG/SVG/PDF bytes in the given format and release the figure"""
+        if self.fig is None:
+            raise ValueError("No figure to encode - call create() first")
+
+        try:
+            data, _ = self.export(fmt, dpi=dpi, max_bytes=max_bytes, fallback=False)
+        finally:
+            self.release()
+        return data
+
+    def release(self):
+        """Drop the figure and its artists so memory is reclaimed immediately"""
+        if self.fig is not None:
+            self.fig.clear()
+        self.fig = None
+        self.ax = None
+
+    def close(self):
+        """Release the figure without rendering it"""
+        self.release()
+
     def show(self):
-        """Display the visualization"""
+        """Display the visualization in an interactive pyplot window"""
         if self.fig is None:
             raise ValueError("No figure to show - call create() first")
-        
-        plt.tight_layout()
+
+        # pyplot is only touched for interactive display
+        import matplotlib.pyplot as plt
+        plt.figure(self.fig)
+        self.fig.tight_layout()
         plt.show()
-    
+
     def get_figure(self):
         """Return the matplotlib figure object"""
         if self.fig is None:
             raise ValueError("No figure available - call create() first")
-        return self.fig
\ No newline at end of file
+        return self.fig
@@ -1,10 +1,113 @@
+import numpy as np
+import pandas as pd
 import seaborn as sns
 from .base import BaseVisualizer
+from analysis.binning import binned_groups
+from utils.cache import LRUCache, frame_key
 from utils.config import VISUALIZATION_DEFAULTS
 
+_stats_cache = LRUCache(64)
+
+
+def _format_label(value) -> str:
+    """Readable tick label for a group key (2.0 -> '2')"""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def box_stats(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    order: list = None,
+    whis: float = 1.5,
+    max_fliers: int = None,
+    x_bins: int = None
+) -> list:
+    """
+    Per-group five-number summaries for Axes.bxp, computed with one groupby-quantile
+
+    Whiskers follow matplotlib's rule (furthest point within whis * IQR of the box).
+    Fliers are a random sample of at most max_fliers points per group. With x_bins
+    a numeric df[x] is grouped into that many equal-width bins, numbered from 1.
+    Results are cached per frame (see utils.cache.frame_key) and parameters, so
+    pass the caller's frame rather than a column selection of it.
+    """
+    max_fliers = max_fliers if max_fliers is not None else VISUALIZATION_DEFAULTS['box_max_fliers']
+    key = (
+        frame_key(df), x, y,
+        tuple(order) if order is not None else None, whis, max_fliers, x_bins
+    )
+    cached = _stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    data = (binned_groups(df, x, x_bins, y) if x_bins else df[[x, y]]).dropna()
+    groups = data[x]
+    values = data[y]
+    grouped = values.groupby(groups, observed=True, sort=True)
+
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    q1, med, q3 = quartiles[0.25], quartiles[0.5], quartiles[0.75]
+    iqr = q3 - q1
+    low_fence = (q1 - whis * iqr).reindex(groups).to_numpy()
+    high_fence = (q3 + whis * iqr).reindex(groups).to_numpy()
+
+    inside = (values.to_numpy() >= low_fence) & (values.to_numpy() <= high_fence)
+    inner = values.where(inside).groupby(groups, observed=True, sort=True)
+    whislo, whishi = inner.min(), inner.max()
+    counts = grouped.size()
+
+    # Cap fliers per group with a shuffled head() so huge groups stay cheap to draw
+    outliers = values[~inside]
+    if len(outliers):
+        shuffled = outliers.sample(frac=1, random_state=0)
+        outliers = shuffled.groupby(groups[shuffled.index], observed=True).head(max_fliers)
+    fliers = {
+        name: group.to_numpy()
+        for name, group in outliers.groupby(groups[outliers.index], observed=True)
+    }
+
+    if order is None:
+        if isinstance(groups.dtype, pd.CategoricalDtype):
+            order = [c for c in groups.cat.categories if c in counts.index]
+        else:
+            order = list(counts.index)
+
+    stats = []
+    for group in order:
+        if group not in counts.index:
+            continue
+        stats.append({
+            'label': _format_label(group),
+            'med': med[group],
+            'q1': q1[group],
+            'q3': q3[group],
+            'whislo': whislo[group],
+            'whishi': whishi[group],
+            'fliers': fliers.get(group, np.empty(0)),
+            'n': int(counts[group])
+        })
+
+    _stats_cache.put(key, stats)
+    return stats
+
+
+def box_summary(df: pd.DataFrame, x: str, y: str, order: list = None) -> pd.DataFrame:
+    """Box statistics per group as a small frame (no fliers), sharing box_stats' cache"""
+    stats = box_stats(df, x, y, order=order)
+    columns = ['n', 'whislo', 'q1', 'med', 'q3', 'whishi']
+    return pd.DataFrame(
+        [[s[c] for c in columns] for s in stats],
+        index=pd.Index([s['label'] for s in stats], name=x),
+        columns=columns
+    )
+
+
 class BoxPlotVisualizer(BaseVisualizer):
     """Creates box plots for categorical comparisons"""
-    
+
     def create(
         self,
         x: str,
@@ -14,22 +117,27 @@ class BoxPlotVisualizer(BaseVisualizer):
         rotation: int = None,
         order: list = None
     ):
-        """Create a box plot"""
+        """Create a box plot from precomputed group summaries"""
         ax = self._setup_plot(title, xlabel=x, ylabel=y)
-        
+
         palette = palette or VISUALIZATION_DEFAULTS['palette']
         rotation = rotation if rotation is not None else VISUALIZATION_DEFAULTS['rotation']
-        
-        sns.boxplot(
-            x=x,
-            y=y,
-            data=self.df,
-            palette=palette,
-            order=order,
-            ax=ax
+
+        self.stats = box_stats(self.df, x, y, order=order)
+        boxes = ax.bxp(
+            self.stats,
+            patch_artist=True,
+            widths=0.8,
+            medianprops={'color': '0.25', 'linewidth': 1.5},
+            whiskerprops={'color': '0.25'},
+            capprops={'color': '0.25'},
+            flierprops={'marker': 'd', 'markersize': 5, 'markerfacecolor': '0.25'}
         )
-        
+        for patch, color in zip(boxes['boxes'], sns.color_palette(palette, len(self.stats))):
+            patch.set_facecolor(color)
+            patch.set_edgecolor('0.25')
+
         if rotation:
             ax.set_xticklabels(ax.get_xticklabels(), rotation=rotation)
-        
-        return self
\ No newline at end of file
+
+        return self
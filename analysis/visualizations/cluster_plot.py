@@ -1,5 +1,6 @@
 import seaborn as sns
 from .base import BaseVisualizer
+from .density import use_density, draw_density
 
 class ClusterPlotVisualizer(BaseVisualizer):
     """Creates visualizations for clustered data"""
@@ -10,19 +11,23 @@ class ClusterPlotVisualizer(BaseVisualizer):
         y: str = 'pca2',
         hue: str = 'cluster',
         title: str = 'Employee Clusters',
-        palette: str = 'Set1'
+        palette: str = 'Set1',
+        mode: str = None
     ):
-        """Create a cluster visualization using PCA components"""
+        """Create a cluster visualization using PCA components (density raster for large data)"""
         ax = self._setup_plot(title, xlabel=x, ylabel=y)
         
-        sns.scatterplot(
-            x=x,
-            y=y,
-            hue=hue,
-            data=self.df,
-            palette=palette,
-            alpha=0.7,
-            ax=ax
-        )
+        if use_density(len(self.df), mode):
+            draw_density(ax, self.df, x, y, hue=hue, palette=palette)
+        else:
+            sns.scatterplot(
+                x=x,
+                y=y,
+                hue=hue,
+                data=self.df,
+                palette=palette,
+                alpha=0.7,
+                ax=ax
+            )
         
         return self
\ No newline at end of file
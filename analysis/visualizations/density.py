@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib import colormaps
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize, to_rgb
+from matplotlib.patches import Patch
+from utils.config import VISUALIZATION_DEFAULTS
+
+def use_density(n_points: int, mode: str = None) -> bool:
+    """Decide between per-point markers and a density raster"""
+    mode = mode or VISUALIZATION_DEFAULTS['scatter_mode']
+    if mode not in ('auto', 'points', 'density'):
+        raise ValueError(f"Unknown scatter mode '{mode}' - expected 'auto', 'points' or 'density'")
+    if mode == 'auto':
+        return n_points > VISUALIZATION_DEFAULTS['density_threshold']
+    return mode == 'density'
+
+
+def _grid_shape(ax) -> tuple:
+    """Raster resolution derived from the axes size on the canvas, not from the data"""
+    pixel = VISUALIZATION_DEFAULTS['density_pixel_size']
+    bbox = ax.get_window_extent()
+    return max(int(bbox.width / pixel), 1), max(int(bbox.height / pixel), 1)
+
+
+def _extent(values: np.ndarray) -> tuple:
+    low, high = np.nanmin(values), np.nanmax(values)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    pad = (high - low) * 0.02
+    return low - pad, high + pad
+
+
+def bin_points(
+    x: np.ndarray,
+    y: np.ndarray,
+    extent: tuple,
+    shape: tuple,
+    codes: np.ndarray = None,
+    n_codes: int = 1,
+    weights: np.ndarray = None
+) -> np.ndarray:
+    """
+    Bin points onto a (n_codes, ny, nx) grid with np.bincount
+
+    Returns counts per cell, or weight sums per cell when weights are given.
+    """
+    nx, ny = shape
+    x0, x1, y0, y1 = extent
+    ix = np.clip(((x - x0) / (x1 - x0) * nx).astype(np.intp), 0, nx - 1)
+    iy = np.clip(((y - y0) / (y1 - y0) * ny).astype(np.intp), 0, ny - 1)
+    flat = iy * nx + ix
+    if codes is not None:
+        flat = flat + codes * (nx * ny)
+    grid = np.bincount(flat, weights=weights, minlength=n_codes * nx * ny)
+    return grid.reshape(n_codes, ny, nx)
+
+
+def _spread(grid: np.ndarray, radius: int) -> np.ndarray:
+    """Separable box filter over the last two axes so each point covers a marker-sized patch"""
+    if radius <= 0:
+        return grid
+    width = 2 * radius + 1
+    for axis in (-2, -1):
+        pad = [(0, 0)] * grid.ndim
+        pad[axis] = (radius + 1, radius)
+        summed = np.cumsum(np.pad(grid, pad), axis=axis)
+        upper = np.take(summed, np.arange(width, summed.shape[axis]), axis=axis)
+        lower = np.take(summed, np.arange(0, summed.shape[axis] - width), axis=axis)
+        grid = upper - lower
+    return grid
+
+
+def _alpha(counts: np.ndarray) -> np.ndarray:
+    """Log-scaled opacity so sparse cells stay visible next to dense ones; empty cells are clear"""
+    peak = counts.max()
+    if peak == 0:
+        return np.zeros_like(counts, dtype=float)
+    return np.where(counts > 0, 0.25 + 0.75 * np.log1p(counts) / np.log1p(peak), 0.0)
+
+
+def draw_density(
+    ax,
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    hue: str = None,
+    palette=None,
+    value: str = 'left',
+    color: str = None,
+    label: str = None,
+    legend: bool = True,
+    extent: tuple = None
+):
+    """
+    Draw df[x] vs df[y] as one aggregated RGBA image
+
+    With hue, each cell is coloured by the count-weighted mix of the hue category
+    colours. Without hue, cells are coloured by the mean of `value` (when present)
+    or by a single colour, with opacity following the point count. Pass extent
+    (x0, x1, y0, y1) to layer onto an existing plot without changing its limits.
+    """
+    data = df.dropna(subset=[x, y] + ([hue] if hue else []))
+    xs = data[x].to_numpy(dtype=float)
+    ys = data[y].to_numpy(dtype=float)
+    if len(xs) == 0:
+        return None
+
+    extent = extent or (_extent(xs) + _extent(ys))
+    shape = _grid_shape(ax)
+    radius = VISUALIZATION_DEFAULTS['density_marker_radius']
+    image = np.zeros((shape[1], shape[0], 4))
+
+    if hue:
+        codes, categories = pd.factorize(data[hue], sort=True)
+        colors = np.array(sns.color_palette(palette, len(categories)))
+        per_category = _spread(
+            bin_points(xs, ys, extent, shape, codes=codes, n_codes=len(categories)), radius
+        )
+        counts = per_category.sum(axis=0)
+        mixed = np.tensordot(colors.T, per_category, axes=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            image[..., :3] = np.nan_to_num(np.moveaxis(mixed / counts, 0, -1))
+        if legend:
+            ax.legend(
+                handles=[Patch(color=c, label=str(cat)) for c, cat in zip(colors, categories)],
+                title=hue
+            )
+    elif color is None and value in data.columns:
+        counts = _spread(bin_points(xs, ys, extent, shape)[0], radius)
+        sums = _spread(
+            bin_points(xs, ys, extent, shape, weights=data[value].to_numpy(dtype=float))[0], radius
+        )
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.nan_to_num(sums / counts)
+        cmap = colormaps[VISUALIZATION_DEFAULTS['density_cmap']]
+        norm = Normalize(0, 1)
+        image[..., :3] = cmap(norm(means))[..., :3]
+        if legend:
+            ax.figure.colorbar(ScalarMappable(norm=norm, cmap=cmap), ax=ax, label=f"mean {value}")
+    else:
+        counts = _spread(bin_points(xs, ys, extent, shape)[0], radius)
+        image[..., :3] = to_rgb(color or 'tab:blue')
+        if label:
+            ax.legend(handles=[Patch(color=color or 'tab:blue', label=label)])
+
+    image[..., 3] = _alpha(counts)
+    return ax.imshow(
+        image,
+        extent=extent,
+        origin='lower',
+        aspect='auto',
+        interpolation='nearest'
+    )
@@ -1,6 +1,7 @@
 import seaborn as sns
 import pandas as pd
 from .base import BaseVisualizer
+from analysis.binning import binned_matrix
 from utils.logger import logger
 
 class HeatmapVisualizer(BaseVisualizer):
@@ -12,36 +13,26 @@ class HeatmapVisualizer(BaseVisualizer):
         y_col: str,
         value_col: str,
         title: str,
-        cmap: str = 'YlOrRd'
+        cmap: str = 'YlOrRd',
+        x_bins: int = None,
+        y_bins: int = None,
+        xlabel: str = None,
+        ylabel: str = None
     ):
-        """Create a heatmap from pre-binned data with proper interval handling"""
+        """
+        Create a heatmap of mean value_col per (y_col, x_col) cell
+
+        With x_bins/y_bins, x_col and y_col are numeric columns binned into equal-width
+        bins and the matrix comes straight from integer bin codes; otherwise they are
+        treated as pre-binned categories and pivoted.
+        """
         try:
-            # Create pivot table for heatmap
-            heatmap_data = self.df.pivot_table(
-                index=y_col,
-                columns=x_col,
-                values=value_col,
-                aggfunc='mean'
-            )
-            
-            # Handle Interval objects by converting to string representations
-            if hasattr(heatmap_data.index, 'categories') and hasattr(heatmap_data.index.categories, 'left'):
-                # If index contains Interval objects
-                index_labels = [
-                    f"{x.left:.1f}-{x.right:.1f}" if hasattr(x, 'left') else x 
-                    for x in heatmap_data.index
-                ]
-                heatmap_data.index = index_labels
-            
-            if hasattr(heatmap_data.columns, 'categories') and hasattr(heatmap_data.columns.categories, 'left'):
-                # If columns contain Interval objects
-                column_labels = [
-                    f"{x.left:.1f}-{x.right:.1f}" if hasattr(x, 'left') else x 
-                    for x in heatmap_data.columns
-                ]
-                heatmap_data.columns = column_labels
-            
-            ax = self._setup_plot(title, xlabel=x_col, ylabel=y_col)
+            if x_bins and y_bins:
+                heatmap_data = binned_matrix(self.df, x_col, y_col, value_col, x_bins, y_bins)
+            else:
+                heatmap_data = self._pivot(x_col, y_col, value_col)
+
+            ax = self._setup_plot(title, xlabel=xlabel or x_col, ylabel=ylabel or y_col)
             
             # Create heatmap
             sns.heatmap(
@@ -51,9 +42,40 @@ class HeatmapVisualizer(BaseVisualizer):
                 fmt='.2f',
                 ax=ax
             )
+            # seaborn labels the axes from the matrix index names
+            ax.set_xlabel(xlabel or x_col, fontsize=12)
+            ax.set_ylabel(ylabel or y_col, fontsize=12)
             
             return self
             
         except Exception as e:
-            logger.error(f"Heatmap creation failed: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error("Heatmap creation failed: %s", e)
+            raise
+
+    def _pivot(self, x_col: str, y_col: str, value_col: str) -> pd.DataFrame:
+        """Pivot pre-binned categorical columns, labelling Interval bins as 'a-b'"""
+        heatmap_data = self.df.pivot_table(
+            index=y_col,
+            columns=x_col,
+            values=value_col,
+            aggfunc='mean'
+        )
+        
+        # Handle Interval objects by converting to string representations
+        if hasattr(heatmap_data.index, 'categories') and hasattr(heatmap_data.index.categories, 'left'):
+            # If index contains Interval objects
+            index_labels = [
+                f"{x.left:.1f}-{x.right:.1f}" if hasattr(x, 'left') else x 
+                for x in heatmap_data.index
+            ]
+            heatmap_data.index = index_labels
+        
+        if hasattr(heatmap_data.columns, 'categories') and hasattr(heatmap_data.columns.categories, 'left'):
+            # If columns contain Interval objects
+            column_labels = [
+                f"{x.left:.1f}-{x.right:.1f}" if hasattr(x, 'left') else x 
+                for x in heatmap_data.columns
+            ]
+            heatmap_data.columns = column_labels
+
+        return heatmap_data
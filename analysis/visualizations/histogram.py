@@ -1,11 +1,11 @@
-import seaborn as sns
-import matplotlib.pyplot as plt
+import numpy as np
 from .base import BaseVisualizer
+from .kde import grouped_kde
 from utils.config import VISUALIZATION_DEFAULTS
 
 class HistogramVisualizer(BaseVisualizer):
     """Creates histograms with KDE for distribution analysis"""
-    
+
     def create(
         self,
         column: str,
@@ -14,29 +14,39 @@ class HistogramVisualizer(BaseVisualizer):
         kde: bool = True,
         color: str = 'skyblue'
     ):
-        """Create a histogram with KDE"""
+        """Create a histogram with a binned-KDE overlay"""
         # Create figure and axis
-        self.fig, self.ax = plt.subplots(
-            figsize=VISUALIZATION_DEFAULTS['figure_size']
-        )
-        
-        # Create histogram with KDE
-        sns.histplot(
-            data=self.df,
-            x=column,
-            bins=bins,
-            kde=kde,
+        self._new_figure()
+
+        # Create histogram
+        values = self.df[column].dropna().to_numpy()
+        counts, edges = np.histogram(values, bins=bins)
+        self.ax.bar(
+            edges[:-1],
+            counts,
+            width=np.diff(edges),
+            align='edge',
             color=color,
-            ax=self.ax
+            edgecolor='white',
+            alpha=0.75
         )
-        
+
+        # KDE scaled from density to counts per bin, clipped to the data range
+        if kde:
+            grid, density, n = grouped_kde(
+                self.df, column,
+                bw_method=VISUALIZATION_DEFAULTS['kde_bw_method'],
+                cut=0
+            )[None]
+            self.ax.plot(grid, density * n * np.diff(edges).mean(), color=color, linewidth=2)
+
         # Set title and labels
         self.ax.set_title(title, fontsize=14)
         self.ax.set_xlabel(column.replace('_', ' ').title(), fontsize=12)
         self.ax.set_ylabel('Frequency', fontsize=12)
-        
+
         return self
-    
+
     def get_figure(self):
         """Return the matplotlib figure object"""
-        return self.fig
\ No newline at end of file
+        return self.fig
@@ -1,27 +1,43 @@
 import seaborn as sns
+from matplotlib.patches import Patch
 from .base import BaseVisualizer
+from .kde import grouped_kde
+from utils.config import VISUALIZATION_DEFAULTS
 
 class KDEPlotVisualizer(BaseVisualizer):
     """Creates KDE plots for distribution comparisons"""
-    
+
     def create(
         self,
         x: str,
         hue: str,
         title: str,
         palette: str = 'coolwarm',
-        shade: bool = True
+        shade: bool = True,
+        common_norm: bool = True
     ):
-        """Create a KDE plot with hue separation"""
-        ax = self._setup_plot(title, xlabel=x)
-        
-        sns.kdeplot(
-            data=self.df,
-            x=x,
-            hue=hue,
-            palette=palette,
-            shade=shade,
-            ax=ax
+        """Create a KDE plot with hue separation from cached binned-KDE curves"""
+        ax = self._setup_plot(title, xlabel=x, ylabel='Density')
+
+        self.curves = grouped_kde(
+            self.df, x, by=hue,
+            bw_method=VISUALIZATION_DEFAULTS['kde_bw_method']
         )
-        
-        return self
\ No newline at end of file
+        total = sum(n for _, _, n in self.curves.values())
+        colors = sns.color_palette(palette, len(self.curves))
+
+        handles = []
+        for (group, (grid, density, n)), color in zip(self.curves.items(), colors):
+            # Like seaborn's common_norm: each curve's area is its share of all rows
+            if common_norm and total:
+                density = density * n / total
+            ax.plot(grid, density, color=color)
+            if shade:
+                ax.fill_between(grid, density, color=color, alpha=0.25, linewidth=0)
+            handles.append(Patch(color=color, alpha=0.5, label=str(group)))
+
+        if hue:
+            ax.legend(handles=handles, title=hue)
+        ax.set_ylim(bottom=0)
+
+        return self
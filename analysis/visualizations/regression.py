@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+from utils.cache import LRUCache, frame_key
+
+_fit_cache = LRUCache(64)
+
+
+def fit_line(x: np.ndarray, y: np.ndarray) -> dict:
+    """
+    Ordinary least squares y = intercept + slope * x in closed form
+
+    With fewer than 3 points or a constant x the line is undefined: the fit is
+    returned with NaN estimates (see is_defined) instead of raising, so filtered
+    views with a handful of rows still render.
+    """
+    n = len(x)
+    x_mean = x.mean() if n else np.nan
+    dx = x - x_mean
+    sxx = np.dot(dx, dx)
+    if n < 3 or sxx == 0:
+        return {
+            'n': n, 'slope': np.nan, 'intercept': np.nan, 'x_mean': x_mean,
+            'sxx': sxx, 'residual_var': np.nan, 'r': np.nan
+        }
+    y_mean = y.mean()
+    slope = np.dot(dx, y - y_mean) / sxx
+    intercept = y_mean - slope * x_mean
+    residuals = y - (intercept + slope * x)
+    return {
+        'n': n,
+        'slope': slope,
+        'intercept': intercept,
+        'x_mean': x_mean,
+        'sxx': sxx,
+        'residual_var': np.dot(residuals, residuals) / (n - 2),
+        'r': slope * np.sqrt(sxx / np.dot(y - y_mean, y - y_mean)) if np.any(y != y_mean) else 0.0
+    }
+
+
+def is_defined(fit: dict) -> bool:
+    """True when fit_line could fit a line"""
+    return not np.isnan(fit['slope'])
+
+
+def confidence_band(fit: dict, grid: np.ndarray, level: float = 0.95) -> tuple:
+    """Analytic confidence band for the fitted mean at each grid point"""
+    t = stats.t.ppf((1 + level) / 2, fit['n'] - 2)
+    se = np.sqrt(fit['residual_var'] * (1 / fit['n'] + (grid - fit['x_mean']) ** 2 / fit['sxx']))
+    line = fit['intercept'] + fit['slope'] * grid
+    return line - t * se, line + t * se
+
+
+def binned_means(x: np.ndarray, y: np.ndarray, bins: int) -> tuple:
+    """Mean and standard error of y within equal-width x bins"""
+    edges = np.linspace(x.min(), x.max(), bins + 1)
+    codes = np.clip(np.digitize(x, edges[1:-1]), 0, bins - 1)
+    counts = np.bincount(codes, minlength=bins)
+    sums = np.bincount(codes, weights=y, minlength=bins)
+    squares = np.bincount(codes, weights=y * y, minlength=bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        variance = np.maximum(squares / counts - means ** 2, 0) * counts / np.maximum(counts - 1, 1)
+        sem = np.sqrt(variance / counts)
+    centers = (edges[:-1] + edges[1:]) / 2
+    keep = counts > 0
+    return centers[keep], means[keep], sem[keep]
+
+
+def regression_overlay(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    level: float = 0.95,
+    grid_size: int = 100,
+    bins: int = None
+) -> dict:
+    """
+    Fit, confidence band and optional binned means for df[y] ~ df[x], cached per data
+
+    Returns:
+        dict with 'fit', 'grid', 'line', 'lower', 'upper' and, when bins is given,
+        'bin_centers', 'bin_means', 'bin_sem'; only 'fit' when the line is undefined
+    """
+    key = (frame_key(df), x, y, level, grid_size, bins)
+    cached = _fit_cache.get(key)
+    if cached is not None:
+        return cached
+
+    data = df[[x, y]].dropna()
+    xs = data[x].to_numpy(dtype=np.float64)
+    ys = data[y].to_numpy(dtype=np.float64)
+
+    fit = fit_line(xs, ys)
+    if not is_defined(fit):
+        overlay = {'fit': fit}
+        _fit_cache.put(key, overlay)
+        return overlay
+
+    grid = np.linspace(xs.min(), xs.max(), grid_size)
+    lower, upper = confidence_band(fit, grid, level)
+    overlay = {
+        'fit': fit,
+        'grid': grid,
+        'line': fit['intercept'] + fit['slope'] * grid,
+        'lower': lower,
+        'upper': upper
+    }
+    if bins:
+        overlay['bin_centers'], overlay['bin_means'], overlay['bin_sem'] = binned_means(xs, ys, bins)
+
+    _fit_cache.put(key, overlay)
+    return overlay
@@ -1,6 +1,7 @@
 import seaborn as sns
-import matplotlib.pyplot as plt
 from .base import BaseVisualizer
+from .density import use_density, draw_density
+from .regression import regression_overlay
 from utils.config import VISUALIZATION_DEFAULTS
 
 class ScatterPlotVisualizer(BaseVisualizer):
@@ -18,37 +19,54 @@ class ScatterPlotVisualizer(BaseVisualizer):
         add_regression: bool = False,
         thresholds: dict = None,
         legend = None,
+        mode: str = None,
+        regression_bins: int = None
     ):
-        """Create a scatter plot"""
+        """
+        Create a scatter plot
+        
+        mode is 'points', 'density' or 'auto' (density above the configured point count);
+        the density raster ignores size and colours cells by hue or mean 'left'.
+        add_regression draws a closed-form least-squares line with an analytic 95% band;
+        regression_bins additionally plots binned means with standard errors.
+        """
         ax = self._setup_plot(title, xlabel=x, ylabel=y)
         alpha = alpha or VISUALIZATION_DEFAULTS['alpha']
         palette = palette or VISUALIZATION_DEFAULTS['palette']
+        self.density = use_density(len(self.df), mode)
         
-        # Create base scatter plot
-        sns.scatterplot(
-            x=x,
-            y=y,
-            hue=hue,
-            size=size,
-            data=self.df,
-            alpha=alpha,
-            palette=palette,
-            ax=ax,
-            legend= legend
-        )
-        
-        # Add regression line if requested
-        if add_regression:
-            sns.regplot(
+        if self.density:
+            draw_density(ax, self.df, x, y, hue=hue, palette=palette, legend=bool(legend))
+        else:
+            # Create base scatter plot
+            sns.scatterplot(
                 x=x,
                 y=y,
+                hue=hue,
+                size=size,
                 data=self.df,
-                scatter=False,
-                color='red',
-                line_kws={'linewidth': 2},
-                ax=ax
+                alpha=alpha,
+                palette=palette,
+                ax=ax,
+                legend= legend
             )
         
+        # Add regression line if requested (skipped when too few rows to fit one)
+        if add_regression:
+            overlay = regression_overlay(self.df, x, y, bins=regression_bins)
+            if 'line' in overlay:
+                ax.plot(overlay['grid'], overlay['line'], color='red', linewidth=2)
+                ax.fill_between(
+                    overlay['grid'], overlay['lower'], overlay['upper'],
+                    color='red', alpha=0.15, linewidth=0
+                )
+                if regression_bins:
+                    ax.errorbar(
+                        overlay['bin_centers'], overlay['bin_means'], yerr=overlay['bin_sem'],
+                        fmt='o', color='darkred', capsize=3
+                    )
+            self.regression = overlay['fit']
+        
         # Add threshold lines if provided
         if thresholds:
             for threshold_type, value in thresholds.items():
@@ -58,7 +76,46 @@ class ScatterPlotVisualizer(BaseVisualizer):
                     ax.axvline(x=value, color='red', linestyle='--', alpha=0.7)
         
         # Remove legend if not needed
-        if not hue and not size:
-            ax.legend().remove()
+        if not hue and not size and ax.get_legend() is not None and not self.density:
+            ax.get_legend().remove()
+        
+        return self
+    
+    def highlight(
+        self,
+        df,
+        x: str,
+        y: str,
+        size: str = None,
+        color: str = 'red',
+        label: str = None,
+        mode: str = None
+    ):
+        """Overlay a subset of points (e.g. high-risk employees) on the existing axes"""
+        if self.ax is None:
+            raise ValueError("No axes to draw on - call create() first")
+        
+        if df.empty:
+            return self
+        
+        if use_density(len(df), mode):
+            draw_density(
+                self.ax, df, x, y,
+                color=color,
+                label=label,
+                extent=self.ax.get_xlim() + self.ax.get_ylim()
+            )
+        else:
+            self.ax.scatter(
+                df[x],
+                df[y],
+                s=df[size] / 5 if size else None,
+                color=color,
+                label=label,
+                edgecolor='black',
+                linewidth=1
+            )
+            if label:
+                self.ax.legend()
         
         return self
\ No newline at end of file
@@ -1,11 +1,14 @@
 from .base import BaseVisualizer
+from .kde import grouped_kde
+from .boxplot import box_stats
+import numpy as np
 import seaborn as sns
 import pandas as pd
 from utils.config import VISUALIZATION_DEFAULTS
 
 class ViolinPlotVisualizer(BaseVisualizer):
     """Creates violin plots for distribution comparisons"""
-    
+
     def create(
         self,
         x: str,
@@ -18,8 +21,8 @@ class ViolinPlotVisualizer(BaseVisualizer):
         bins: int = 5
     ):
         """
-        Create a violin plot
-        
+        Create a violin plot from cached binned-KDE curves
+
         Args:
             x: Column for x-axis (categorical or binned numeric)
             y: Column for y-axis (numeric)
@@ -27,36 +30,61 @@ class ViolinPlotVisualizer(BaseVisualizer):
             palette: Color palette to use
             rotation: X-axis label rotation
             order: Order of categories
-            inner: Representation of quartiles ("box", "quartile", "point", etc.)
+            inner: Representation of quartiles ("box", "quartile" or None)
             bins: Number of bins if x is numeric (will be binned automatically)
         """
-        # If x is numeric, bin it first
-        df_plot = self.df.copy()
-        if pd.api.types.is_numeric_dtype(df_plot[x]):
-            bin_labels = [f"{i+1}" for i in range(bins)]
-            df_plot[f"{x}_bin"] = pd.cut(df_plot[x], bins=bins, labels=bin_labels)
-            x_plot = f"{x}_bin"
+        # A numeric x is grouped into numbered bins. The helpers bin self.df, which
+        # carries the caller's tag, so bins, curves and boxes come from their caches.
+        x_bins = bins if pd.api.types.is_numeric_dtype(self.df[x]) else None
+        if x_bins:
             x_label = f"{x.replace('_', ' ').title()} Bins"
         else:
-            x_plot = x
             x_label = x.replace('_', ' ').title()
-        
+
         ax = self._setup_plot(title, xlabel=x_label, ylabel=y.replace('_', ' ').title())
-        
+
         palette = palette or VISUALIZATION_DEFAULTS['palette']
         rotation = rotation if rotation is not None else VISUALIZATION_DEFAULTS['rotation']
-        
-        sns.violinplot(
-            x=x_plot,
-            y=y,
-            data=df_plot,
-            palette=palette,
-            order=order,
-            inner=inner,
-            ax=ax
+
+        # Seaborn-style violins: cut=2 bandwidths, equal areas, widest violin fills 0.8
+        self.curves = grouped_kde(
+            self.df, y, by=x, by_bins=x_bins,
+            bw_method=VISUALIZATION_DEFAULTS['kde_bw_method'],
+            cut=2
         )
-        
+        groups = [g for g in (order or self.curves.keys()) if g in self.curves]
+        peak = max((d.max() for _, d, _ in self.curves.values() if len(d)), default=1.0)
+        colors = sns.color_palette(palette, len(groups))
+        summaries = box_stats(self.df, x, y, order=groups, x_bins=x_bins) if inner else []
+        summaries = dict(zip(groups, summaries))
+
+        for position, (group, color) in enumerate(zip(groups, colors)):
+            grid, density, _ = self.curves[group]
+            if not len(grid):
+                continue
+            half_width = density / peak * 0.4
+            ax.fill_betweenx(
+                grid, position - half_width, position + half_width,
+                facecolor=color, edgecolor='0.25', linewidth=1
+            )
+            if group in summaries:
+                self._draw_inner(ax, inner, position, summaries[group], grid, half_width)
+
+        ax.set_xticks(range(len(groups)))
+        ax.set_xticklabels([str(g) for g in groups])
         if rotation:
             ax.set_xticklabels(ax.get_xticklabels(), rotation=rotation)
-        
-        return self
\ No newline at end of file
+
+        return self
+
+    @staticmethod
+    def _draw_inner(ax, inner, position, stats, grid, half_width):
+        """Quartile lines or a miniature box inside one violin"""
+        if inner == "quartile":
+            for q, style in ((stats['q1'], ':'), (stats['med'], '--'), (stats['q3'], ':')):
+                width = np.interp(q, grid, half_width)
+                ax.plot([position - width, position + width], [q, q], color='0.25', linestyle=style)
+        elif inner == "box":
+            ax.plot([position, position], [stats['whislo'], stats['whishi']], color='0.25', linewidth=1)
+            ax.plot([position, position], [stats['q1'], stats['q3']], color='0.25', linewidth=5)
+            ax.scatter([position], [stats['med']], color='white', s=15, zorder=3)
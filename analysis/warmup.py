@@ -0,0 +1,188 @@
+"""
+Startup warm-up pass
+
+Pays the first-request costs up front so a fresh deploy starts with hot caches:
+
+    python -m analysis.warmup                  # everything, default (unfiltered) views
+    python -m analysis.warmup -q q01 q17 --skip-render
+    python -m analysis.warmup --profile warmup_profile.json
+
+Steps run in order and each is timed: load (CSV parse, preprocessing, risk
+scoring), indexes (range index, summary aggregates, persisted similarity index),
+clustering (fitted once and persisted next to the other model artifacts),
+intermediates (every registered pipeline node for the full frame) and render
+(each question's default view into the figure and result caches). Persisted
+artifacts and disk-cached figures are reused by later processes; in-memory
+caches only benefit the process running the warm-up, which is why the app and
+the API can also run it at start-up.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import pandas as pd
+from utils.cache import tag_frame
+from utils.config import WARMUP_DEFAULTS
+from utils.logger import logger
+from utils.profiling import profiler
+
+STEPS = ('load', 'indexes', 'clustering', 'intermediates', 'render')
+
+
+@dataclass
+class WarmupStep:
+    """Timing of one warm-up step"""
+    name: str
+    seconds: float
+    detail: str = ''
+    error: str = None
+
+
+def _timed(report: list, name: str, func) -> object:
+    """Run func(), appending its timing (or failure) to report; returns its value"""
+    start = time.perf_counter()
+    try:
+        value, detail = func()
+    except Exception as e:
+        logger.error("Warm-up step '%s' failed: %s", name, e)
+        report.append(WarmupStep(name, time.perf_counter() - start, error=str(e)))
+        return None
+    report.append(WarmupStep(name, time.perf_counter() - start, detail))
+    return value
+
+
+def _load() -> tuple:
+    from analysis.data_loader import DataLoader
+    from analysis.risk_model import AttritionRiskModel
+    loader = DataLoader()
+    df = loader.load_data()
+    data_version = loader.get_data_version()
+    df = tag_frame(AttritionRiskModel.load_or_train(df, data_version).add_scores(df), data_version)
+    return (df, data_version), f"{len(df):,} rows, version {data_version}"
+
+
+def _indexes(df: pd.DataFrame, data_version: str) -> tuple:
+    from analysis.filters import SortedRangeIndex
+    from analysis.similarity import SimilarEmployeeIndex
+    from analysis.summary import SummaryService
+    range_index = SortedRangeIndex(df)
+    summary = SummaryService(df)
+    SimilarEmployeeIndex.load_or_build(df, data_version=data_version)
+    return None, (
+        f"{len(range_index.columns)} range columns, "
+        f"{len(summary.columns)} summary columns, similarity index"
+    )
+
+
+def _clustering(df: pd.DataFrame, data_version: str) -> tuple:
+    from analysis.clustering import EmployeeClusterer
+    clusterer, clustered_df = EmployeeClusterer.fitted(df, data_version=data_version)
+    return None, f"k={clusterer.n_clusters} on {len(clustered_df):,} rows"
+
+
+def _intermediates(df: pd.DataFrame) -> tuple:
+    from analysis.pipeline import AnalysisContext, registry
+    context = AnalysisContext.for_frame(df)
+    for name in registry.nodes:
+        context.get(name, df)
+    return None, ', '.join(registry.nodes)
+
+
+def _render(df: pd.DataFrame, data_version: str, question_ids: list, workers: int) -> tuple:
+    from analysis.figure_cache import render_question_cached
+    from analysis.filters import filter_signature
+    signature = filter_signature()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='warmup') as pool:
+        images = list(pool.map(
+            lambda question_id: render_question_cached(question_id, df, data_version, signature)[1],
+            question_ids
+        ))
+    return None, f"{len(images)} questions, {sum(map(len, images)) / 1024:,.0f} KiB"
+
+
+def warm_up(
+    df: pd.DataFrame = None,
+    data_version: str = None,
+    question_ids: list = None,
+    steps: tuple = STEPS,
+    extra_steps: list = None,
+    workers: int = None
+) -> list:
+    """
+    Run the warm-up steps and log a timing report
+
+    Args:
+        df: Risk-scored dataset to warm; loaded (step 'load') when omitted
+        data_version: Version of df, used for persisted artifacts and cache keys
+        question_ids: Questions to pre-render (default: all)
+        steps: Subset of STEPS to run
+        extra_steps: (name, func) pairs run after loading, for caller-owned caches;
+            func() returns (value, detail)
+        workers: Concurrent question renders
+
+    Returns:
+        List of WarmupStep in execution order
+    """
+    from analysis.question_bank import QuestionBank
+    question_ids = question_ids or QuestionBank.get_all_questions()
+    workers = workers or WARMUP_DEFAULTS['workers']
+    report = []
+    start = time.perf_counter()
+
+    if df is None:
+        loaded = _timed(report, 'load', _load)
+        if loaded is None:
+            log_report(report, time.perf_counter() - start)
+            return report
+        df, data_version = loaded
+
+    for name, func in extra_steps or []:
+        _timed(report, name, func)
+    if 'indexes' in steps:
+        _timed(report, 'indexes', lambda: _indexes(df, data_version))
+    if 'clustering' in steps:
+        _timed(report, 'clustering', lambda: _clustering(df, data_version))
+    if 'intermediates' in steps:
+        _timed(report, 'intermediates', lambda: _intermediates(df))
+    if 'render' in steps:
+        _timed(report, 'render', lambda: _render(df, data_version, question_ids, workers))
+
+    log_report(report, time.perf_counter() - start)
+    return report
+
+
+def log_report(report: list, total: float):
+    """Log one line per step plus the total"""
+    logger.info("Warm-up finished in %.2fs", total)
+    for step in report:
+        outcome = f"FAILED: {step.error}" if step.error else step.detail
+        logger.info("  %-14s %7.2fs  %s", step.name, step.seconds, outcome)
+
+
+def main(argv: list = None) -> int:
+    from analysis.batch_render import resolve_questions
+    parser = argparse.ArgumentParser(description="Precompute models, indexes and figures")
+    parser.add_argument('-q', '--questions', nargs='*', help="Question ids or prefixes (default: all)")
+    parser.add_argument('--skip-render', action='store_true', help="Do not pre-render figures")
+    parser.add_argument('-w', '--workers', type=int, default=WARMUP_DEFAULTS['workers'])
+    parser.add_argument('--profile', metavar='PATH', help="Write per-step timing and memory spans as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        question_ids = resolve_questions(args.questions)
+    except ValueError as e:
+        parser.error(str(e))
+
+    steps = tuple(s for s in STEPS if not (args.skip_render and s == 'render'))
+    if args.profile:
+        profiler.trace_memory(True)
+    report = warm_up(question_ids=question_ids, steps=steps, workers=args.workers)
+    if args.profile:
+        profiler.write(args.profile)
+        logger.info("Wrote profile to %s", args.profile)
+    return 1 if any(step.error for step in report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,19 @@
+import threading
+from concurrent.futures import as_completed
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from analysis.data_loader import DataLoader
 from analysis.metrics import MetricsCalculator
 from analysis.question_bank import QuestionBank
-from utils.config import THRESHOLDS
+from analysis.filters import apply_filters, filter_signature, SortedRangeIndex
+from analysis.figure_cache import render_question_cached
+from analysis.risk_model import AttritionRiskModel
+from utils.config import THRESHOLDS, RISK_MODEL_DEFAULTS, WARMUP_DEFAULTS, PROFILING
+from utils.cache import tag_frame
 from utils.logger import logger
+from utils.profiling import profiler, profile_span
 
 # Configure page
 st.set_page_config(
@@ -16,23 +23,229 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
-if 'df' not in st.session_state:
-    try:
-        st.session_state.df = DataLoader().load_data()
-        st.session_state.filtered_df = st.session_state.df.copy()
-        logger.info("Data loaded successfully")
-    except Exception as e:
-        st.error(f"Failed to load data: {str(e)}")
-        logger.error(f"Data loading error: {str(e)}")
-        st.stop()
+# ---------------------------------------------------------------------------
+# Cached resources and results
+#
+# Shared objects (the dataset, filtered views, fitted models, indexes) live in
+# st.cache_resource: one copy per server process regardless of session count;
+# they are read-only. Filter-keyed results live in st.cache_data. Every cached
+# function takes the data version, so a changed data file produces new entries
+# and invalidate_on_new_version() drops the stale ones.
+# ---------------------------------------------------------------------------
+
+@st.cache_resource(max_entries=1, show_spinner="Loading data...")
+def load_dataset(data_version: str) -> pd.DataFrame:
+    """Risk-scored dataset shared by all sessions"""
+    df = DataLoader().load_data()
+    # Score everyone once; the probability column is reused by the sidebar and q22
+    risk_model = AttritionRiskModel.load_or_train(df, data_version)
+    df = tag_frame(risk_model.add_scores(df), data_version)
+    logger.info("Data loaded successfully (version %s)", data_version)
+    return df
+
+
+@st.cache_resource(max_entries=1)
+def range_index(data_version: str) -> SortedRangeIndex:
+    """Sorted-order indexes behind the numeric range sliders"""
+    return SortedRangeIndex(load_dataset(data_version))
+
+
+@st.cache_resource(max_entries=1)
+def slider_specs(data_version: str) -> list:
+    """(column, min, max, step) for each range slider; whole-number columns step by 1"""
+    df = load_dataset(data_version)
+    index = range_index(data_version)
+    specs = []
+    for column in index.columns:
+        low, high = index.bounds(column)
+        values = df[column].dropna()
+        if (values % 1 == 0).all():
+            specs.append((column, int(low), int(high), 1))
+        else:
+            specs.append((column, float(low), float(high), 0.01))
+    return specs
+
+
+@st.cache_resource(max_entries=64)
+def filtered_dataset(data_version: str, depts: tuple, salaries: tuple, ranges: tuple = None) -> pd.DataFrame:
+    """Filtered view of the shared dataset (None means all values)"""
+    df = load_dataset(data_version)
+    with profile_span('app.filter', rows_in=len(df)) as span:
+        filtered = apply_filters(
+            df,
+            list(depts) if depts is not None else None,
+            list(salaries) if salaries is not None else None,
+            ranges={column: (low, high) for column, low, high in ranges} if ranges else None,
+            range_index=range_index(data_version)
+        )
+        span.rows_out = len(filtered)
+    signature = filter_signature(
+        depts, salaries, {column: (low, high) for column, low, high in ranges} if ranges else None
+    )
+    return tag_frame(filtered, data_version, signature)
+
+
+@st.cache_resource(max_entries=1)
+def reference_clusterer(data_version: str):
+    """Clustering model fitted once on the full data; filtered subsets warm-start from it"""
+    from analysis.clustering import EmployeeClusterer
+    return EmployeeClusterer.fitted(load_dataset(data_version), data_version=data_version)
+
+
+@st.cache_resource(max_entries=1)
+def similarity_index(data_version: str):
+    from analysis.similarity import SimilarEmployeeIndex
+    return SimilarEmployeeIndex.load_or_build(load_dataset(data_version), data_version=data_version)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def sidebar_metrics(data_version: str, depts: tuple, salaries: tuple, ranges: tuple = None) -> dict:
+    """Headline KPIs for a filter combination"""
+    df = filtered_dataset(data_version, depts, salaries, ranges)
+    predicted_risk = df[RISK_MODEL_DEFAULTS['score_column']]
+    return {
+        'total': len(df),
+        'attrition_rate': MetricsCalculator.calculate_attrition_rate(df),
+        'high_risk': len(MetricsCalculator.identify_high_risk_employees(df)),
+        'predicted_high_risk': int((predicted_risk >= RISK_MODEL_DEFAULTS['high_risk_probability']).sum()),
+        'average_risk': predicted_risk.mean()
+    }
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def question_output(data_version: str, question_id: str, depts: tuple, salaries: tuple, ranges: tuple = None) -> tuple:
+    """(result without the figure, PNG bytes) for one question and filter combination"""
+    return render_question_cached(
+        question_id,
+        filtered_dataset(data_version, depts, salaries, ranges),
+        data_version=data_version,
+        filter_signature=filter_signature(
+            depts, salaries, {column: (low, high) for column, low, high in ranges} if ranges else None
+        )
+    )
+
+
+@st.cache_resource(max_entries=1)
+def summary_service(data_version: str):
+    """Per dept x salary partial aggregates, built once per data version"""
+    from analysis.summary import SummaryService
+    return SummaryService(load_dataset(data_version))
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def data_summary(data_version: str, depts: tuple, salaries: tuple, ranges: tuple = None) -> pd.DataFrame:
+    """describe()-style summary merged from partial aggregates (range filters need a row scan)"""
+    if ranges:
+        return filtered_dataset(data_version, depts, salaries, ranges).describe().T
+    return summary_service(data_version).summarize(
+        list(depts) if depts is not None else None,
+        list(salaries) if salaries is not None else None
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cluster_panel(data_version: str, depts: tuple, salaries: tuple, ranges: tuple = None) -> tuple:
+    """(cluster summary, cluster plot PNG) for a filter combination"""
+    from analysis.clustering import EmployeeClusterer
+    from analysis.visualizations.cluster_plot import ClusterPlotVisualizer
+    
+    reference, reference_df = reference_clusterer(data_version)
+    if depts is None and salaries is None and ranges is None:
+        clusterer, clustered_df = reference, reference_df
+    else:
+        clusterer = EmployeeClusterer()
+        clustered_df = clusterer.fit(
+            filtered_dataset(data_version, depts, salaries, ranges),
+            warm_start=reference
+        )
+    cluster_vis = ClusterPlotVisualizer(clustered_df)
+    cluster_vis.create()
+    return clusterer.get_cluster_summary(clustered_df), cluster_vis.to_bytes()
+
+
+@st.cache_resource
+def panel_runner():
+    """Thread pool shared by all sessions for concurrent panel computations"""
+    from analysis.panels import PanelRunner
+    return PanelRunner(max_workers=8)
+
+
+def with_script_context(func):
+    """Run func on a pool thread with this session's script context (needed by st caches)"""
+    ctx = get_script_run_ctx()
+
+    def run(*args):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return func(*args)
+    return run
+
+
+@st.cache_resource
+def report_exporter():
+    """Export worker pool shared by all sessions"""
+    from analysis.report import ReportExporter
+    return ReportExporter()
+
+
+@st.cache_resource(max_entries=1)
+def background_warmup(data_version: str) -> threading.Thread:
+    """Warm this process's caches once per data version without blocking the first page"""
+    from analysis.warmup import warm_up
+
+    def shared(func):
+        return lambda: (func(data_version), 'app cache')
+
+    thread = threading.Thread(
+        target=warm_up,
+        kwargs=dict(
+            df=load_dataset(data_version),
+            data_version=data_version,
+            steps=('intermediates', 'render'),
+            extra_steps=[
+                ('range index', shared(slider_specs)),
+                ('summary', shared(summary_service)),
+                ('similarity', shared(similarity_index)),
+                ('clustering', shared(reference_clusterer))
+            ]
+        ),
+        name='warmup',
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+@st.cache_resource
+def _loaded_version() -> dict:
+    return {'version': None}
+
+
+def invalidate_on_new_version(data_version: str):
+    """Drop filter-keyed results computed for a previous data version"""
+    loaded = _loaded_version()
+    if loaded['version'] not in (None, data_version):
+        logger.info("Data version changed %s -> %s; clearing cached results", loaded['version'], data_version)
+        st.cache_data.clear()
+    loaded['version'] = data_version
+
+
+try:
+    data_version = DataLoader().current_version()
+    invalidate_on_new_version(data_version)
+    df = load_dataset(data_version)
+    if WARMUP_DEFAULTS['on_startup']:
+        background_warmup(data_version)
+except Exception as e:
+    st.error(f"Failed to load data: {str(e)}")
+    logger.error("Data loading error: %s", e)
+    st.stop()
 
 # Sidebar configuration
 st.sidebar.title("📊 Employee Satisfaction Analyzer")
 st.sidebar.markdown("### Filter Data")
 
 # Department filter
-dept_options = st.session_state.df['dept'].unique().tolist()
+dept_options = df['dept'].unique().tolist()
 selected_depts = st.sidebar.multiselect(
     "Department",
     options=dept_options,
@@ -40,49 +253,44 @@ selected_depts = st.sidebar.multiselect(
 )
 
 # Salary filter
-salary_options = st.session_state.df['salary'].unique().tolist()
+salary_options = df['salary'].unique().tolist()
 selected_salaries = st.sidebar.multiselect(
     "Salary Level",
     options=salary_options,
     default=salary_options
 )
 
-# Apply filters
-if selected_depts and selected_salaries:
-    mask = (
-        st.session_state.df['dept'].isin(selected_depts) &
-        st.session_state.df['salary'].isin(selected_salaries)
-    )
-    st.session_state.filtered_df = st.session_state.df[mask].copy()
-else:
-    st.session_state.filtered_df = st.session_state.df.copy()
-
-# Display key metrics
-st.sidebar.markdown("### Key Metrics")
-col1, col2 = st.sidebar.columns(2)
-with col1:
-    st.metric(
-        "Total Employees", 
-        f"{len(st.session_state.filtered_df):,}"
-    )
-with col2:
-    attrition_rate = MetricsCalculator.calculate_attrition_rate(
-        st.session_state.filtered_df
-    )
-    st.metric(
-        "Attrition Rate", 
-        f"{attrition_rate:.1%}"
+# Numeric range sliders; only ranges narrower than the full extent are applied
+st.sidebar.markdown("### Numeric Ranges")
+selected_ranges = []
+for column, low, high, step in slider_specs(data_version):
+    selection = st.sidebar.slider(
+        column.replace('_', ' ').title(),
+        min_value=low,
+        max_value=high,
+        value=(low, high),
+        step=step
     )
+    if selection != (low, high):
+        selected_ranges.append((column, *selection))
+active_ranges = tuple(selected_ranges) or None
 
-# High-risk employees
-high_risk = MetricsCalculator.identify_high_risk_employees(
-    st.session_state.filtered_df
-)
-st.sidebar.metric(
-    "High-Risk Employees", 
-    len(high_risk),
-    delta=f"{len(high_risk)/len(st.session_state.filtered_df):.1%}"
+# Apply filters (cache keys are sorted tuples; None means all values)
+if selected_depts and selected_salaries:
+    active_depts = None if set(selected_depts) == set(dept_options) else tuple(sorted(selected_depts))
+    active_salaries = None if set(selected_salaries) == set(salary_options) else tuple(sorted(selected_salaries))
+else:
+    active_depts, active_salaries = None, None
+filtered_df = filtered_dataset(data_version, active_depts, active_salaries, active_ranges)
+current_filter_signature = filter_signature(
+    active_depts, active_salaries,
+    {column: (low, high) for column, low, high in active_ranges} if active_ranges else None
 )
+if filtered_df.empty:
+    st.warning("No employees match the selected filters")
+    st.stop()
+# Sidebar layout; panels are filled below as their computations finish
+kpi_panel = st.sidebar.container()
 
 # Question selection
 st.sidebar.markdown("### Analysis Questions")
@@ -98,74 +306,216 @@ selected_question = st.sidebar.selectbox(
     index=0
 )
 
+# Clustering demo in sidebar
+st.sidebar.markdown("### Clustering Demo")
+show_clusters = st.sidebar.checkbox("Show Employee Clusters")
+cluster_container = st.sidebar.container()
+
 # Main content
 st.title("Employee Satisfaction & Attrition Analysis")
 st.markdown("""
 This dashboard analyzes employee satisfaction and attrition drivers using HR data. 
 Select an analysis question from the sidebar to explore insights.
 """)
+question_container = st.container()
+# Data summary is only computed while the expander is open
+summary_expander = st.expander("Data Summary", key="data_summary_open", on_change="rerun")
+
+# Independent panels run concurrently; a rerun with new filters cancels queued stale work
+filters = (active_depts, active_salaries, active_ranges)
+session = get_script_run_ctx().session_id
+panels = {
+    'kpis': (sidebar_metrics, (data_version, *filters)),
+    'question': (question_output, (data_version, selected_question, *filters))
+}
+if summary_expander.open:
+    panels['summary'] = (data_summary, (data_version, *filters))
+if show_clusters:
+    panels['clusters'] = (cluster_panel, (data_version, *filters))
+panel_runner().cancel_session(session, keep=set(panels))
+
+futures = {
+    panel_runner().submit(session, name, args, with_script_context(func), *args): name
+    for name, (func, args) in panels.items()
+}
+waiting = {
+    name: container.empty()
+    for name, container in (
+        ('kpis', kpi_panel), ('question', question_container),
+        ('summary', summary_expander), ('clusters', cluster_container)
+    )
+    if name in panels
+}
+waiting['question'].info("Generating analysis...")
 
-# Display selected analysis
-if selected_question:
+metrics = None
+for future in as_completed(futures):
+    name = futures[future]
+    waiting.pop(name).empty()
     try:
-        # Get the analysis function dynamically
-        analysis_func = getattr(QuestionBank, selected_question)
-        
-        # Run the analysis
-        with st.spinner("Generating analysis..."):
-            result = analysis_func(st.session_state.filtered_df)
-        
-        # Display analysis header
-        st.subheader(result['metadata']['title'])
-        st.write(result['metadata']['description'])
-        
-        # Show visualization - properly passing the figure
-        try:
-            fig = result['plot'].get_figure()
-            st.pyplot(fig)
-        except Exception as e:
-            st.error(f"Error displaying visualization: {str(e)}")
-            logger.error(f"Figure display error: {str(e)}")
-        
-        # Show interpretation
-        with st.expander("Business Interpretation", expanded=True):
-            st.write(result['interpretation'])
+        output = future.result()
+    except Exception as e:
+        logger.error("%s panel failed: %s", name, e)
+        if name == 'clusters':
+            cluster_container.error(f"Clustering error: {str(e)}")
+        elif name == 'question':
+            question_container.error(f"Error generating analysis: {str(e)}")
+        else:
+            st.error(f"Error computing {name}: {str(e)}")
+        continue
+
+    if name == 'kpis':
+        metrics = output
+        with kpi_panel:
+            # Display key metrics
+            st.markdown("### Key Metrics")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(
+                    "Total Employees", 
+                    f"{metrics['total']:,}"
+                )
+            with col2:
+                st.metric(
+                    "Attrition Rate", 
+                    f"{metrics['attrition_rate']:.1%}"
+                )
             
-        # Special handling for high-risk employee count
-        if selected_question == 'q22_high_risk_employees' and 'high_risk_count' in result:
-            st.info(f"Identified {result['high_risk_count']} high-risk employees matching the criteria")
-        
-        # Show data summary
-        with st.expander("Data Summary"):
-            st.dataframe(
-                st.session_state.filtered_df.describe().T,
-                use_container_width=True
+            # High-risk employees
+            st.metric(
+                "High-Risk Employees", 
+                metrics['high_risk'],
+                delta=f"{metrics['high_risk']/metrics['total']:.1%}"
             )
             
-    except Exception as e:
-        st.error(f"Error generating analysis: {str(e)}")
-        logger.error(f"Analysis error for {selected_question}: {str(e)}")
+            # Model-predicted risk
+            st.metric(
+                "Predicted At-Risk (model)",
+                metrics['predicted_high_risk'],
+                delta=f"avg risk {metrics['average_risk']:.1%}",
+                delta_color="off"
+            )
+    
+    elif name == 'question':
+        result, image = output
+        with question_container:
+            # Display analysis header
+            st.subheader(result['metadata']['title'])
+            st.write(result['metadata']['description'])
+            
+            # Show visualization from the encoded image
+            try:
+                st.image(image, width='stretch')
+            except Exception as e:
+                st.error(f"Error displaying visualization: {str(e)}")
+                logger.error("Figure display error: %s", e)
+            
+            # Show interpretation
+            with st.expander("Business Interpretation", expanded=True):
+                st.write(result['interpretation'])
+                
+            # Special handling for high-risk employee count
+            if selected_question == 'q22_high_risk_employees' and 'high_risk_count' in result:
+                st.info(f"Identified {result['high_risk_count']} high-risk employees matching the criteria")
+                st.caption(f"Top {len(result['high_risk_employees'])} by predicted attrition risk")
+                st.dataframe(result['high_risk_employees'], width='stretch')
+    
+    elif name == 'summary':
+        summary_expander.dataframe(output, width='stretch')
+    
+    elif name == 'clusters':
+        cluster_summary, cluster_image = output
+        with cluster_container:
+            st.subheader("Cluster Analysis")
+            st.dataframe(cluster_summary.set_index('Cluster'), width=300)
+            
+            # Show cluster visualization
+            st.image(cluster_image)
 
-# Clustering demo in sidebar
-st.sidebar.markdown("### Clustering Demo")
-if st.sidebar.checkbox("Show Employee Clusters"):
+# Similar employees lookup in sidebar
+st.sidebar.markdown("### Similar Employees")
+employee_id = st.sidebar.number_input("Employee ID", min_value=1, step=1, value=None)
+if employee_id is not None:
     try:
-        from analysis.clustering import EmployeeClusterer
-        
-        clusterer = EmployeeClusterer()
-        clustered_df = clusterer.fit(st.session_state.filtered_df)
-        
-        st.sidebar.subheader("Cluster Analysis")
-        cluster_summary = clusterer.get_cluster_summary(clustered_df)
-        st.sidebar.dataframe(cluster_summary.set_index('Cluster'), width=300)
-        
-        # Show cluster visualization
-        from analysis.visualizations.cluster_plot import ClusterPlotVisualizer
-        cluster_vis = ClusterPlotVisualizer(clustered_df)
-        cluster_vis.create()
-        st.sidebar.pyplot(cluster_vis.get_figure())
+        index = similarity_index(data_version)
+        similar = index.query(employee_id, k=5)
+        st.sidebar.dataframe(
+            similar.drop(columns=index.id_column).set_index('rank'),
+            width=300
+        )
+        st.sidebar.caption(
+            f"Attrition among similar employees: {similar['left'].mean():.0%}"
+        )
+    except KeyError:
+        st.sidebar.warning(f"No employee with ID {employee_id}")
     except Exception as e:
-        st.sidebar.error(f"Clustering error: {str(e)}")
+        st.sidebar.error(f"Similarity lookup error: {str(e)}")
+
+# Report export runs in the background; the status fragment polls it while running
+st.sidebar.markdown("### Export Report")
+export_all = st.sidebar.checkbox("Include all questions", value=False)
+if st.sidebar.button("📥 Export Report"):
+    st.session_state.report_job = report_exporter().submit(
+        filtered_df,
+        all_questions if export_all else [selected_question],
+        data_version,
+        current_filter_signature,
+        kpis={
+            'Total Employees': metrics['total'],
+            'Attrition Rate': metrics['attrition_rate'],
+            'High-Risk Employees': metrics['high_risk'],
+            'Predicted At-Risk (model)': metrics['predicted_high_risk']
+        } if metrics else None
+    )
+
+report_job = report_exporter().get(st.session_state.get('report_job'))
+if report_job is not None:
+    polling = not report_job.done
+
+    def report_status():
+        job = report_exporter().get(report_job.id)
+        if job is None:
+            return
+        if job.status == 'failed':
+            st.error(f"Report generation error: {job.error}")
+        elif job.done:
+            if job.failed:
+                st.warning(f"{len(job.failed)} of {job.total} analyses failed and are marked in the report")
+            st.download_button(
+                label="Download Report",
+                data=job.content,
+                file_name=job.filename,
+                mime="text/html"
+            )
+        else:
+            st.progress(job.progress, text=f"Rendering {job.completed}/{job.total} analyses...")
+        if job.done and polling:
+            # Full rerun to stop polling once the job has finished
+            st.rerun()
+
+    with st.sidebar:
+        st.fragment(report_status, run_every=1.0 if polling else None)()
+
+# Optional profiling panel (process-wide spans, so it covers every session)
+st.sidebar.markdown("### Debug")
+if st.sidebar.checkbox("Show profiling"):
+    with st.sidebar.expander("Profiling", expanded=True):
+        if PROFILING['memory_toggle']:
+            trace_memory = st.toggle("Trace memory (slower)", value=profiler.tracing_memory)
+            if trace_memory != profiler.tracing_memory:
+                profiler.trace_memory(trace_memory)
+        else:
+            st.caption(f"Memory tracing {'on' if profiler.tracing_memory else 'off'}")
+        st.dataframe(profiler.summary().round(1), width=300)
+        st.download_button(
+            label="Download metrics (JSON)",
+            data=profiler.dump(),
+            file_name="profile.json",
+            mime="application/json"
+        )
+        if st.button("Reset"):
+            profiler.reset()
+            st.rerun()
 
 # Footer
 st.markdown("---")
@@ -174,39 +524,3 @@ st.markdown("""
 Built with ❤️ using Streamlit | 
 [Source Code](https://github.com/Losif01/Employee-Satisfaction-Attrition-Analysis)
 """)
-
-# # Add export functionality
-# if st.sidebar.button("📥 Export Report"):
-#     try:
-#         # Get current analysis result
-#         analysis_func = getattr(QuestionBank, selected_question)
-#         result = analysis_func(st.session_state.filtered_df)
-        
-#         report = f"""
-#         EMPLOYEE SATISFACTION ANALYSIS REPORT
-#         Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
-        
-#         FILTERS APPLIED:
-#         - Departments: {', '.join(selected_depts)}
-#         - Salary Levels: {', '.join(selected_salaries)}
-        
-#         KEY METRICS:
-#         - Total Employees: {len(st.session_state.filtered_df)}
-#         - Attrition Rate: {attrition_rate:.1%}
-#         - High-Risk Employees: {len(high_risk)} ({len(high_risk)/len(st.session_state.filtered_df):.1%})
-        
-#         SELECTED ANALYSIS: {result['metadata']['title']}
-#         {result['interpretation']}
-        
-#         DATA SAMPLE:
-#         {st.session_state.filtered_df.head().to_markdown(index=False)}
-#         """
-        
-#         st.sidebar.download_button(
-#             label="Download Report",
-#             data=report,
-#             file_name=f"employee_analysis_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.txt",
-#             mime="text/plain"
-#         )
-#     except Exception as e:
-#         st.sidebar.error(f"Report generation error: {str(e)}")
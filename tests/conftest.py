@@ -0,0 +1,29 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def employees() -> pd.DataFrame:
+    """Synthetic frame with the dataset's columns, including a few missing values"""
+    rng = np.random.default_rng(7)
+    n = 2000
+    df = pd.DataFrame({
+        'satisfaction_level': rng.uniform(0.09, 1.0, n).round(2),
+        'last_evaluation': rng.uniform(0.36, 1.0, n).round(2),
+        'number_project': rng.integers(2, 8, n),
+        'average_montly_hours': rng.integers(96, 311, n),
+        'time_spend_company': rng.integers(2, 11, n),
+        'Work_accident': rng.integers(0, 2, n),
+        'promotion_last_5years': (rng.random(n) < 0.02).astype(int),
+        'dept': rng.choice(['sales', 'technical', 'support', 'hr', 'IT'], n),
+        'salary': rng.choice(['low', 'medium', 'high'], n, p=[0.5, 0.4, 0.1]),
+        'left': (rng.random(n) < 0.24).astype(int)
+    })
+    df.loc[rng.choice(n, 20, replace=False), 'satisfaction_level'] = np.nan
+    df.loc[rng.choice(n, 20, replace=False), 'last_evaluation'] = np.nan
+    return df
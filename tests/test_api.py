@@ -0,0 +1,16 @@
+from http import HTTPStatus
+import pytest
+from analysis.api import AnalysisService, ApiError
+
+
+def test_etag_revalidation(employees):
+    service = AnalysisService(employees, data_version='test-api')
+    status, content_type, body, etag = service.respond('/health', None, None)
+    assert status == HTTPStatus.OK and content_type == 'application/json' and etag
+
+    assert service.respond('/health', None, None, if_none_match=etag) == (HTTPStatus.NOT_MODIFIED, None, b'', etag)
+    assert service.respond('/health', ['sales'], None)[3] != etag
+
+    with pytest.raises(ApiError) as error:
+        service.respond('/nowhere', None, None)
+    assert error.value.status == HTTPStatus.NOT_FOUND
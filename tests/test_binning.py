@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from analysis import binning
+from analysis.binning import bin_codes, binned_matrix
+from analysis.question_bank import QuestionBank
+from analysis.visualizations import boxplot
+from analysis.visualizations.violinplot import ViolinPlotVisualizer
+from utils.cache import LRUCache, tag_frame
+
+
+def _fresh_caches(monkeypatch):
+    monkeypatch.setattr(binning, '_codes_cache', LRUCache(64))
+    monkeypatch.setattr(boxplot, '_stats_cache', LRUCache(64))
+
+
+def test_bin_codes_match_pd_cut(employees):
+    codes, spec = bin_codes(employees, 'satisfaction_level', 5)
+    expected = pd.cut(employees['satisfaction_level'], 5, labels=False)
+
+    np.testing.assert_array_equal(codes, expected.fillna(-1).astype(int).to_numpy())
+    assert len(spec.labels) == 5
+
+
+def test_binned_matrix_matches_pivot_table(employees):
+    matrix = binned_matrix(employees, 'satisfaction_level', 'last_evaluation', 'average_montly_hours', x_bins=4, y_bins=3)
+    expected = employees.assign(
+        x=pd.cut(employees['satisfaction_level'], 4, labels=False),
+        y=pd.cut(employees['last_evaluation'], 3, labels=False)
+    ).pivot_table(index='y', columns='x', values='average_montly_hours', aggfunc='mean')
+
+    assert matrix.shape == (3, 4)
+    np.testing.assert_allclose(matrix.to_numpy(), expected.reindex(index=range(3), columns=range(4)).to_numpy())
+
+
+def test_violin_renders_reuse_cached_bins_and_boxes(employees, monkeypatch):
+    _fresh_caches(monkeypatch)
+    df = tag_frame(employees, 'test-violin-bins')
+    ViolinPlotVisualizer(df).create('average_montly_hours', 'satisfaction_level', 'Hours', bins=6)
+    codes_entries, stats_entries = len(binning._codes_cache), len(boxplot._stats_cache)
+    ViolinPlotVisualizer(df).create('average_montly_hours', 'satisfaction_level', 'Hours', bins=6)
+
+    assert (codes_entries, stats_entries) == (1, 1)
+    assert len(binning._codes_cache) == codes_entries
+    assert len(boxplot._stats_cache) == stats_entries
+
+
+def test_q04_shares_bin_codes_with_its_violin(employees, monkeypatch):
+    _fresh_caches(monkeypatch)
+    df = tag_frame(employees, 'test-q04-bins')
+    result = QuestionBank.q04_hours_vs_satisfaction(df)
+    entries = len(binning._codes_cache)
+    result.render()
+
+    assert entries == 1
+    assert len(binning._codes_cache) == entries
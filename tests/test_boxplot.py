@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from matplotlib import cbook
+from analysis.visualizations.boxplot import box_stats, box_summary
+
+
+@pytest.mark.parametrize('whis', [1.5, 0.5])
+def test_box_stats_match_matplotlib(employees, whis):
+    stats = box_stats(employees, 'number_project', 'satisfaction_level', whis=whis, max_fliers=10 ** 6)
+    data = employees.dropna(subset=['satisfaction_level'])
+
+    assert [s['label'] for s in stats] == [str(g) for g in sorted(data['number_project'].unique())]
+    for s in stats:
+        values = data.loc[data['number_project'] == int(s['label']), 'satisfaction_level'].to_numpy()
+        expected = cbook.boxplot_stats(values, whis=whis)[0]
+        for field in ('med', 'q1', 'q3', 'whislo', 'whishi'):
+            assert s[field] == pytest.approx(expected[field]), field
+        np.testing.assert_allclose(np.sort(s['fliers']), np.sort(expected['fliers']))
+        assert s['n'] == len(values)
+
+
+def test_box_stats_caps_fliers_per_group(employees):
+    skewed = employees.assign(satisfaction_level=employees['satisfaction_level'] ** 8)
+    stats = box_stats(skewed, 'salary', 'satisfaction_level', max_fliers=3)
+    assert all(len(s['fliers']) <= 3 for s in stats)
+    assert any(len(s['fliers']) == 3 for s in stats)
+
+
+def test_box_summary_follows_order(employees):
+    summary = box_summary(employees, 'salary', 'last_evaluation', order=['low', 'medium', 'high'])
+    assert list(summary.index) == ['low', 'medium', 'high']
+    assert (summary['q1'] <= summary['med']).all() and (summary['med'] <= summary['q3']).all()
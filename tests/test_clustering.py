@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from analysis.clustering import EmployeeClusterer, align_labels
+
+
+@pytest.fixture
+def blobs() -> pd.DataFrame:
+    """Three well separated groups in the default clustering features"""
+    rng = np.random.default_rng(1)
+    centers = [(0.2, 0.9, 260), (0.8, 0.5, 150), (0.45, 0.55, 200)]
+    frames = [
+        pd.DataFrame({
+            'satisfaction_level': rng.normal(s, 0.02, 300),
+            'last_evaluation': rng.normal(e, 0.02, 300),
+            'average_montly_hours': rng.normal(h, 4, 300),
+            'dept': rng.choice(['sales', 'hr'], 300)
+        })
+        for s, e, h in centers
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_align_labels_recovers_permutation():
+    reference = np.array([[0.0, 0.0], [5.0, 5.0], [10.0, 0.0]])
+    permutation = np.array([2, 0, 1])
+    shifted = reference[permutation] + 0.1
+    np.testing.assert_array_equal(align_labels(shifted, reference), permutation)
+
+
+def test_warm_start_keeps_reference_cluster_ids(blobs):
+    reference = EmployeeClusterer(random_state=0)
+    clustered = reference.fit(blobs)
+    subset = blobs[blobs['dept'] == 'sales']
+
+    warm = EmployeeClusterer(random_state=0)
+    warm_clustered = warm.fit(subset, warm_start=reference)
+
+    np.testing.assert_array_equal(
+        warm_clustered['cluster'].to_numpy(), clustered.loc[subset.index, 'cluster'].to_numpy()
+    )
+    # Centers are reordered to match the reference's cluster ids
+    np.testing.assert_array_equal(
+        align_labels(warm.kmeans.cluster_centers_, reference.kmeans.cluster_centers_), [0, 1, 2]
+    )
+
+
+def test_warm_start_requires_matching_model(blobs):
+    reference = EmployeeClusterer()
+    reference.fit(blobs)
+    with pytest.raises(ValueError):
+        EmployeeClusterer(n_clusters=4).fit(blobs, warm_start=reference)
+    other = 'robust' if reference.scaling in (None, 'standard') else 'standard'
+    with pytest.raises(ValueError):
+        EmployeeClusterer(scaling=other).fit(blobs, warm_start=reference)
+    with pytest.raises(ValueError):
+        EmployeeClusterer().fit(blobs, warm_start=EmployeeClusterer())
@@ -0,0 +1,57 @@
+import os
+import time
+from analysis import figure_cache
+from analysis.figure_cache import FigureCache
+
+
+def test_key_changes_with_every_rendering_input(monkeypatch):
+    base = FigureCache.make_key('q01', 'v1', 'all')
+    assert FigureCache.make_key('q01', 'v1', 'all') == base
+    assert FigureCache.make_key('q01', 'v2', 'all') != base
+    assert FigureCache.make_key('q01', 'v1', 'dept=sales') != base
+    assert FigureCache.make_key('q01', 'v1', 'all', dpi=300) != base
+    assert FigureCache.make_key('q01', 'v1', 'all', fmt='svg') != base
+
+    monkeypatch.setattr(figure_cache, 'RENDER_VERSION', 'next')
+    assert FigureCache.make_key('q01', 'v1', 'all') != base
+    monkeypatch.undo()
+    monkeypatch.setitem(figure_cache.EXPORT, 'max_bytes', 1)
+    assert FigureCache.make_key('q01', 'v1', 'all') != base
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    key = FigureCache.make_key('q01', 'v1', 'all')
+    FigureCache(cache_dir=str(tmp_path)).put(key, b'png bytes')
+
+    fresh = FigureCache(cache_dir=str(tmp_path))
+    assert fresh.get(key) == b'png bytes'
+    assert fresh.get(FigureCache.make_key('q01', 'v2', 'all')) is None
+
+
+def test_disk_tier_prunes_least_recently_used(tmp_path):
+    cache = FigureCache(memory_bytes=1, disk_bytes=2500, cache_dir=str(tmp_path))
+    keys = [FigureCache.make_key(f'q{i:02d}', 'v1', 'all') for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key, bytes(1000))
+        path = cache._path(key)
+        os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+    assert [cache.get(key) is not None for key in keys] == [False, False, False, True, True]
+    assert sum(f.stat().st_size for f in tmp_path.rglob('*') if f.is_file()) <= 2500
+
+
+def test_render_question_cached_renders_once(employees, tmp_path, monkeypatch):
+    calls = []
+    compute = figure_cache.QuestionBank.compute
+
+    def counting(question_id, df):
+        calls.append(question_id)
+        return compute(question_id, df)
+
+    monkeypatch.setattr(figure_cache.QuestionBank, 'compute', staticmethod(counting))
+    cache = FigureCache(cache_dir=str(tmp_path))
+    first = figure_cache.render_question_cached('q01_dept_satisfaction', employees, 'test-figures', 'all', cache=cache)
+    second = figure_cache.render_question_cached('q01_dept_satisfaction', employees, 'test-figures', 'all', cache=cache)
+
+    assert calls == ['q01_dept_satisfaction']
+    assert second[1] == first[1] and first[1].startswith(b'\x89PNG')
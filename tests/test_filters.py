@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from analysis.filters import SortedRangeIndex, apply_filters, filter_signature
+
+
+def _masked(df, depts=None, salaries=None, ranges=None):
+    mask = np.ones(len(df), dtype=bool)
+    if depts is not None:
+        mask &= df['dept'].isin(depts).to_numpy()
+    if salaries is not None:
+        mask &= df['salary'].isin(salaries).to_numpy()
+    for column, (low, high) in (ranges or {}).items():
+        mask &= ((df[column] >= low) & (df[column] <= high)).to_numpy()
+    return df[mask]
+
+
+@pytest.mark.parametrize('depts, salaries, ranges', [
+    (None, None, {'satisfaction_level': (0.2, 0.6)}),
+    (None, None, {'satisfaction_level': (0.2, 0.6), 'number_project': (3, 5)}),
+    (['sales', 'IT'], None, {'last_evaluation': (0.5, 0.5)}),
+    (None, ['low', 'high'], {'average_montly_hours': (150, 250), 'time_spend_company': (3, 4)}),
+    (['hr'], ['medium'], {'satisfaction_level': (0.0, 1.0), 'last_evaluation': (0.9, 2.0)}),
+    (None, None, {'satisfaction_level': (0.95, 0.2)})
+])
+def test_indexed_ranges_match_boolean_mask(employees, depts, salaries, ranges):
+    index = SortedRangeIndex(employees)
+    indexed = apply_filters(employees, depts, salaries, ranges, range_index=index)
+    masked = apply_filters(employees, depts, salaries, ranges)
+
+    assert indexed.index.equals(_masked(employees, depts, salaries, ranges).index)
+    assert indexed.index.equals(masked.index)
+
+
+def test_range_covering_every_row_does_not_filter(employees):
+    index = SortedRangeIndex(employees, columns=['number_project'])
+    low, high = index.bounds('number_project')
+    assert index.positions({'number_project': (low, high)}) is None
+    assert apply_filters(employees, ranges={'number_project': (low, high)}, range_index=index) is employees
+
+
+def test_unknown_range_column(employees):
+    with pytest.raises(ValueError):
+        SortedRangeIndex(employees, columns=['number_project']).positions({'left': (0, 1)})
+
+
+def test_filter_signature_is_order_independent():
+    assert filter_signature(['b', 'a'], ['low']) == filter_signature(['a', 'b'], ['low'])
+    assert filter_signature() == 'all'
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import gaussian_kde
+from analysis.visualizations import kde
+from analysis.visualizations.kde import bandwidth, binned_kde, grouped_kde
+from analysis.visualizations.violinplot import ViolinPlotVisualizer
+from utils.cache import tag_frame
+
+
+@pytest.mark.parametrize('bw_method', ['scott', 'silverman'])
+def test_binned_kde_matches_scipy(bw_method):
+    rng = np.random.default_rng(3)
+    values = np.concatenate([rng.normal(0.3, 0.05, 3000), rng.normal(0.8, 0.1, 2000)])
+    grid, density = binned_kde(values, grid_size=512, bw_method=bw_method)
+    expected = gaussian_kde(values, bw_method=bw_method)(grid)
+
+    assert np.max(np.abs(density - expected)) < 0.01 * expected.max()
+    assert np.trapezoid(density, grid) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_bandwidth_matches_scipy_factor():
+    values = np.random.default_rng(5).normal(size=500)
+    assert bandwidth(values) == pytest.approx(np.sqrt(gaussian_kde(values).covariance[0, 0]))
+
+
+def test_binned_kde_degenerate_input():
+    grid, density = binned_kde(np.array([0.5, 0.5, 0.5]))
+    assert len(grid) == 0 and len(density) == 0
+
+
+def test_grouped_kde_by_bins_matches_explicit_grouping(employees):
+    curves = grouped_kde(employees, 'satisfaction_level', by='average_montly_hours', by_bins=4)
+    bins = pd.cut(employees['average_montly_hours'], 4, labels=False) + 1
+    assert sorted(curves) == [1, 2, 3, 4]
+    for number, (grid, density, n) in curves.items():
+        values = employees.loc[bins == number, 'satisfaction_level'].dropna().to_numpy()
+        assert n == len(values)
+        np.testing.assert_allclose(density, binned_kde(values)[1])
+
+
+def test_violin_renders_reuse_cached_curves(employees):
+    df = tag_frame(employees, 'test-violin-kde')
+    first = ViolinPlotVisualizer(df).create('average_montly_hours', 'satisfaction_level', 'Hours', bins=6)
+    entries = len(kde._curve_cache)
+    second = ViolinPlotVisualizer(df).create('average_montly_hours', 'satisfaction_level', 'Hours', bins=6)
+
+    assert second.curves is first.curves
+    assert len(kde._curve_cache) == entries
@@ -0,0 +1,24 @@
+import logging
+import queue
+from utils.logger import DeferredQueueHandler
+
+
+def test_deferred_queue_handler_merges_arguments_at_call_time():
+    records = queue.SimpleQueue()
+    logger = logging.getLogger('tests.deferred')
+    logger.propagate = False
+    logger.addHandler(DeferredQueueHandler(records))
+    try:
+        values = [1]
+        logger.warning("values %s", values)
+        values.append(2)
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("failed")
+    finally:
+        logger.handlers.clear()
+
+    first, second = records.get_nowait(), records.get_nowait()
+    assert first.getMessage() == "values [1]" and first.args is None
+    assert second.exc_info is None and 'RuntimeError: boom' in second.exc_text
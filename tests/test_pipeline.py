@@ -0,0 +1,54 @@
+import gc
+import pandas as pd
+from analysis.metrics import MetricsCalculator
+from analysis.pipeline import AnalysisContext, intermediate, registry
+from analysis.question_bank import QuestionBank
+from analysis.risk_model import AttritionRiskModel
+from utils.cache import frame_key, tag_frame
+
+
+def test_frame_key_uses_declared_tag():
+    first, second = pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': [3, 4]})
+    assert frame_key(first) != frame_key(second)
+
+    tag_frame(first, 'v1', 'dept=sales')
+    tag_frame(second, 'v1', 'dept=sales')
+    assert frame_key(first) == frame_key(second) == ('v1', 'dept=sales')
+    # The first declared tag wins
+    tag_frame(first, 'v2')
+    assert frame_key(first) == ('v1', 'dept=sales')
+
+
+def test_anonymous_frame_keys_are_not_reused():
+    keys = set()
+    for _ in range(50):
+        frame = pd.DataFrame({'a': [1]})
+        keys.add(frame_key(frame))
+        del frame
+        gc.collect()
+    assert len(keys) == 50
+
+
+def test_intermediates_are_shared_per_tag(employees):
+    tag_frame(employees, 'test-intermediates')
+    copy = tag_frame(employees.copy(), 'test-intermediates')
+    name = next(iter(registry.nodes))
+
+    assert intermediate(employees, name) is intermediate(copy, name)
+    assert AnalysisContext.for_frame(employees) is AnalysisContext.for_frame(copy)
+
+
+def test_registry_dependencies_are_registered():
+    for node in registry.nodes.values():
+        assert set(node.deps) <= set(registry.nodes)
+    closure = registry.closure({'cluster_attrition'})
+    assert 'cluster_attrition' in closure and set(registry.nodes['cluster_attrition'].deps) <= set(closure)
+
+
+def test_metrics_and_q22_share_the_high_risk_definition(employees):
+    df = AttritionRiskModel(estimator='logistic_regression').fit(employees).add_scores(employees)
+    high_risk = MetricsCalculator.identify_high_risk_employees(df)
+
+    assert high_risk.index.equals(df.index[intermediate(df, 'high_risk_mask')])
+    assert len(high_risk) > 0
+    assert QuestionBank.compute('q22_high_risk_employees', df)['high_risk_count'] == len(high_risk)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from analysis.visualizations.regression import fit_line, is_defined, regression_overlay
+
+
+def test_fit_line_matches_polyfit():
+    rng = np.random.default_rng(11)
+    x = rng.uniform(0, 1, 1000)
+    y = 0.4 * x + 0.2 + rng.normal(0, 0.1, 1000)
+    fit = fit_line(x, y)
+    slope, intercept = np.polyfit(x, y, 1)
+
+    assert fit['slope'] == pytest.approx(slope)
+    assert fit['intercept'] == pytest.approx(intercept)
+    assert fit['r'] == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+
+@pytest.mark.parametrize('x, y', [
+    (np.array([0.1, 0.2]), np.array([1.0, 2.0])),
+    (np.array([0.5, 0.5, 0.5, 0.5]), np.array([1.0, 2.0, 3.0, 4.0])),
+    (np.array([]), np.array([]))
+])
+def test_fit_line_is_undefined_for_degenerate_data(x, y):
+    fit = fit_line(x, y)
+    assert not is_defined(fit)
+    assert fit['n'] == len(x)
+
+
+def test_regression_overlay_omits_undefined_line(employees):
+    overlay = regression_overlay(employees.head(2), 'last_evaluation', 'satisfaction_level')
+    assert set(overlay) == {'fit'}
+    overlay = regression_overlay(employees, 'last_evaluation', 'satisfaction_level', bins=5)
+    assert {'grid', 'line', 'lower', 'upper', 'bin_means'} <= set(overlay)
+    assert (overlay['lower'] <= overlay['line']).all() and (overlay['line'] <= overlay['upper']).all()
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from analysis.pipeline import intermediate
+from analysis.risk_model import AttritionRiskModel
+from utils.config import RISK_MODEL_DEFAULTS
+
+
+@pytest.fixture
+def model(employees) -> AttritionRiskModel:
+    return AttritionRiskModel(estimator='logistic_regression').fit(employees)
+
+
+@pytest.mark.parametrize('chunk_size', [97, 500, 10 ** 6])
+def test_chunked_scoring_matches_single_batch(model, employees, chunk_size):
+    complete = employees[model.features].notna().all(axis=1)
+    expected = model.pipeline.predict_proba(employees.loc[complete, model.features])[:, 1]
+    scores = model.predict_proba(employees, chunk_size=chunk_size)
+
+    assert scores.index.equals(employees.index)
+    assert scores.name == RISK_MODEL_DEFAULTS['score_column']
+    assert scores[~complete].isna().all()
+    np.testing.assert_allclose(scores[complete].to_numpy(), expected, rtol=1e-5)
+
+
+def test_add_scores_attaches_column(model, employees):
+    scored = model.add_scores(employees, chunk_size=300)
+    column = RISK_MODEL_DEFAULTS['score_column']
+    assert column not in employees.columns
+    assert scored[column].between(0, 1).sum() == employees[model.features].notna().all(axis=1).sum()
+
+
+def test_risk_scores_node_reads_the_callers_scores(model, employees):
+    with pytest.raises(ValueError):
+        intermediate(employees.copy(), 'risk_scores')
+    scored = model.add_scores(employees)
+    assert intermediate(scored, 'risk_scores').equals(scored[RISK_MODEL_DEFAULTS['score_column']])
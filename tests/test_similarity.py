@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from analysis import similarity
+from analysis.similarity import SimilarEmployeeIndex
+
+
+@pytest.fixture
+def staff(employees) -> pd.DataFrame:
+    return employees.assign(**{'Emp ID': np.arange(1, len(employees) + 1)})
+
+
+def _brute_force(index: SimilarEmployeeIndex, position: int, k: int) -> np.ndarray:
+    distances = np.sqrt(((index.X - index.X[position]) ** 2).sum(axis=1))
+    distances[position] = np.inf
+    return np.sort(distances)[:k]
+
+
+def test_query_excludes_self_and_matches_brute_force(staff):
+    index = SimilarEmployeeIndex().build(staff)
+    ids = index.ids[:50].to_numpy()
+    result = index.query(ids, k=4, batch_size=16)
+
+    assert len(result) == 50 * 4
+    assert (result['similar_id'] != result['Emp ID']).all()
+    assert result.groupby('Emp ID')['rank'].apply(list).map(lambda r: r == [1, 2, 3, 4]).all()
+    for position, employee_id in enumerate(ids):
+        distances = result.loc[result['Emp ID'] == employee_id, 'distance'].to_numpy()
+        np.testing.assert_allclose(distances, _brute_force(index, position, 4), rtol=1e-5)
+
+
+def test_query_with_duplicate_points_still_drops_self(staff):
+    duplicated = pd.concat([staff.head(10)] * 6, ignore_index=True)
+    duplicated['Emp ID'] = np.arange(len(duplicated))
+    index = SimilarEmployeeIndex(features=['number_project', 'time_spend_company']).build(duplicated)
+    result = index.query(index.ids.to_numpy(), k=3)
+
+    assert (result['similar_id'] != result['Emp ID']).all()
+    assert (result.groupby('Emp ID').size() == 3).all()
+
+
+def test_query_unknown_id(staff):
+    with pytest.raises(KeyError):
+        SimilarEmployeeIndex().build(staff).query([-1])
+
+
+def test_persisted_index_is_rebuilt_when_settings_change(staff, tmp_path, monkeypatch):
+    monkeypatch.setattr(similarity, 'CACHE_DIR', str(tmp_path))
+    first = SimilarEmployeeIndex.load_or_build(staff, data_version='v1')
+    assert SimilarEmployeeIndex.load_or_build(staff, data_version='v1').params == first.params
+
+    rebuilt = SimilarEmployeeIndex.load_or_build(staff, data_version='v1', leaf_size=7)
+    assert rebuilt.leaf_size == 7
+    assert SimilarEmployeeIndex.load(next(tmp_path.iterdir())).leaf_size == 7
@@ -0,0 +1,34 @@
+import numpy as np
+from analysis.clustering import EmployeeClusterer
+
+FEATURES = ['satisfaction_level', 'last_evaluation', 'average_montly_hours']
+
+
+def _complete_index(df):
+    return df.index[df[FEATURES].notna().all(axis=1)]
+
+
+def test_stability_of_a_subset_after_a_full_fit(employees):
+    clusterer = EmployeeClusterer(random_state=0)
+    clusterer.fit(employees)
+    subset = employees[employees['dept'] == 'sales']
+
+    result = clusterer.stability(subset, n_bootstrap=4, n_jobs=1)
+    confidence = result['assignment_confidence']
+
+    assert confidence.index.equals(_complete_index(subset))
+    assert confidence.between(0, 1).all()
+    assert list(result['cluster_stability']['Cluster']) == [0, 1, 2]
+    assert result['cluster_stability']['Mean Jaccard'].between(0, 1).all()
+    # The reference model is left as it was
+    assert len(clusterer.kmeans.labels_) == len(_complete_index(employees))
+
+
+def test_stability_fits_an_unfitted_clusterer(employees):
+    clusterer = EmployeeClusterer(random_state=0)
+    result = clusterer.stability(employees, n_bootstrap=3, n_jobs=1, random_state=1)
+
+    assert clusterer.kmeans is not None
+    assert result['assignment_confidence'].index.equals(_complete_index(employees))
+    # A resample fitted on nearly the same data mostly agrees with the reference
+    assert np.mean(result['assignment_confidence']) > 0.5
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from analysis.filters import apply_filters
+from analysis.summary import SummaryService
+
+EXACT_COLUMNS = ['number_project', 'average_montly_hours', 'time_spend_company', 'Work_accident', 'left']
+
+
+@pytest.mark.parametrize('depts, salaries', [
+    (None, None),
+    (['sales', 'hr'], None),
+    (None, ['low']),
+    (['technical'], ['medium', 'high'])
+])
+def test_summarize_matches_describe_for_exact_columns(employees, depts, salaries):
+    service = SummaryService(employees)
+    expected = apply_filters(employees, depts, salaries)[EXACT_COLUMNS].describe().T
+    summary = service.summarize(depts, salaries).loc[EXACT_COLUMNS, expected.columns]
+    pd.testing.assert_frame_equal(summary, expected, check_exact=False, rtol=1e-9)
+
+
+def test_summarize_sketched_quantiles_within_one_bin(employees):
+    service = SummaryService(employees, max_exact=10, sketch_bins=512)
+    column = 'satisfaction_level'
+    expected = employees[column].describe()
+    summary = service.summarize().loc[column]
+    bin_width = (employees[column].max() - employees[column].min()) / 512
+
+    assert summary['count'] == expected['count']
+    assert summary['mean'] == pytest.approx(expected['mean'])
+    assert summary['std'] == pytest.approx(expected['std'])
+    for q in ('25%', '50%', '75%'):
+        assert abs(summary[q] - expected[q]) <= bin_width
+
+
+def test_summarize_empty_selection(employees):
+    summary = SummaryService(employees).summarize(depts=['no such dept'])
+    assert (summary['count'] == 0).all()
+    assert summary['mean'].isna().all()
@@ -0,0 +1,128 @@
+import hashlib
+import itertools
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+import joblib
+import pandas as pd
+
+def frame_fingerprint(df: pd.DataFrame, columns: list = None) -> str:
+    """Return a content hash of the selected DataFrame columns (index included)"""
+    columns = list(columns) if columns is not None else list(df.columns)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(columns).encode())
+    row_hashes = pd.util.hash_pandas_object(df[columns], index=True)
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# id(frame) -> cache key, dropped when the frame is garbage collected
+_frame_keys = {}
+_frame_keys_lock = threading.Lock()
+_anonymous_frames = itertools.count()
+
+
+def tag_frame(df: pd.DataFrame, data_version: str, filter_signature: str = 'all') -> pd.DataFrame:
+    """
+    Declare which data a frame holds so caches key it on (data_version, filter_signature)
+
+    Frames with the same tag share cache entries without hashing any rows. A
+    tagged frame must not be modified afterwards. Returns df for chaining.
+    """
+    _remember_frame(df, (data_version, filter_signature), declared=True)
+    return df
+
+
+def frame_key(df: pd.DataFrame) -> tuple:
+    """
+    O(1) cache key for a frame
+
+    The tag given to tag_frame(), or else a token unique to this frame object
+    (never reused, so entries for collected frames simply age out of their cache).
+    """
+    with _frame_keys_lock:
+        key = _frame_keys.get(id(df))
+    if key is None:
+        key = _remember_frame(df, (None, next(_anonymous_frames)), declared=False)
+    return key
+
+
+def _remember_frame(df: pd.DataFrame, key: tuple, declared: bool) -> tuple:
+    frame_id = id(df)
+    with _frame_keys_lock:
+        existing = _frame_keys.get(frame_id)
+        # The first declared tag wins; it replaces only an anonymous token
+        if existing is not None and (existing[0] is not None or not declared):
+            return existing
+        _frame_keys[frame_id] = key
+    if existing is None:
+        weakref.finalize(df, _forget_frame, frame_id)
+    return key
+
+
+def _forget_frame(frame_id: int):
+    with _frame_keys_lock:
+        _frame_keys.pop(frame_id, None)
+
+
+def dump_atomic(value, path: str):
+    """
+    joblib.dump value to path via a temporary file in the same directory
+
+    The file is swapped in with os.replace, so concurrent readers (other
+    processes loading the artifact) see either the old file or the complete
+    new one, never a partial write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    os.close(fd)
+    try:
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with a fixed number of entries"""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key and mark it as recently used"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._data.clear()
@@ -5,6 +5,7 @@ UTILS_DIR = Path(__file__).parent
 ROOT_DIR = Path(UTILS_DIR).parent
 
 DATA_PATH = f"{ROOT_DIR}/data/Employee Attrition.csv"
+CACHE_DIR = f"{ROOT_DIR}/.cache"
 
 #pdb.set_trace()
 # Visualization defaults
@@ -13,7 +14,160 @@ VISUALIZATION_DEFAULTS = {
     "palette": "Set2",
     "rotation": 45,
     "alpha": 0.7,
-    "dpi": 100
+    "dpi": 100,
+    # Scatter plots switch to an aggregated density raster above this many points
+    "scatter_mode": "auto",
+    "density_threshold": 50000,
+    "density_pixel_size": 2,
+    "density_marker_radius": 1,
+    "density_cmap": "coolwarm",
+    # Box plots draw at most this many outlier markers per group
+    "box_max_fliers": 200,
+    # Binned FFT KDE used by violin, KDE and histogram overlays
+    "kde_grid_size": 512,
+    "kde_bw_method": "scott"
+}
+
+# Numeric range filters (sorted-index backed sliders in the app)
+FILTER_DEFAULTS = {
+    "range_columns": [
+        "satisfaction_level",
+        "last_evaluation",
+        "average_montly_hours",
+        "time_spend_company",
+        "number_project"
+    ]
+}
+
+# Data summary sketches: exact value counts up to max_exact_values distinct values,
+# otherwise a fixed-width histogram with sketch_bins bins
+SUMMARY_DEFAULTS = {
+    "max_exact_values": 1024,
+    "sketch_bins": 2048
+}
+
+# Part of every rendered-figure and batch-render cache key: bump it whenever a
+# change to the questions or visualizers alters their output, so persisted
+# figures and batch manifests from older code are not served
+RENDER_VERSION = "1"
+
+# Rendered-figure cache (memory LRU spilling to CACHE_DIR/figures)
+FIGURE_CACHE = {
+    "memory_bytes": 64 * 1024 * 1024,
+    "disk_bytes": 512 * 1024 * 1024,
+    "format": "png"
+}
+
+# File export: dense layers are rasterized inside SVG/PDF and outputs are size-bounded
+EXPORT = {
+    # Artists with more elements than this are rasterized in vector formats
+    "rasterize_threshold": 1000,
+    # 'auto' picks SVG for sparse figures and PDF (mixed raster/vector) for dense ones
+    "auto_vector_format": "svg",
+    "auto_dense_format": "pdf",
+    # Above max_bytes the raster dpi is halved down to min_dpi, then PNG is used
+    "max_bytes": 5 * 1024 * 1024,
+    "min_dpi": 50
+}
+
+# Local HTTP API (python -m analysis.api)
+API_DEFAULTS = {
+    "host": "127.0.0.1",
+    "port": 8000,
+    "workers": 8,
+    "response_cache_size": 512,
+    # Seconds an idle keep-alive connection may hold a worker before it is closed
+    "keepalive_timeout": 5
+}
+
+# Background HTML report export
+REPORT_DEFAULTS = {
+    "workers": 2,
+    "render_workers": 4,
+    "max_jobs": 32,
+    "table_rows": 20
+}
+
+# Startup warm-up (python -m analysis.warmup, or in the background on app start)
+WARMUP_DEFAULTS = {
+    "on_startup": True,
+    "workers": 4
+}
+
+# Logging (utils/logger.py): "text" or "json" lines; async hands records to a
+# background thread; file enables a rotating log; debug_sample_rate keeps that
+# fraction of DEBUG records
+LOGGING = {
+    "level": "INFO",
+    "format": "text",
+    "async": True,
+    "file": None,
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "debug_sample_rate": 1.0
+}
+
+# Hot-path instrumentation (utils/profiling.py); memory tracing slows allocation-heavy code.
+# memory_toggle lets dashboard users switch tracing on, which affects every session.
+PROFILING = {
+    "enabled": True,
+    "trace_memory": False,
+    "memory_toggle": False,
+    "max_records": 5000
+}
+
+# Feature matrix / modeling defaults
+MODELING_DEFAULTS = {
+    "scaling": "standard",
+    "feature_cache_size": 16,
+    "fitted_model_cache_size": 4,
+    "warm_start_max_iter": 10
+}
+
+# Bootstrap cluster-stability analysis
+STABILITY_DEFAULTS = {
+    "n_bootstrap": 50,
+    "n_jobs": None,
+    "n_init": 3,
+    "stable_jaccard": 0.75,
+    "random_state": 42
+}
+
+# Nearest-neighbour "similar employees" index
+SIMILARITY_DEFAULTS = {
+    "id_column": "Emp ID",
+    "features": [
+        "satisfaction_level",
+        "last_evaluation",
+        "average_montly_hours",
+        "number_project",
+        "time_spend_company"
+    ],
+    "algorithm": "kd_tree",
+    "metric": "euclidean",
+    "leaf_size": 40,
+    "k": 5,
+    "batch_size": 4096
+}
+
+# Trained attrition risk model
+RISK_MODEL_DEFAULTS = {
+    "estimator": "hist_gradient_boosting",
+    "numeric_features": [
+        "satisfaction_level",
+        "last_evaluation",
+        "number_project",
+        "average_montly_hours",
+        "time_spend_company",
+        "Work_accident",
+        "promotion_last_5years"
+    ],
+    "salary_order": ["low", "medium", "high"],
+    "score_column": "attrition_risk",
+    "chunk_size": 50000,
+    "high_risk_probability": 0.5,
+    "top_employees": 50,
+    "random_state": 42
 }
 
 # Business thresholds
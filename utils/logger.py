@@ -1,27 +1,142 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import random
+from datetime import datetime, timezone
+from utils.config import LOGGING
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, source, extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'func': record.funcName,
+            'line': record.lineno,
+            'thread': record.threadName
+        }
+        entry.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_FIELDS
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Pass only a fraction of DEBUG records; other levels always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records with only their message merged
+
+    The stock QueueHandler formats the full line on the calling thread; here the
+    formatter (text or JSON) runs on the listener thread and only the %-args are
+    merged beforehand, so mutable arguments are captured at call time.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _sinks(log_file: str, structured: bool) -> list:
+    formatter = (
+        JsonFormatter() if structured
+        else logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOGGING['max_bytes'], backupCount=LOGGING['backup_count'], encoding='utf-8'
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+_listeners = {}
+
+
+def setup_logger(name: str = "employee_analyzer",
+                 log_file: str = None,
+                 level: int = None,
+                 structured: bool = None,
+                 asynchronous: bool = None,
+                 debug_sample_rate: float = None) -> logging.Logger:
+    """
+    Configure and return a logger with console and optional rotating file handlers
+
+    Defaults come from LOGGING in utils/config.py. With asynchronous logging the
+    logger only enqueues records and a QueueListener thread formats and writes
+    them, so request threads never wait on console or file I/O.
+    """
+    log_file = log_file if log_file is not None else LOGGING['file']
+    level = level if level is not None else logging.getLevelName(LOGGING['level'])
+    structured = structured if structured is not None else LOGGING['format'] == 'json'
+    asynchronous = asynchronous if asynchronous is not None else LOGGING['async']
+    debug_sample_rate = debug_sample_rate if debug_sample_rate is not None else LOGGING['debug_sample_rate']
 
-def setup_logger(name: str = "employee_analyzer", 
-                 log_file: str = "employee_analyzer.log",
-                 level: int = logging.INFO) -> logging.Logger:
-    """Configure and return a logger with file and console handlers"""
-    
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Clear existing handlers to avoid duplicates
+
+    # Clear existing handlers (and a previous listener) to avoid duplicates
     if logger.handlers:
         logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(
-        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    )
-    logger.addHandler(console_handler)
+    if name in _listeners:
+        _listeners.pop(name).stop()
+    for existing in list(logger.filters):
+        logger.removeFilter(existing)
+
+    if debug_sample_rate < 1:
+        logger.addFilter(DebugSampler(debug_sample_rate))
+
+    sinks = _sinks(log_file, structured)
+    if asynchronous:
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *sinks, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(DeferredQueueHandler(log_queue))
+    else:
+        for handler in sinks:
+            logger.addHandler(handler)
 
-    
     return logger
 
-logger = setup_logger()
\ No newline at end of file
+
+@atexit.register
+def _flush_listeners():
+    """Drain queued records before the interpreter exits"""
+    while _listeners:
+        _listeners.popitem()[1].stop()
+
+
+logger = setup_logger()
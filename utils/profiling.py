@@ -0,0 +1,198 @@
+"""
+Hot-path timing and memory instrumentation
+
+Wrap a function with @profiled() or a block with profile_span(name) to record a
+Span: wall time, CPU time of the running thread, rows in and out, and - while
+memory tracing is on - the peak traced allocation above the starting level.
+Spans go into the process-wide `profiler`, which aggregates them per name
+(summary()) and exports them as JSON (dump()).
+
+tracemalloc slows allocation-heavy code noticeably, so memory tracing is off
+unless PROFILING['trace_memory'] is set or profiler.trace_memory(True) is called.
+The tracer's peak is process-wide, so it is only reset and read for spans that
+run while no other thread has a span open; a span that overlaps another
+thread's spans reports peak_bytes None rather than a mixed or truncated figure.
+"""
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+import pandas as pd
+from utils.config import PROFILING
+
+
+@dataclass
+class Span:
+    """One instrumented call"""
+    name: str
+    started: float
+    wall_ms: float = None
+    cpu_ms: float = None
+    rows_in: int = None
+    rows_out: int = None
+    peak_bytes: int = None
+    thread: str = None
+    error: str = None
+
+
+def count_rows(value) -> int:
+    """Row count of a DataFrame/Series result, else None"""
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+
+
+class Profiler:
+    """Bounded, thread-safe store of recent spans"""
+
+    def __init__(self, enabled: bool = None, max_records: int = None, trace_memory: bool = None):
+        self.enabled = PROFILING['enabled'] if enabled is None else enabled
+        self._records = deque(maxlen=max_records or PROFILING['max_records'])
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Threads with an open span, and a counter bumped whenever spans overlap
+        self._active_threads = 0
+        self._overlaps = 0
+        self.trace_memory(PROFILING['trace_memory'] if trace_memory is None else trace_memory)
+
+    @property
+    def tracing_memory(self) -> bool:
+        return self._trace_memory and tracemalloc.is_tracing()
+
+    def trace_memory(self, enabled: bool):
+        """Start or stop tracemalloc-based peak measurement"""
+        self._trace_memory = enabled
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def span(self, name: str, rows_in: int = None):
+        """Record the enclosed block; set span.rows_out inside it if known"""
+        if not self.enabled:
+            yield Span(name, time.time())
+            return
+
+        record = Span(name, time.time(), rows_in=rows_in, thread=threading.current_thread().name)
+        stack = self._stack()
+        tracing = self.tracing_memory
+        with self._lock:
+            if not stack:
+                self._active_threads += 1
+                if self._active_threads > 1:
+                    self._overlaps += 1
+            # [start, peak, overlaps at start, measured]
+            frame = [0, 0, self._overlaps, tracing and self._active_threads == 1]
+            if frame[3]:
+                current, peak = tracemalloc.get_traced_memory()
+                if stack:
+                    # Keep the enclosing span's peak before resetting the tracer for this one
+                    stack[-1][1] = max(stack[-1][1], peak)
+                tracemalloc.reset_peak()
+                frame[0] = frame[1] = current
+        stack.append(frame)
+
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.wall_ms = (time.perf_counter() - wall_start) * 1000
+            record.cpu_ms = (time.thread_time() - cpu_start) * 1000
+            stack.pop()
+            with self._lock:
+                if frame[3] and frame[2] == self._overlaps and tracemalloc.is_tracing():
+                    peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                    record.peak_bytes = max(peak - frame[0], 0)
+                    if stack:
+                        stack[-1][1] = max(stack[-1][1], peak)
+                if not stack:
+                    self._active_threads -= 1
+                self._records.append(record)
+
+    def _stack(self) -> list:
+        """Per-thread memory frames of the open spans"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def records(self) -> list:
+        with self._lock:
+            return list(self._records)
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> pd.DataFrame:
+        """Per-name call count, wall/CPU totals and percentiles, rows and peak memory"""
+        records = self.records()
+        if not records:
+            return pd.DataFrame(columns=[
+                'calls', 'wall_ms_total', 'wall_ms_mean', 'wall_ms_p95', 'cpu_ms_total',
+                'rows_in', 'rows_out', 'peak_kib'
+            ])
+        frame = pd.DataFrame([asdict(r) for r in records])
+        grouped = frame.groupby('name')
+        summary = pd.DataFrame({
+            'calls': grouped.size(),
+            'wall_ms_total': grouped['wall_ms'].sum(),
+            'wall_ms_mean': grouped['wall_ms'].mean(),
+            'wall_ms_p95': grouped['wall_ms'].quantile(0.95),
+            'cpu_ms_total': grouped['cpu_ms'].sum(),
+            'rows_in': grouped['rows_in'].max(),
+            'rows_out': grouped['rows_out'].max(),
+            'peak_kib': grouped['peak_bytes'].max() / 1024
+        })
+        return summary.sort_values('wall_ms_total', ascending=False)
+
+    def dump(self) -> str:
+        """JSON document with every retained span and the per-name summary"""
+        summary = self.summary()
+        return json.dumps({
+            'generated': time.time(),
+            'trace_memory': self.tracing_memory,
+            'summary': json.loads(summary.reset_index().to_json(orient='records')),
+            'spans': [asdict(r) for r in self.records()]
+        }, indent=2)
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            f.write(self.dump())
+
+
+profiler = Profiler()
+
+
+def profile_span(name: str, rows_in: int = None):
+    """Context manager recording a block in the shared profiler"""
+    return profiler.span(name, rows_in=rows_in)
+
+
+def profiled(name: str = None):
+    """
+    Decorator recording each call in the shared profiler
+
+    Rows in are taken from the first DataFrame argument and rows out from a
+    DataFrame/Series return value.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            frame = next((a for a in args if isinstance(a, pd.DataFrame)), None)
+            with profiler.span(span_name, rows_in=None if frame is None else len(frame)) as span:
+                result = func(*args, **kwargs)
+                span.rows_out = count_rows(result)
+            return result
+        return wrapper
+    return decorator